@@ -0,0 +1,246 @@
+# bench/cluster.py - runs the cluster launcher with real bot workers against a fake gateway, fully offline.
+# Run from the repository root: python -m bench.cluster [--clusters 3] [--shards 6] [--guilds 60]
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import discord
+import yarl
+from aiohttp import WSMsgType, web
+
+from bench.fakes import FakeDiscord
+
+BOT_USER = FakeDiscord.user(1_000_000_000_000_000_001, "onWhisper", bot=True)
+HEARTBEAT_INTERVAL = 1000  # Milliseconds; short so every shard reports a latency right away.
+WHISPERS_PER_GUILD = 3
+LEGACY_WHISPERS = 5  # Rows written before whisper_expiry had a guild_id column.
+
+
+def guild_ids(count: int) -> list[int]:
+    """Snowflakes one millisecond apart, so ``(id >> 22) % shards`` deals them out round-robin."""
+    base = discord.utils.time_snowflake(discord.utils.utcnow()) >> 22
+    return [(base - count + i) << 22 for i in range(count)]
+
+
+def guild_payload(guild_id: int) -> dict:
+    return {"id": str(guild_id), "name": f"guild-{guild_id}", "icon": None, "owner_id": BOT_USER["id"],
+            "roles": [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                       "hoist": False, "managed": False, "mentionable": False, "flags": 0}],
+            "channels": [{"id": str(guild_id + 1), "type": 0, "name": "general", "position": 0, "guild_id": str(guild_id),
+                          "permission_overwrites": [], "nsfw": False, "parent_id": None}],
+            "threads": [], "members": [FakeDiscord.member(BOT_USER)], "member_count": 1, "features": [], "emojis": [],
+            "stickers": [], "large": False, "verification_level": 0, "default_message_notifications": 0,
+            "explicit_content_filter": 0, "mfa_level": 0, "premium_tier": 0, "nsfw_level": 0,
+            "preferred_locale": "en-US", "voice_states": [], "presences": []}
+
+
+class FakeGateway:
+    """Speaks just enough of Discord's gateway: HELLO, IDENTIFY to READY plus GUILD_CREATEs, and heartbeats."""
+    def __init__(self, guilds: list[int]):
+        self.guilds = guilds
+        self.identifies: Counter[int] = Counter()
+        self.url: str = None
+        self._runner: web.AppRunner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/", self.session)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"ws://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+
+    async def close(self):
+        await self._runner.cleanup()
+
+    async def session(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sequence = 0
+
+        async def dispatch(event: str, data: dict):
+            nonlocal sequence
+            sequence += 1
+            await ws.send_str(json.dumps({"op": 0, "t": event, "s": sequence, "d": data}))
+
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL}}))
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                break
+            payload = json.loads(message.data)
+            if payload["op"] == 1:
+                await ws.send_str(json.dumps({"op": 11}))
+            elif payload["op"] == 2:
+                shard_id, shard_count = payload["d"]["shard"]
+                self.identifies[shard_id] += 1
+                mine = [guild_id for guild_id in self.guilds if (guild_id >> 22) % shard_count == shard_id]
+                await dispatch("READY", {"v": 10, "user": BOT_USER, "session_id": f"session-{shard_id}",
+                                         "resume_gateway_url": self.url, "shard": [shard_id, shard_count],
+                                         "application": {"id": BOT_USER["id"], "flags": 0},
+                                         "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in mine]})
+                for guild_id in mine:
+                    await dispatch("GUILD_CREATE", guild_payload(guild_id))
+        return ws
+
+
+def seed(path: str, guilds: list[int]) -> tuple[set[int], set[int]]:
+    """Writes overdue mutes and whispers for every guild into the shared database; returns their ids."""
+    from cogs.moderation import MUTE_SCHEMA
+    from utils.expiry import SCHEMA as EXPIRY_SCHEMA
+
+    now = int(time.time())
+    message_ids = iter(range(discord.utils.time_snowflake(discord.utils.utcnow()), 2**63))
+    whispers = [(next(message_ids), guild_id + 1, now - 1, guild_id) for guild_id in guilds for _ in range(WHISPERS_PER_GUILD)]
+    whispers += [(next(message_ids), guilds[i % len(guilds)] + 1, now - 1, None) for i in range(LEGACY_WHISPERS)]
+    with sqlite3.connect(path) as conn:
+        conn.executescript(MUTE_SCHEMA + EXPIRY_SCHEMA)
+        conn.executemany("INSERT INTO mute_expiry (guild_id, user_id, role_id, expires_at) VALUES (?, ?, ?, ?)",
+                         [(guild_id, guild_id + 3, guild_id + 2, now - 1) for guild_id in guilds])
+        conn.executemany("INSERT INTO whisper_expiry (message_id, channel_id, expires_at, guild_id) VALUES (?, ?, ?, ?)", whispers)
+    return set(guilds), {row[0] for row in whispers}
+
+
+def journal(path: str) -> list[tuple[int, str, int]]:
+    """Reads the (cluster, action, id) lines every worker appended."""
+    try:
+        with open(path) as lines:
+            return [(int(c), action, int(i)) for c, action, i in (line.split() for line in lines)]
+    except FileNotFoundError:
+        return []
+
+
+async def wait_for(condition, timeout: float) -> float:
+    started = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError("the cluster did not get there in time")
+        await asyncio.sleep(0.1)
+    return time.perf_counter() - started
+
+
+def rows_left(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return sum(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("mute_expiry", "whisper_expiry"))
+
+
+async def bench(clusters: int, shard_count: int, guild_count: int):
+    with tempfile.TemporaryDirectory(prefix="onwhisper-cluster-") as directory:
+        os.environ.update({"DATA_DIR": directory, "DISCORD_TOKEN": "bench", "WEB_HOST": "127.0.0.1",
+                           "JOKE_API_URL": "http://127.0.0.1:9/random_ten"})
+        import cluster
+        logging.getLogger("cluster").setLevel(logging.CRITICAL)  # The restart below is expected.
+        cluster.IPC_PATH = os.path.join(directory, "ipc.sock")
+        cluster.WEB_PORT = 0
+
+        guilds = guild_ids(guild_count)
+        database = os.path.join(directory, "onwhisper.db")
+        muted, whispers = seed(database, guilds)
+        gateway = FakeGateway(guilds)
+        await gateway.start()
+        journal_path = os.path.join(directory, "journal.log")
+        launcher = cluster.Launcher(shard_count, clusters, [sys.executable, "-m", "bench.cluster", "--worker", gateway.url, journal_path])
+        print(f"== cluster: {clusters} workers x {shard_count} shards, {guild_count} guilds on a fake gateway")
+
+        task = asyncio.create_task(launcher.run())
+        try:
+            def totals():
+                return sum(stats["guilds"] for stats in launcher.stats.values())
+
+            up = await wait_for(lambda: len(launcher.stats) == len(launcher.ranges) and totals() == guild_count, 60)
+            shards = {int(s) for stats in launcher.stats.values() for s in stats["shards"]}
+            print(f"   start        {len(launcher.stats)} workers reporting {totals()} guilds over {len(shards)} shards "
+                  f"after {up:.1f}s")
+
+            await wait_for(lambda: rows_left(database) == 0, 60)
+            actions = journal(journal_path)
+            unmutes = Counter(i for _, action, i in actions if action == "unmute")
+            deletes = Counter(i for _, action, i in actions if action == "delete")
+            by_cluster = Counter(c for c, action, _ in actions if action in ("unmute", "delete"))
+            print(f"   mutes        {len(unmutes)}/{len(muted)} lifted, {sum(n > 1 for n in unmutes.values())} more than once")
+            print(f"   whispers     {len(deletes)}/{len(whispers)} deleted ({LEGACY_WHISPERS} without a guild), "
+                  f"{sum(n > 1 for n in deletes.values())} more than once")
+            print(f"   split        {', '.join(f'cluster {c}: {n}' for c, n in sorted(by_cluster.items()))}")
+            print(f"   tree sync    {sum(1 for _, action, _ in actions if action == 'sync')} sync(s) across the cluster")
+            logs = sorted(name for name in os.listdir(directory) if name.startswith("bot.cluster"))
+            print(f"   log files    {', '.join(logs)}")
+
+            # Kill one worker outright; the launcher should bring it back and leave the rest alone.
+            victim = len(launcher.ranges) - 1
+            others = {c: p.pid for c, p in launcher.processes.items() if c != victim}
+            identified = sum(gateway.identifies.values())
+            launcher.processes[victim].kill()
+            killed = time.perf_counter()
+            await wait_for(lambda: str(victim) not in launcher.stats, 10)
+            await wait_for(lambda: str(victim) in launcher.stats and totals() == guild_count, 60)
+            unaffected = all(launcher.processes[c].pid == pid and launcher.processes[c].returncode is None for c, pid in others.items())
+            print(f"   restart      cluster {victim} back after {time.perf_counter() - killed:.1f}s, "
+                  f"{sum(gateway.identifies.values()) - identified} shard(s) re-identified, "
+                  f"other workers {'untouched' if unaffected else 'RESTARTED'}")
+        finally:
+            launcher.stop()
+            await task
+            await gateway.close()
+
+
+async def worker(gateway_url: str, journal_path: str):
+    """One cluster worker: the real bot, with REST served by FakeDiscord and the gateway pointed at the fake."""
+    directory = os.environ["DATA_DIR"]
+    os.environ["LOG_FILE"] = os.path.join(directory, os.environ["LOG_FILE"])
+    from utils.log import setup_logging
+    log_listener = setup_logging(os.environ["LOG_FILE"], level=logging.ERROR)  # 404s on fake messages are expected.
+    import utils.cluster
+    utils.cluster.STATS_INTERVAL = 1
+    import bot as bot_module
+
+    cluster_id = os.environ["CLUSTER_ID"]
+    fake = FakeDiscord(latency=0.0, rate_limits=False)
+    fake.bot_user = BOT_USER
+    serve = fake.serve
+    out = open(journal_path, "a", buffering=1)  # Short appends from every worker land whole.
+
+    async def recorded(route, body, params):
+        path = route.url[len(discord.http.Route.BASE):]
+        if route.method == "DELETE" and (match := re.fullmatch(r"/guilds/(\d+)/members/\d+/roles/\d+", path)):
+            out.write(f"{cluster_id} unmute {match[1]}\n")
+        elif route.method == "DELETE" and (match := re.fullmatch(r"/channels/\d+/messages/(\d+)", path)):
+            out.write(f"{cluster_id} delete {match[1]}\n")
+        elif path.endswith("/bulk-delete"):
+            out.write("".join(f"{cluster_id} delete {mid}\n" for mid in body["messages"]))
+        elif route.method == "PUT" and path.endswith("/commands"):
+            out.write(f"{cluster_id} sync 0\n")
+        return await serve(route, body, params)
+
+    async def no_identify_delay(shard_id, *, initial=False):
+        pass
+
+    fake.serve = recorded
+    bot = bot_module.bot
+    bot.http.request = fake.request
+    bot.before_identify_hook = no_identify_delay
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(gateway_url)
+    try:
+        await bot.start(os.environ["DISCORD_TOKEN"])
+    finally:
+        log_listener.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local shard cluster against a fake gateway.")
+    parser.add_argument("--clusters", type=int, default=3)
+    parser.add_argument("--shards", type=int, default=6)
+    parser.add_argument("--guilds", type=int, default=60)
+    parser.add_argument("--worker", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        asyncio.run(worker(*args.worker))
+    else:
+        asyncio.run(bench(args.clusters, args.shards, args.guilds))
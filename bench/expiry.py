@@ -0,0 +1,160 @@
+# bench/expiry.py - memory, latency and failure handling of the whisper expiry scheduler with many pending.
+# Run from the repository root: python -m bench.expiry [--whispers 10000]
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+from types import SimpleNamespace
+
+import discord
+
+import utils.expiry
+from utils.database import Database
+from utils.expiry import ExpiryScheduler, MAX_RETRIES
+
+
+class StubHTTP:
+    """Just the two delete routes, answering like Discord: bulk deletes reject messages older than 14 days."""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = Counter()
+        self.deleted: set[int] = set()
+        self.broken: set[int] = set()  # Channels that answer 503 forever
+
+    def _error(self, status: int, reason: str):
+        return discord.HTTPException(SimpleNamespace(status=status, reason=reason), reason)
+
+    async def delete_messages(self, channel_id: int, message_ids: list[int]):
+        self.requests["bulk"] += 1
+        await asyncio.sleep(self.latency)
+        if channel_id in self.broken:
+            raise self._error(503, "Service Unavailable")
+        cutoff = discord.utils.time_snowflake(discord.utils.utcnow() - timedelta(days=14))
+        if any(mid < cutoff for mid in message_ids):
+            raise self._error(400, "You can only bulk delete messages that are under 14 days old.")
+        self.deleted.update(message_ids)
+
+    async def delete_message(self, channel_id: int, message_id: int):
+        self.requests["single"] += 1
+        await asyncio.sleep(self.latency)
+        if channel_id in self.broken:
+            raise self._error(503, "Service Unavailable")
+        self.deleted.add(message_id)
+
+
+class StubBot:
+    def __init__(self, latency: float):
+        self.http = StubHTTP(latency)
+        self.expired = 0
+
+    async def wait_until_ready(self):
+        pass
+
+    def get_channel(self, channel_id: int):
+        return None  # Uncached, so the scheduler goes through bot.http.
+
+    def dispatch(self, event: str, channel_id: int, message_ids: list[int]):
+        self.expired += len(message_ids)
+
+
+async def pending(db: Database) -> int:
+    return (await db.fetchone("SELECT COUNT(*) FROM whisper_expiry"))[0]
+
+
+async def drain(bot: StubBot, db: Database, ids: list[int], timeout: float) -> float:
+    started = time.perf_counter()
+    while (not bot.http.deleted.issuperset(ids) or await pending(db)) and time.perf_counter() - started < timeout:
+        await asyncio.sleep(0.02)
+    return time.perf_counter() - started
+
+
+async def bench(count: int, channels: int, latency: float):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "expiry.db")
+        db = Database(path)
+        await db.connect()
+        bot = StubBot(latency)
+        scheduler = ExpiryScheduler(bot, db)
+        await scheduler.start()
+        print(f"== {count:,} whispers pending over {channels} channels")
+
+        # All due in the same few seconds, the way a whisper storm schedules them.
+        now = discord.utils.utcnow()
+        ids = [discord.utils.time_snowflake(now) + i for i in range(count)]
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        latencies = []
+        for i, message_id in enumerate(ids):
+            started = time.perf_counter()
+            await scheduler.schedule(i % channels, message_id, 2)
+            latencies.append(time.perf_counter() - started)
+        held = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        latencies.sort()
+        print(f"   schedule       p50 {latencies[len(latencies) // 2] * 1e3:.2f}ms · p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f}ms")
+        print(f"   heap           {held / 1024:.0f}KiB ({held / count:.0f}B each)")
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        sleepers = [asyncio.create_task(asyncio.sleep(60)) for _ in range(count)]
+        await asyncio.sleep(0)
+        sleeping = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        for task in sleepers:
+            task.cancel()
+        await asyncio.gather(*sleepers, return_exceptions=True)
+        print(f"   baseline       {count:,} sleeping tasks hold {sleeping / 1024:.0f}KiB ({sleeping / count:.0f}B each)")
+
+        # A restart before anything is due: a fresh scheduler picks every row back up.
+        scheduler.stop()
+        scheduler = ExpiryScheduler(bot, db)
+        started = time.perf_counter()
+        await scheduler.start()
+        print(f"   restart        {len(scheduler):,} pending reloaded in {(time.perf_counter() - started) * 1e3:.0f}ms")
+
+        waited = await drain(bot, db, ids, 30)
+        print(f"   drained        {len(bot.http.deleted & set(ids)):,}/{count:,} deleted {waited:.1f}s after scheduling, "
+              f"{bot.http.requests['bulk']} bulk deletes, {await pending(db)} rows left")
+
+        # Rows left over from a long downtime: bulk deletes get a 400, so they go one at a time instead.
+        bot.http.requests.clear()
+        stale = [discord.utils.time_snowflake(now - timedelta(days=20)) + i for i in range(200)]
+        for i, message_id in enumerate(stale):
+            await scheduler.schedule(i % 4, message_id, 0)
+        waited = await drain(bot, db, stale, 30)
+        print(f"   stale (>14d)   {len(bot.http.deleted & set(stale))}/{len(stale)} deleted in {waited:.1f}s with "
+              f"{bot.http.requests['bulk']} rejected bulk deletes and {bot.http.requests['single']} single deletes, "
+              f"{await pending(db)} rows left")
+
+        # A channel that keeps failing: retried MAX_RETRIES times, then dropped rather than retried forever.
+        utils.expiry.RETRY_DELAY = 1
+        bot.http.requests.clear()
+        broken = [discord.utils.time_snowflake(now) + count + i for i in range(50)]
+        bot.http.broken.add(999)
+        for message_id in broken:
+            await scheduler.schedule(999, message_id, 0)
+        started = time.perf_counter()
+        while await pending(db) and time.perf_counter() - started < 30:
+            await asyncio.sleep(0.1)
+        print(f"   failing (503)  given up after {bot.http.requests['bulk']} attempts (MAX_RETRIES={MAX_RETRIES}) "
+              f"in {time.perf_counter() - started:.1f}s, {await pending(db)} rows left")
+        scheduler.stop()
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the whisper expiry scheduler.")
+    parser.add_argument("--whispers", type=int, default=10_000)
+    parser.add_argument("--channels", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated REST latency in seconds")
+    args = parser.parse_args()
+    logging.getLogger("utils.expiry").setLevel(logging.CRITICAL)  # The failure cases below are expected.
+    asyncio.run(bench(args.whispers, args.channels, args.latency))
@@ -0,0 +1,393 @@
+# bench/fakes.py - an in-memory stand-in for Discord's REST API plus synthetic gateway payloads.
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import discord
+from discord.http import Route
+from discord.webhook.async_ import AsyncWebhookAdapter
+
+ADMIN = str(discord.Permissions.all().value)  # Interactions carry resolved permissions, so spell every bit out.
+MEMBER = str(discord.Permissions.general().value | discord.Permissions.text().value)
+
+# (requests, per seconds) for one route and set of major parameters, roughly what Discord hands out.
+RATE_LIMITS = {
+    "POST /channels/{channel_id}/messages": (5, 5.0),
+    "PATCH /channels/{channel_id}/messages/{message_id}": (5, 5.0),
+    "DELETE /channels/{channel_id}/messages/{message_id}": (5, 1.0),
+    "POST /channels/{channel_id}/messages/bulk-delete": (1, 1.0),
+    "GET /channels/{channel_id}/messages": (5, 1.0),
+    "PUT /guilds/{guild_id}/bans/{user_id}": (5, 1.0),
+    "DELETE /guilds/{guild_id}/members/{user_id}": (5, 1.0),
+    "PATCH /guilds/{guild_id}/members/{user_id}": (10, 1.0),
+    "POST /guilds/{guild_id}/bulk-ban": (1, 1.0),
+}
+GLOBAL_LIMIT = (50, 1.0)
+EXEMPT_FROM_GLOBAL = ("/interactions/", "/webhooks/")  # Interaction endpoints skip the global limit.
+
+
+class FakeResponse:
+    """Just enough of an aiohttp response for discord.HTTPException."""
+    def __init__(self, status: int, reason: str):
+        self.status = status
+        self.reason = reason
+
+
+class Snowflakes:
+    """Hands out increasing snowflakes; ``at()`` backdates one for seeded history."""
+    def __init__(self):
+        self._last = 0
+        self._sequence = itertools.count()
+
+    def next(self) -> int:
+        self._last = max(self._last + 1, discord.utils.time_snowflake(discord.utils.utcnow()))
+        return self._last
+
+    def at(self, when: datetime) -> int:
+        return discord.utils.time_snowflake(when) + next(self._sequence) % 4096
+
+
+class Window:
+    """Fixed-window counter used to emulate one rate-limit bucket."""
+    __slots__ = ("limit", "per", "reset_at", "remaining")
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.reset_at = 0.0
+        self.remaining = limit
+
+    def take(self, now: float) -> float:
+        """Spends a request; returns 0 or how long to wait before the bucket resets."""
+        if now >= self.reset_at:
+            self.reset_at = now + self.per
+            self.remaining = self.limit
+        if self.remaining <= 0:
+            return self.reset_at - now
+        self.remaining -= 1
+        return 0.0
+
+
+def _path_pattern(path: str) -> re.Pattern:
+    return re.compile("^" + re.sub(r"\\{(\w+)\\}", r"(?P<\1>[^/?]+)", re.escape(path)) + "$")
+
+
+class FakeDiscord:
+    """Serves discord.py's REST calls from memory with simulated latency and rate limits.
+
+    Replaces ``HTTPClient.request`` and the interaction webhook adapter, so
+    everything above them (models, the command tree, views, modals) runs
+    unmodified. Over-limit requests are counted as 429s and then held until
+    the bucket resets, which is what discord.py does when it receives one.
+    Messages are kept per channel so history, edits and deletes behave.
+    """
+    def __init__(self, latency: float = 0.05, jitter: float = 0.5, seed: int = 1, rate_limits: bool = True):
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.rate_limits = rate_limits
+        self.ids = Snowflakes()
+        self.application_id = self.ids.next()
+        self.bot_user = self.user(self.application_id, "onWhisper", bot=True)
+        self.owner = self.user(self.ids.next(), "owner")
+        self.requests: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+        self.channels: dict[int, dict[int, dict]] = defaultdict(dict)  # channel_id -> message_id -> payload
+        self.edits: list[tuple[float, int, int, str]] = []  # (monotonic time, channel_id, message_id, content)
+        self.modals: dict[int, dict] = {}
+        self.replies: dict[int, list[dict]] = defaultdict(list)  # interaction_id -> response payloads
+        self._interactions: dict[str, tuple[int, int]] = {}  # token -> (interaction_id, channel_id)
+        self._acks: dict[int, asyncio.Future] = {}
+        self._windows: dict[str, Window] = {}
+        self._global = Window(*GLOBAL_LIMIT)
+        self._patterns = {}
+        self._handlers = {
+            "GET /users/@me": lambda match, body, params: self.bot_user,
+            "GET /oauth2/applications/@me": self._application,
+            "PUT /applications/{application_id}/commands": lambda match, body, params: [],
+            "POST /interactions/{webhook_id}/{webhook_token}/callback": self._callback,
+            "POST /webhooks/{webhook_id}/{webhook_token}": self._followup,
+            "PATCH /webhooks/{webhook_id}/{webhook_token}/messages/@original": self._edit_original,
+            "POST /channels/{channel_id}/messages": self._create_message,
+            "PATCH /channels/{channel_id}/messages/{message_id}": self._edit_message,
+            "DELETE /channels/{channel_id}/messages/{message_id}": self._delete_message,
+            "POST /channels/{channel_id}/messages/bulk-delete": self._bulk_delete,
+            "GET /channels/{channel_id}/messages": self._history,
+            "POST /guilds/{guild_id}/bulk-ban": self._bulk_ban,
+        }
+
+    # Payloads
+
+    @staticmethod
+    def user(user_id: int, name: str, bot: bool = False) -> dict:
+        return {"id": str(user_id), "username": name, "global_name": None, "discriminator": "0",
+                "avatar": None, "bot": bot, "public_flags": 0}
+
+    @staticmethod
+    def member(user: dict, roles=(), joined_at: datetime = None, permissions: str = None) -> dict:
+        data = {"user": user, "roles": [str(role) for role in roles], "nick": None, "deaf": False, "mute": False,
+                "flags": 0, "joined_at": (joined_at or discord.utils.utcnow()).isoformat()}
+        if permissions is not None:
+            data["permissions"] = permissions
+        return data
+
+    def message(self, channel_id: int, author: dict, content: str = "", message_id: int = None, embeds=None) -> dict:
+        message_id = message_id or self.ids.next()
+        return {"id": str(message_id), "channel_id": str(channel_id), "author": author, "content": content,
+                "timestamp": discord.utils.snowflake_time(message_id).isoformat(), "edited_timestamp": None,
+                "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+                "embeds": embeds or [], "pinned": False, "type": 0, "flags": 0, "components": []}
+
+    def guild(self, channels: int, members: int, *, name: str = "Load Test") -> dict:
+        """Builds a GUILD_CREATE payload with text channels, a Muted role and ``members`` users."""
+        guild_id = self.ids.next()
+        bot_role, muted_role = self.ids.next(), self.ids.next()
+        roles = [
+            {"id": str(guild_id), "name": "@everyone", "permissions": MEMBER, "position": 0, "color": 0,
+             "hoist": False, "managed": False, "mentionable": False, "flags": 0},
+            {"id": str(bot_role), "name": "onWhisper", "permissions": ADMIN, "position": 2, "color": 0,
+             "hoist": False, "managed": True, "mentionable": False, "flags": 0},
+            {"id": str(muted_role), "name": "Muted", "permissions": "0", "position": 1, "color": 0,
+             "hoist": False, "managed": False, "mentionable": False, "flags": 0},
+        ]
+        channel_payloads = [
+            {"id": str(self.ids.next()), "type": 0, "name": f"load-{i}", "position": i, "guild_id": str(guild_id),
+             "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None, "rate_limit_per_user": 0}
+            for i in range(channels)
+        ]
+        now = discord.utils.utcnow()
+        member_payloads = [self.member(self.bot_user, roles=[bot_role], joined_at=now - timedelta(days=365))]
+        member_payloads.append(self.member(self.owner, joined_at=now - timedelta(days=365)))
+        for i in range(members):
+            user = self.user(self.ids.next(), f"user{i}")
+            member_payloads.append(self.member(user, joined_at=now - timedelta(minutes=self.rng.randint(1, 60 * 24 * 400))))
+        return {"id": str(guild_id), "name": name, "icon": None, "owner_id": self.owner["id"], "roles": roles,
+                "channels": channel_payloads, "threads": [], "members": member_payloads,
+                "member_count": len(member_payloads), "features": [], "emojis": [], "stickers": [],
+                "large": members > 250, "verification_level": 0, "default_message_notifications": 0,
+                "explicit_content_filter": 0, "mfa_level": 0, "premium_tier": 0, "nsfw_level": 0,
+                "preferred_locale": "en-US", "voice_states": [], "presences": []}
+
+    def seed_history(self, channel_id: int, authors: list[dict], count: int, span: timedelta, words=("hello", "spam", "gg", "lol")):
+        """Fills a channel with ``count`` messages spread evenly over the last ``span``."""
+        now = discord.utils.utcnow()
+        messages = self.channels[channel_id]
+        for i in range(count):
+            when = now - span + span * (i + 1) / (count + 1)
+            message_id = self.ids.at(when)
+            messages[message_id] = self.message(channel_id, self.rng.choice(authors), self.rng.choice(words), message_id)
+
+    def interaction(self, guild: dict, channel_id: int, member: dict, data: dict, kind: int = 2,
+                    permissions: str = ADMIN) -> dict:
+        interaction_id = self.ids.next()
+        token = f"token-{interaction_id}"
+        self._interactions[token] = (interaction_id, channel_id)
+        return {
+            "id": str(interaction_id), "application_id": str(self.application_id), "type": kind, "data": data,
+            "guild_id": guild["id"], "channel_id": str(channel_id),
+            "channel": {"id": str(channel_id), "type": 0, "guild_id": guild["id"]},
+            "member": dict(member, permissions=permissions), "token": token, "version": 1,
+            "app_permissions": ADMIN, "locale": "en-US", "guild_locale": "en-US", "entitlements": [],
+            "authorizing_integration_owners": {"0": guild["id"]}, "context": 0,
+            "attachment_size_limit": 10 * 1024 * 1024,
+        }
+
+    def command(self, guild: dict, channel_id: int, member: dict, name: str, options: dict = None,
+                members: dict[str, dict] = None, permissions: str = ADMIN) -> dict:
+        """Builds an APPLICATION_COMMAND interaction; ``members`` maps option names to member payloads.
+
+        Option values may also be member or channel payloads. Subcommands nest
+        as dicts, e.g. ``name="mass", options={"ban": {"members": "..."}}``.
+        """
+        resolved = {}
+        option_payloads = self._options(dict(options or {}, **(members or {})), resolved)
+        data = {"id": str(self.ids.next()), "name": name, "type": 1, "options": option_payloads}
+        if resolved:
+            data["resolved"] = resolved
+        return self.interaction(guild, channel_id, member, data, 2, permissions)
+
+    @classmethod
+    def _options(cls, options: dict, resolved: dict) -> list[dict]:
+        payloads = []
+        for option, value in options.items():
+            if isinstance(value, dict) and "user" in value:  # A member.
+                user_id = value["user"]["id"]
+                payloads.append({"name": option, "type": 6, "value": user_id})
+                resolved.setdefault("users", {})[user_id] = value["user"]
+                resolved.setdefault("members", {})[user_id] = {k: v for k, v in value.items() if k != "user"}
+            elif isinstance(value, dict) and "guild_id" in value:  # A channel.
+                payloads.append({"name": option, "type": 7, "value": value["id"]})
+                resolved.setdefault("channels", {})[value["id"]] = dict(value, permissions=ADMIN)
+            elif isinstance(value, dict):
+                payloads.append({"name": option, "type": 1, "options": cls._options(value, resolved)})
+            else:
+                kind = 4 if isinstance(value, int) and not isinstance(value, bool) else 5 if isinstance(value, bool) else 3
+                payloads.append({"name": option, "type": kind, "value": value})
+        return payloads
+
+    def click(self, guild: dict, channel_id: int, member: dict, message: dict, custom_id: str) -> dict:
+        """Builds a MESSAGE_COMPONENT interaction for a button on ``message``."""
+        data = {"custom_id": custom_id, "component_type": 2}
+        return dict(self.interaction(guild, channel_id, member, data, 3, permissions=MEMBER), message=message)
+
+    def modal_submit(self, guild: dict, channel_id: int, member: dict, modal: dict, values: dict[str, str]) -> dict:
+        """Builds a MODAL_SUBMIT interaction, filling text inputs by their label."""
+        rows = []
+        for row in modal["components"]:
+            inputs = [{"type": 4, "custom_id": c["custom_id"], "value": values.get(c["label"], "")}
+                      for c in row["components"] if c["type"] == 4]
+            rows.append({"type": 1, "components": inputs})
+        data = {"custom_id": modal["custom_id"], "components": rows}
+        return self.interaction(guild, channel_id, member, data, 5, MEMBER)
+
+    # Plumbing
+
+    def expect(self, interaction_id: int) -> asyncio.Future:
+        """Returns a future resolved with the loop time of the interaction's first response."""
+        future = self._acks[interaction_id] = asyncio.get_running_loop().create_future()
+        return future
+
+    def adapter(self) -> AsyncWebhookAdapter:
+        fake = self
+
+        class FakeWebhookAdapter(AsyncWebhookAdapter):
+            async def request(self, route, session=None, *, payload=None, multipart=None, params=None, **kwargs):
+                if multipart:
+                    payload = json.loads(next(part["value"] for part in multipart if part["name"] == "payload_json"))
+                return await fake.serve(route, payload, params)
+
+        return FakeWebhookAdapter()
+
+    async def request(self, route: Route, *, files=None, form=None, **kwargs):
+        """Drop-in replacement for ``discord.http.HTTPClient.request``."""
+        body = kwargs.get("json")
+        if form:
+            body = json.loads(next(part["value"] for part in form if part["name"] == "payload_json"))
+        return await self.serve(route, body, kwargs.get("params"))
+
+    async def serve(self, route: Route, body, params):
+        key = route.key
+        self.requests[key] = self.requests[key] + 1
+        if self.rate_limits:
+            await self._throttle(route)
+        if self.latency:
+            await asyncio.sleep(self.latency * self.rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+        handler = self._handlers.get(f"{route.method} {route.path}")  # The key may carry metadata.
+        pattern = self._patterns.get(route.path)
+        if pattern is None:
+            pattern = self._patterns[route.path] = _path_pattern(route.path)
+        match = pattern.match(route.url[len(Route.BASE):].split("?")[0])
+        if handler is None:
+            return self._default(route, match, body)
+        return handler(match.groupdict() if match else {}, body, params or {})
+
+    async def _throttle(self, route: Route):
+        limit = RATE_LIMITS.get(f"{route.method} {route.path}")
+        window = None
+        if limit is not None:
+            bucket = f"{route.key}:{route.major_parameters}"
+            window = self._windows.get(bucket)
+            if window is None:
+                window = self._windows[bucket] = Window(*limit)
+        exempt = any(part in route.path for part in EXEMPT_FROM_GLOBAL)
+        limited = False
+        while True:
+            now = time.monotonic()
+            wait = window.take(now) if window is not None else 0.0
+            if not wait and not exempt:
+                wait = self._global.take(now)
+                if wait and window is not None:
+                    window.remaining += 1  # Not sent after all.
+            if not wait:
+                return
+            if not limited:
+                self.rate_limited[route.key] += 1
+                limited = True
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def not_found(what: str):
+        return discord.NotFound(FakeResponse(404, "Not Found"), {"code": 10008, "message": f"Unknown {what}"})
+
+    # Handlers
+
+    def _default(self, route: Route, match, body):
+        if route.method == "GET" and "/members/" in route.path and match:
+            user_id = match.groupdict().get("user_id") or match.groupdict().get("member_id")
+            return self.member(self.user(int(user_id), f"user-{user_id}"))
+        if route.method == "PATCH" and "/members/" in route.path and match:
+            user_id = match.groupdict().get("user_id")
+            return dict(self.member(self.user(int(user_id), f"user-{user_id}")), **(body or {}))
+        return None
+
+    def _application(self, match, body, params):
+        return {"id": str(self.application_id), "name": "onWhisper", "icon": None, "description": "",
+                "bot_public": True, "bot_require_code_grant": False, "owner": self.owner, "verify_key": "0",
+                "flags": 0}
+
+    def _callback(self, match, body, params):
+        interaction_id = int(match["webhook_id"])
+        self.replies[interaction_id].append(body)
+        if body.get("type") == 9:
+            self.modals[interaction_id] = body["data"]
+        ack = self._acks.pop(interaction_id, None)
+        if ack is not None and not ack.done():
+            ack.set_result(asyncio.get_running_loop().time())
+        return {"interaction": {"id": str(interaction_id), "type": 2}}
+
+    def _followup(self, match, body, params):
+        interaction_id, channel_id = self._interactions[match["webhook_token"]]
+        self.replies[interaction_id].append(body)
+        message = self.message(channel_id, self.bot_user, body.get("content") or "", embeds=body.get("embeds"))
+        if not body.get("flags", 0) & 64:  # Ephemeral followups never show up in the channel.
+            self.channels[channel_id][int(message["id"])] = message
+        return message
+
+    def _edit_original(self, match, body, params):
+        interaction_id, channel_id = self._interactions[match["webhook_token"]]
+        self.replies[interaction_id].append(body)
+        return self.message(channel_id, self.bot_user, body.get("content") or "", embeds=body.get("embeds"))
+
+    def _create_message(self, match, body, params):
+        channel_id = int(match["channel_id"])
+        message = self.message(channel_id, self.bot_user, body.get("content") or "", embeds=body.get("embeds"))
+        message["components"] = body.get("components") or []
+        self.channels[channel_id][int(message["id"])] = message
+        return message
+
+    def _edit_message(self, match, body, params):
+        channel_id, message_id = int(match["channel_id"]), int(match["message_id"])
+        message = self.channels[channel_id].get(message_id)
+        if message is None:
+            raise self.not_found("Message")
+        message.update({k: v for k, v in body.items() if k in ("content", "embeds")})
+        self.edits.append((time.monotonic(), channel_id, message_id, message["content"]))
+        return message
+
+    def _delete_message(self, match, body, params):
+        if self.channels[int(match["channel_id"])].pop(int(match["message_id"]), None) is None:
+            raise self.not_found("Message")
+
+    def _bulk_delete(self, match, body, params):
+        messages = self.channels[int(match["channel_id"])]
+        for message_id in body["messages"]:
+            messages.pop(int(message_id), None)
+
+    def _history(self, match, body, params):
+        messages = self.channels[int(match["channel_id"])]
+        limit = int(params.get("limit", 50))
+        before = int(params["before"]) if params.get("before") else None
+        after = int(params["after"]) if params.get("after") else None
+        ids = sorted((mid for mid in messages if (before is None or mid < before) and (after is None or mid > after)),
+                     reverse=after is None or before is not None)
+        page = ids[:limit]
+        return [messages[mid] for mid in sorted(page, reverse=True)]
+
+    def _bulk_ban(self, match, body, params):
+        return {"banned_users": [str(user_id) for user_id in body["user_ids"]], "failed_users": []}
@@ -0,0 +1,58 @@
+# bench/filter.py - whisper content filter against large blocklists.
+# Run from the repository root: python -m bench.filter [--terms 10000]
+import argparse
+import random
+import re
+import string
+import time
+
+from utils.filter import ContentFilter
+
+MESSAGE_LENGTH = 200  # WhisperModal caps messages at 200 characters.
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+
+
+def per_call(func, text: str, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(text)
+    return (time.perf_counter() - started) / rounds
+
+
+def bench(term_count: int, rounds: int):
+    rng = random.Random(42)
+    terms = list({random_word(rng) for _ in range(term_count)})
+    words = [random_word(rng) for _ in range(60)]
+    clean = " ".join(words)[:MESSAGE_LENGTH]
+    dirty = " ".join(words[:10] + [terms[7], terms[4000 % len(terms)]] + words[10:])[:MESSAGE_LENGTH]
+
+    started = time.perf_counter()
+    content_filter = ContentFilter(terms)
+    print(f"Compiled {len(terms):,} terms into {len(content_filter.automaton.goto):,} states in "
+          f"{(time.perf_counter() - started) * 1000:.0f}ms")
+
+    started = time.perf_counter()
+    combined = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(terms, key=len, reverse=True))) + r")\b", re.IGNORECASE)
+    print(f"Compiled one combined regex in {(time.perf_counter() - started) * 1000:.0f}ms")
+    patterns = [re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE) for term in terms]
+
+    def naive(text: str):
+        return [p.search(text) for p in patterns]
+
+    for label, text in (("clean", clean), ("2 hits", dirty)):
+        automaton = per_call(lambda t: (content_filter.violation(t), content_filter.redact(t)), text, rounds)
+        regex = per_call(combined.findall, text, rounds)
+        loop = per_call(naive, text, max(1, rounds // 100))
+        print(f"{label:>6}: Aho-Corasick {automaton * 1e6:.0f}us | combined regex {regex * 1e6:.0f}us | "
+              f"regex per term {loop * 1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the whisper content filter.")
+    parser.add_argument("--terms", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    bench(args.terms, args.rounds)
@@ -0,0 +1,221 @@
+# bench/harness.py - boots the real bot offline against FakeDiscord and measures what it does.
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import discord
+from aiohttp import web
+from discord import app_commands
+from discord.webhook.async_ import async_context
+
+from bench.fakes import FakeDiscord
+from utils.metrics import percentile
+
+LAG_INTERVAL = 0.01
+
+
+def memory_kib() -> dict[str, int]:
+    """Returns the current (VmRSS) and peak (VmHWM) resident set size of this process."""
+    values = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    values[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return {"rss": values.get("VmRSS", 0), "peak": values.get("VmHWM", 0)}
+
+
+def describe(samples, unit: str = "ms", scale: float = 1000) -> str:
+    if not samples:
+        return "n/a"
+    return (f"p50 {percentile(samples, 0.5) * scale:.1f}{unit} · p99 {percentile(samples, 0.99) * scale:.1f}{unit}"
+            f" · max {max(samples) * scale:.1f}{unit}")
+
+
+class LagMonitor:
+    """Samples how late the event loop wakes a task that sleeps LAG_INTERVAL at a time."""
+    def __init__(self):
+        self.samples: list[float] = []
+        self._task: asyncio.Task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        self._task.cancel()
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(max(0.0, time.perf_counter() - started - LAG_INTERVAL))
+
+
+class Report:
+    """Numbers for one scenario: throughput, latency, loop lag, memory and REST traffic."""
+    def __init__(self, name: str, fake: FakeDiscord):
+        self.name = name
+        self.fake = fake
+        self.acks: list[float] = []
+        self.handled: list[float] = []
+        self.notes: dict[str, str] = {}
+        self.lag = LagMonitor()
+        self.started = self.elapsed = 0.0
+        self._memory = memory_kib()
+        self._requests = sum(fake.requests.values())
+        self._limited = sum(fake.rate_limited.values())
+        self.requests = self.limited = 0
+        self.memory = {}
+
+    def record(self, ack: float | None, handled: float):
+        if ack is not None:
+            self.acks.append(ack)
+        self.handled.append(handled)
+
+    def note(self, key: str, value):
+        self.notes[key] = str(value)
+
+    def render(self) -> str:
+        lines = [f"== {self.name} ({self.elapsed:.1f}s)"]
+        if self.handled:
+            lines.append(f"   commands     {len(self.handled)} at {len(self.handled) / self.elapsed:.0f}/s")
+            lines.append(f"   first reply  {describe(self.acks)}")
+            lines.append(f"   handler      {describe(self.handled)}")
+        lines.append(f"   loop lag     {describe(self.lag.samples)}")
+        lines.append(f"   memory       rss {self.memory['rss'] / 1024:+.1f}MiB · peak {self.memory['peak'] / 1024:.1f}MiB")
+        lines.append(f"   REST         {self.requests} requests · {self.limited} rate limited")
+        lines.extend(f"   {key:<12} {value}" for key, value in self.notes.items())
+        return "\n".join(lines)
+
+
+class Harness:
+    """Runs the real CustomBot, its cogs and services with Discord replaced by FakeDiscord.
+
+    The bot logs in through the fake, which also answers interaction
+    callbacks and followups. Interactions are built from raw payloads and fed
+    to the command tree and modal store the same way the gateway would.
+    """
+    def __init__(self, fake: FakeDiscord):
+        self.fake = fake
+        self.bot = None
+        self.guild: dict = None
+        self.members: list[dict] = []
+        self.channel_ids: list[int] = []
+        self._jokes: web.AppRunner = None
+        self._log_listener = None
+        self._data = tempfile.TemporaryDirectory(prefix="onwhisper-bench-")
+
+    async def _serve_jokes(self) -> str:
+        rng = random.Random(7)
+
+        async def random_ten(request):
+            return web.json_response([{"id": rng.randrange(10**9), "type": "general",
+                                       "setup": "Why did the bot cross the road?", "punchline": "To reach the other shard."}
+                                      for _ in range(10)])
+
+        app = web.Application()
+        app.router.add_get("/random_ten", random_ten)
+        self._jokes = web.AppRunner(app, access_log=None)
+        await self._jokes.setup()
+        site = web.TCPSite(self._jokes, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/random_ten"
+
+    async def start(self, channels: int, members: int):
+        os.environ.update({
+            "DATA_DIR": self._data.name,
+            "WEB_HOST": "127.0.0.1",
+            "WEB_PORT": "0",
+            "OWNER_ID": self.fake.owner["id"],
+            "JOKE_API_URL": await self._serve_jokes(),
+        })
+        from utils.log import setup_logging
+        self._log_listener = setup_logging(os.path.join(self._data.name, "bot.log"), level=logging.WARNING)
+        import bot as bot_module
+
+        self.bot = bot_module.bot
+        async_context.set(self.fake.adapter())
+        self.bot.http.request = self.fake.request
+        await self.bot.login("bench")
+
+        self.guild = self.fake.guild(channels, members)
+        self.bot._connection._add_guild_from_data(self.guild)
+        self.members = self.guild["members"][2:]  # Skip the bot and the owner.
+        self.channel_ids = [int(channel["id"]) for channel in self.guild["channels"]]
+        self.bot._ready.set()
+
+    def add_members(self, count: int, joined_ago: timedelta = timedelta(minutes=5)) -> list[dict]:
+        """Has ``count`` fresh accounts join the guild, as GUILD_MEMBER_ADD events would; returns their payloads."""
+        guild = self.bot.get_guild(int(self.guild["id"]))
+        joined_at = discord.utils.utcnow() - joined_ago
+        payloads = []
+        for i in range(count):
+            payload = self.fake.member(self.fake.user(self.fake.ids.next(), f"raider{i}"), joined_at=joined_at)
+            guild._add_member(discord.Member(data=payload, guild=guild, state=self.bot._connection))
+            payloads.append(payload)
+        guild._member_count += count
+        return payloads
+
+    def remove_members(self, user_ids):
+        """Drops members from the cache, as GUILD_MEMBER_REMOVE events would after a kick or ban."""
+        guild = self.bot.get_guild(int(self.guild["id"]))
+        for user_id in user_ids:
+            member = guild.get_member(user_id)
+            if member is not None:
+                guild._remove_member(member)
+                guild._member_count -= 1
+
+    async def close(self):
+        await self.bot.close()
+        await self._jokes.cleanup()
+        self._log_listener.stop()
+        self._data.cleanup()
+
+    async def invoke(self, payload: dict) -> tuple[float | None, float]:
+        """Feeds one interaction to the bot; returns (seconds to first reply, seconds to finish handling)."""
+        interaction = discord.Interaction(data=payload, state=self.bot._connection)
+        ack = self.fake.expect(interaction.id)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if payload["type"] == 2:
+            tree = self.bot.tree
+            try:
+                await tree._call(interaction)
+            except app_commands.AppCommandError as e:
+                await tree._dispatch_error(interaction, e)
+        elif payload["type"] == 3:
+            store, message_id = self.bot._connection._view_store, int(payload["message"]["id"])
+            key = (payload["data"]["component_type"], payload["data"]["custom_id"])
+            item = store._views.get(message_id, {}).get(key) or store._views.get(None, {}).get(key)
+            if item is not None:
+                await item.view._scheduled_task(item, interaction)
+        else:
+            modal = self.bot._connection._view_store._modals.get(payload["data"]["custom_id"])
+            if modal is not None:
+                await modal._dispatch_submit(interaction, payload["data"]["components"], {})
+        handled = loop.time() - started
+        return (ack.result() - started if ack.done() else None), handled
+
+    @asynccontextmanager
+    async def measure(self, name: str):
+        report = Report(name, self.fake)
+        report.lag.start()
+        report.started = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report.elapsed = time.perf_counter() - report.started
+            report.lag.stop()
+            after = memory_kib()
+            report.memory = {"rss": after["rss"] - report._memory["rss"], "peak": after["peak"]}
+            report.requests = sum(self.fake.requests.values()) - report._requests
+            report.limited = sum(self.fake.rate_limited.values()) - report._limited
@@ -0,0 +1,350 @@
+# bench/load.py - scripted load scenarios against the real cogs, fully offline.
+# Run from the repository root: python -m bench.load [scenario ...] [--scale 1.0] [--latency 0.05]
+import argparse
+import asyncio
+import gc
+import random
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+
+from bench.fakes import FakeDiscord, MEMBER
+from bench.harness import Harness, describe
+from bench.profiles import gateway_profiles
+from bench.ticker import ticker_simulation
+
+
+async def enable_reveal(h: Harness):
+    """Turns on click-to-reveal with /settings the way a server admin would; whispers are shown in the channel by default."""
+    await h.invoke(h.fake.command(h.guild, h.channel_ids[0], h.guild["members"][1], "settings", options={"whisper": {"reveal": True}}))
+
+
+async def whisper_storm(h: Harness, count: int):
+    """Every user opens /whisper and submits it at once, five whispers per channel.
+
+    Each whisper's recipient clicks Reveal right away, and so does one member it isn't for.
+    """
+    fake, rng = h.fake, random.Random(1)
+    members = {member["user"]["id"]: member for member in h.members}
+    clicks = Counter()
+    await enable_reveal(h)
+    async with h.measure(f"whisper storm: {count} whispers") as report:
+        rejected, before = 0, fake.requests.copy()
+
+        async def click(channel_id: int, message: dict, member: dict):
+            payload = fake.click(h.guild, channel_id, member, message, "whisper:reveal")
+            report.record(*await h.invoke(payload))
+            reply = (fake.replies[int(payload["id"])] or [{}])[-1].get("data", {}).get("content") or ""
+            clicks["revealed" if "Secret Message" in reply else "refused" if "isn't for you" in reply else "other"] += 1
+
+        async def whisper(member: dict, channel_id: int):
+            nonlocal rejected
+            payload = fake.command(h.guild, channel_id, member, "whisper", permissions=MEMBER)
+            report.record(*await h.invoke(payload))
+            modal = fake.modals.pop(int(payload["id"]), None)
+            if modal is None:
+                rejected += 1
+                return
+            recipient = rng.choice(h.members)["user"]["id"]
+            submit = fake.modal_submit(h.guild, channel_id, member, modal, {
+                "Secret Message": f"psst <@{recipient}> meet me after class",
+                "Delete After (Seconds)": str(rng.randint(2, 5)),
+            })
+            report.record(*await h.invoke(submit))
+            placeholder = next((m for m in reversed(fake.channels[channel_id].values())
+                                if m["content"].startswith("🤫") and f"<@{recipient}>" in m["content"]), None)
+            if placeholder is not None:
+                outsider = next(m for m in h.members if m["user"]["id"] not in (recipient, member["user"]["id"]))
+                await asyncio.gather(click(channel_id, placeholder, members[recipient]), click(channel_id, placeholder, outsider))
+
+        await asyncio.gather(*(whisper(h.members[i % len(h.members)], h.channel_ids[i // 5 % len(h.channel_ids)])
+                               for i in range(count)))
+        sent = fake.requests["POST /channels/{channel_id}/messages"] - before["POST /channels/{channel_id}/messages"]
+        report.note("sent", f"{sent} whispers, {rejected} rejected")
+        report.note("reveals", f"{clicks['revealed']} revealed to the recipient, {clicks['refused']} refused to others, "
+                               f"{clicks['other']} other")
+
+        started = time.perf_counter()
+        while any(m["content"].startswith(("💬", "🤫")) for channel in fake.channels.values() for m in channel.values()):
+            if time.perf_counter() - started > 30:
+                break
+            await asyncio.sleep(0.1)
+        left = sum(1 for channel in fake.channels.values() for m in channel.values() if m["content"].startswith(("💬", "🤫")))
+        report.note("expired", f"all but {left} deleted {time.perf_counter() - started:.1f}s after the storm "
+                               f"({(fake.requests - before)['POST /channels/{channel_id}/messages/bulk-delete']} bulk deletes)")
+    print(report.render())
+
+
+async def mass_purge(h: Harness, channels: int, per_channel: int):
+    """/purge_everywhere for one member across channels full of history, then a /clear of a busy channel."""
+    fake = h.fake
+    target, others = h.members[0], h.members[1:20]
+    authors = [target["user"]] + [member["user"] for member in others]
+    purge_channels = h.channel_ids[:channels]
+    for channel_id in purge_channels:
+        fake.seed_history(channel_id, authors, per_channel, timedelta(hours=12))
+    expected = sum(1 for channel_id in purge_channels for m in fake.channels[channel_id].values()
+                   if m["author"]["id"] == target["user"]["id"])
+
+    before = fake.requests.copy()
+    async with h.measure(f"mass purge: {channels} channels x {per_channel} messages") as report:
+        report.record(*await h.invoke(fake.command(h.guild, purge_channels[0], h.guild["members"][1], "purge_everywhere",
+                                                   options={"hours": 24}, members={"member": target})))
+        left = sum(1 for channel_id in purge_channels for m in fake.channels[channel_id].values()
+                   if m["author"]["id"] == target["user"]["id"])
+        report.note("deleted", f"{expected - left}/{expected} of the member's messages")
+
+        clear_channel = h.channel_ids[channels]
+        fake.seed_history(clear_channel, authors, 1000, timedelta(hours=1))
+        report.record(*await h.invoke(fake.command(h.guild, clear_channel, h.guild["members"][1], "clear",
+                                                   options={"amount": 1000})))
+        report.note("cleared", f"{1000 - len(fake.channels[clear_channel])}/1000 with /clear")
+        report.note("routes", ", ".join(f"{key} x{n}" for key, n in (fake.requests - before).items()
+                                        if key.split(" ", 1)[1].startswith("/channels")))
+    print(report.render())
+
+
+async def countdowns(h: Harness, count: int):
+    """Starts ``count`` countdowns at once (five per channel) and checks when each one's final edit lands."""
+    fake, rng = h.fake, random.Random(2)
+    async with h.measure(f"countdowns: {count} concurrent") as report:
+        results = await asyncio.gather(*(h.invoke(fake.command(h.guild, h.channel_ids[i // 5 % len(h.channel_ids)],
+                                                               h.members[i % len(h.members)], "countdown",
+                                                               options={"seconds": rng.randint(10, 20)},
+                                                               permissions=MEMBER))
+                                         for i in range(count)))
+        for result in results:
+            report.record(*result)
+        ticker = h.bot.ticker
+        ends = {message_id: countdown.ends_at for message_id, countdown in ticker.countdowns.items()}
+        report.note("running", f"{len(ends)} countdowns on the ticker")
+
+        started = time.perf_counter()
+        while (len(ticker) or ticker._sending) and time.perf_counter() - started < 120:
+            await asyncio.sleep(0.2)
+        finals = {message_id: at for at, _, message_id, content in fake.edits if "has ended" in content}
+        late = [finals[mid] - ends_at for mid, ends_at in ends.items() if mid in finals]
+        edits = sum(1 for _, _, mid, _ in fake.edits if mid in ends)
+        report.note("final edit", f"{len(late)}/{len(ends)} landed, lateness {describe(late)}")
+        report.note("edits", f"{edits} ({edits / max(len(ends), 1):.1f} per countdown)")
+    print(report.render())
+
+
+async def raid_cleanup(h: Harness, count: int):
+    """A raid of ``count`` accounts per cohort: /mass ban by pasted IDs, /mass kick, /mass timeout by join filter."""
+    fake = h.fake
+    moderator = h.guild["members"][1]
+    for kind, options in (("ban", {"delete_days": 1}), ("kick", {}), ("timeout", {"minutes": 60})):
+        raiders = [int(member["user"]["id"]) for member in h.add_members(count)]
+        if kind == "timeout":
+            options = dict(options, joined_within=15)  # Picks up exactly this cohort.
+        else:
+            options = dict(options, members=" ".join(f"<@{user_id}>" for user_id in raiders))
+        async with h.measure(f"raid cleanup: /mass {kind} x {count}") as report:
+            report.record(*await h.invoke(fake.command(h.guild, h.channel_ids[0], moderator, "mass", options={
+                kind: options})))
+            embed = fake.replies[max(fake.replies)][-1]["embeds"][0]
+            report.note("result", embed["description"])
+            report.note("throughput", f"{count / report.handled[0]:.0f} members/s")
+        print(report.render())
+        if kind != "timeout":
+            h.remove_members(raiders)
+
+    # The same bans one /ban at a time, as moderators had to before.
+    single = max(count // 10, 1)
+    raiders = h.add_members(single)
+    async with h.measure(f"raid cleanup: {single} separate /ban commands") as report:
+        started = time.perf_counter()
+        for result in await asyncio.gather(*(h.invoke(fake.command(h.guild, h.channel_ids[0], moderator, "ban",
+                                                                   members={"member": raider})) for raider in raiders)):
+            report.record(*result)
+        rate = single / (time.perf_counter() - started)
+        report.note("throughput", f"{rate:.0f} members/s, so {count} would take {count / rate:.0f}s")
+    print(report.render())
+
+
+async def broadcast(h: Harness):
+    """/admin_whisper everywhere across every channel, then the same whisper sent one /admin_whisper per channel."""
+    fake = h.fake
+    moderator = h.guild["members"][1]
+    recipient = h.members[0]["user"]["id"]
+    values = {"Secret Message": f"staff meeting in 10 minutes <@{recipient}>", "Delete After (Seconds)": "5"}
+    count = len(h.channel_ids)
+    await enable_reveal(h)
+
+    def send_429s() -> int:
+        return fake.rate_limited["POST /channels/{channel_id}/messages"]
+
+    def placeholders() -> int:
+        return sum(1 for channel_id in h.channel_ids for m in fake.channels[channel_id].values() if m["content"].startswith("🤫"))
+
+    async def whisper(sender: dict, options: dict) -> tuple[dict, tuple]:
+        payload = fake.command(h.guild, h.channel_ids[0], sender, "admin_whisper", options=options)
+        ack = await h.invoke(payload)
+        submit = fake.modal_submit(h.guild, h.channel_ids[0], sender, fake.modals.pop(int(payload["id"])), values)
+        return submit, (ack, await h.invoke(submit))
+
+    async with h.measure(f"broadcast: /admin_whisper everywhere x {count} channels") as report:
+        limited = send_429s()
+        submit, (ack, result) = await whisper(moderator, {"everywhere": True})
+        report.record(*ack)
+        report.record(*result)
+        embed = fake.replies[int(submit["id"])][-1]["embeds"][0]
+        report.note("result", f"{embed['description']} ({embed['footer']['text']})")
+        report.note("throughput", f"{count / result[1]:.0f} channels/s, {placeholders()} placeholders up, "
+                                  f"{send_429s() - limited} sends rate limited")
+
+        started = time.perf_counter()
+        while placeholders() and time.perf_counter() - started < 30:
+            await asyncio.sleep(0.1)
+        report.note("expired", f"all but {placeholders()} deleted {time.perf_counter() - started:.1f}s after the report")
+    print(report.render())
+
+    # What moderators had to do before: one /admin_whisper per channel. /admin_whisper allows one moderator 5 per
+    # 30 seconds, so each channel gets its own moderator here and they all submit at once.
+    targets = [(h.members[i], {"channel": channel}) for i, channel in enumerate(h.guild["channels"])]
+    async with h.measure(f"broadcast: {count} separate /admin_whisper commands") as report:
+        started, limited = time.perf_counter(), send_429s()
+        for _, (ack, result) in await asyncio.gather(*(whisper(sender, options) for sender, options in targets)):
+            report.record(*ack)
+            report.record(*result)
+        report.note("throughput", f"{count / (time.perf_counter() - started):.0f} channels/s, {placeholders()} placeholders up, "
+                                  f"{send_429s() - limited} sends rate limited")
+        while placeholders() and time.perf_counter() - started < 60:
+            await asyncio.sleep(0.1)
+    print(report.render())
+
+
+async def expiry(h: Harness, count: int):
+    """Schedules ``count`` whisper deletions due in the same few seconds, the way /whisper does."""
+    fake, scheduler = h.fake, h.bot.expiry
+    channel_ids = h.channel_ids[:50]
+    messages = []
+    for i in range(count):
+        message = fake.message(channel_ids[i % len(channel_ids)], fake.bot_user, "💬 **Secret Message:** ...")
+        fake.channels[int(message["channel_id"])][int(message["id"])] = message
+        messages.append((int(message["channel_id"]), int(message["id"])))
+
+    requests = fake.requests.copy()
+    async with h.measure(f"whisper expiry: {count} pending") as report:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        latencies = []
+        for channel_id, message_id in messages:
+            started = time.perf_counter()
+            await scheduler.schedule(channel_id, message_id, 3)
+            latencies.append(time.perf_counter() - started)
+        held = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        report.note("schedule", describe(latencies))
+        report.note("heap", f"{held / 1024:.0f}KiB for {len(scheduler)} pending ({held / count:.0f}B each)")
+
+        def deleted() -> int:
+            return sum(1 for channel_id, message_id in messages if message_id not in fake.channels[channel_id])
+
+        deadline = time.perf_counter() + 3
+        while deleted() < count and time.perf_counter() - deadline < 30:
+            await asyncio.sleep(0.05)
+        report.note("drained", f"{deleted()}/{count} deleted {time.perf_counter() - deadline:.1f}s after the deadline "
+                               f"with {(fake.requests - requests)['POST /channels/{channel_id}/messages/bulk-delete']} "
+                               f"bulk deletes")
+
+    # What the old per-whisper `await asyncio.sleep(delete_after)` coroutines would have held.
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sleepers = [asyncio.create_task(asyncio.sleep(60)) for _ in range(count)]
+    await asyncio.sleep(0)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    for task in sleepers:
+        task.cancel()
+    await asyncio.gather(*sleepers, return_exceptions=True)
+    print(report.render())
+    print(f"   baseline     {count} sleeping tasks hold {held / 1024:.0f}KiB ({held / count:.0f}B each)")
+
+
+async def command_mix(h: Harness, count: int, rate: float = 500):
+    """Members hammer the everyday Info, Fun and Help commands at ``rate`` per second while the owner runs /reload."""
+    fake, rng = h.fake, random.Random(4)
+    owner = h.guild["members"][1]
+    commands = [
+        ("ping", {}), ("uptime", {}), ("serverinfo", {}), ("botinfo", {}), ("help", {}),
+        ("roll", {"dice": "3d20"}), ("roll", {"dice": "1000000d1000000 + 4d6kh3"}), ("roll", {"dice": "4d6kh3", "stats": True}),
+        ("choose", {"choices": "tea, coffee, water"}), ("coinflip", {}),
+        ("rps", {"choice": "rock"}), ("joke", {}),
+    ]
+    async with h.measure(f"command mix: {count} commands at {rate:.0f}/s") as report:
+        async def invoke(i: int):
+            await asyncio.sleep(i / rate)
+            channel_id = h.channel_ids[i % len(h.channel_ids)]
+            if i % 100 == 0:
+                payload = fake.command(h.guild, channel_id, owner, "reload")
+            elif i % 10 == 0:
+                payload = fake.command(h.guild, channel_id, owner, "userinfo", members={"user": rng.choice(h.members)})
+            else:
+                name, options = rng.choice(commands)
+                payload = fake.command(h.guild, channel_id, rng.choice(h.members), name, options=options, permissions=MEMBER)
+            report.record(*await h.invoke(payload))
+            return payload
+
+        payloads = await asyncio.gather(*(invoke(i) for i in range(count)))
+        limited = sum(1 for payload in payloads for reply in fake.replies[int(payload["id"])]
+                      if "⏳" in ((reply.get("data") or {}).get("content") or ""))
+        report.note("limited", f"{limited} answered with a rate-limit notice")
+    print(report.render())
+
+
+SCENARIOS = ("ticker", "profiles", "commands", "whispers", "purge", "raid", "broadcast", "expiry", "countdowns")
+
+
+async def run_bot_scenarios(names: list[str], scale: float, latency: float, rate_limits: bool):
+    harness = Harness(FakeDiscord(latency=latency, rate_limits=rate_limits))
+    countdown_count = int(1000 * scale)
+    await harness.start(channels=max(200, countdown_count // 5 + 1), members=max(1000, countdown_count))
+    try:
+        if "commands" in names:
+            await command_mix(harness, int(5000 * scale))
+        if "whispers" in names:
+            await whisper_storm(harness, int(1000 * scale))
+        if "purge" in names:
+            await mass_purge(harness, channels=10, per_channel=int(2000 * scale))
+        if "raid" in names:
+            await raid_cleanup(harness, int(500 * scale))
+        if "broadcast" in names:
+            await broadcast(harness)
+        if "expiry" in names:
+            await expiry(harness, int(10_000 * scale))
+        if "countdowns" in names:
+            await countdowns(harness, countdown_count)
+    finally:
+        await harness.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load scenarios for onWhisper.")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies every scenario's size")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean simulated REST latency in seconds")
+    parser.add_argument("--no-rate-limits", action="store_true", help="turn off simulated Discord rate limits")
+    parser.add_argument("--guilds", type=int, default=50, help="guilds for the gateway profile scenario")
+    parser.add_argument("--members", type=int, default=2000, help="members per guild for the gateway profile scenario")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    if "ticker" in names:
+        ticker_simulation(int(5000 * args.scale))
+    if "profiles" in names:
+        gateway_profiles(args.guilds, args.members)
+    if set(names) & {"commands", "whispers", "purge", "raid", "broadcast", "expiry", "countdowns"}:
+        asyncio.run(run_bot_scenarios(names, args.scale, args.latency, not args.no_rate_limits))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# bench/log.py - event-loop stall under a log flood, with the queue pipeline on and off.
+# Run from the repository root: python -m bench.log [--records 20000] [--burst 200]
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.harness import LagMonitor, describe
+
+
+class SlowConsole:
+    """A console that blocks for ``delay`` seconds per write, like a full pipe or a remote log collector."""
+    def __init__(self, path: str, delay: float):
+        self.file = open(path, "w")
+        self.delay = delay
+
+    def write(self, text: str):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+
+def synchronous_logging(directory: str, console: SlowConsole):
+    """The setup bot.py had before the pipeline: file and console handlers writing on the calling thread."""
+    file_handler = logging.FileHandler(os.path.join(directory, "bot.log"), encoding="utf-8")
+    stream_handler = logging.StreamHandler(console)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[file_handler, stream_handler])
+
+
+def queued_logging(directory: str, console: SlowConsole):
+    from utils.log import setup_logging
+    sys.stderr = console  # The listener's console handler writes to whatever sys.stderr is when it is built.
+    return setup_logging(os.path.join(directory, "bot.log"))
+
+
+async def flood(records: int, burst: int) -> dict:
+    """Logs ``records`` lines in bursts of ``burst``, yielding between bursts the way busy handlers do."""
+    logger = logging.getLogger("cogs.flood")  # Not rate limited, so both runs write every record.
+    monitor = LagMonitor()
+    monitor.start()
+    await asyncio.sleep(0.1)
+    started = time.perf_counter()
+    for i in range(0, records, burst):
+        for j in range(i, min(i + burst, records)):
+            logger.info("/whisper completed", extra={"guild": 1, "channel": 2, "command": "whisper", "latency_ms": j % 97})
+        await asyncio.sleep(0)
+    logged = time.perf_counter() - started
+    await asyncio.sleep(0.1)
+    monitor.stop()
+    return {"logged": logged, "lag": monitor.samples}
+
+
+def child(mode: str, records: int, burst: int, console_delay: float) -> dict:
+    with tempfile.TemporaryDirectory(prefix="onwhisper-log-") as directory:
+        console = SlowConsole(os.path.join(directory, "console.log"), console_delay)
+        listener = (queued_logging if mode == "queue" else synchronous_logging)(directory, console)
+        result = asyncio.run(flood(records, burst))
+        started = time.perf_counter()
+        if listener is not None:
+            listener.stop()  # Waits for the writer thread to finish the backlog.
+        result["drained"] = time.perf_counter() - started
+        with open(os.path.join(directory, "bot.log")) as log_file:
+            result["written"] = sum(1 for line in log_file if "/whisper completed" in line)
+    return result
+
+
+def bench(records: int, burst: int, console_delay: float):
+    for delay in dict.fromkeys((0.0, console_delay)):  # One run when the slow console is turned off.
+        print(f"== log flood: {records:,} records in bursts of {burst}, console writes "
+              f"{f'block {delay * 1e3:g}ms each' if delay else 'to a local file'}")
+        for mode in ("sync", "queue"):
+            run(mode, records, burst, delay)
+
+
+def run(mode: str, records: int, burst: int, console_delay: float):
+    label = "pipeline on" if mode == "queue" else "pipeline off"
+    output = subprocess.run([sys.executable, "-m", "bench.log", "--child", mode, "--records", str(records), "--burst", str(burst),
+                             "--console-delay", str(console_delay)], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    print(f"   {label:<13} loop lag {describe(result['lag'])}")
+    print(f"   {'':<13} {records / result['logged']:,.0f} records/s on the loop, {result['drained'] * 1e3:.0f}ms to drain "
+          f"after, {result['written']:,} written")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure event-loop stall under a log flood.")
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--burst", type=int, default=200, help="records logged between yields to the loop")
+    parser.add_argument("--console-delay", type=float, default=0.0002, help="seconds each console write blocks in the slow run")
+    parser.add_argument("--child", choices=("sync", "queue"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(child(args.child, args.records, args.burst, args.console_delay)))
+    else:
+        bench(args.records, args.burst, args.console_delay)
@@ -0,0 +1,155 @@
+# bench/messages.py - memory and lookup cost of remembering recent messages for edit/delete logs.
+# Run from the repository root: python -m bench.messages [--messages 1000000] [--stock-sample 100000]
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+from bench.fakes import FakeDiscord
+from bench.harness import memory_kib
+
+CHANNELS = 200
+AUTHORS = 1000
+
+
+def load_state():
+    """Returns the bot's ConnectionState with one synthetic guild loaded, plus the fake that built it."""
+    from utils.log import setup_logging
+    setup_logging(os.path.join(tempfile.gettempdir(), "onwhisper-bench.log"), level=logging.WARNING)
+    import bot as bot_module
+
+    fake = FakeDiscord()
+    state = bot_module.bot._connection
+    state.user = None
+    guild = state._add_guild_from_data(fake.guild(CHANNELS, 0))
+    return fake, state, guild
+
+
+def payloads(fake: FakeDiscord, guild, count: int):
+    """Yields MESSAGE_CREATE payloads: chat-sized content, one in twenty with an attachment."""
+    rng = random.Random(7)
+    channels = [channel.id for channel in guild.text_channels]
+    authors = [fake.user(fake.ids.next(), f"user{i}") for i in range(AUTHORS)]
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9))) for _ in range(500)]
+    for _ in range(count):
+        author = rng.choice(authors)
+        data = fake.message(rng.choice(channels), author, " ".join(rng.choices(words, k=rng.randint(2, 18))))
+        data["guild_id"] = str(guild.id)
+        data["member"] = {key: value for key, value in fake.member(author).items() if key != "user"}
+        if rng.random() < 0.05:
+            attachment_id = fake.ids.next()
+            data["attachments"] = [{"id": str(attachment_id), "filename": "image.png", "size": 48213,
+                                    "url": f"https://cdn.discordapp.com/attachments/{data['channel_id']}/{attachment_id}/image.png",
+                                    "proxy_url": f"https://media.discordapp.net/attachments/{data['channel_id']}/{attachment_id}/image.png"}]
+        yield data
+
+
+def build(state, guild, data: dict):
+    # Message() writes the author back into the member dict; give it a copy so the payload list doesn't grow.
+    import discord
+    data = {**data, "member": dict(data["member"])}
+    return discord.Message(state=state, channel=guild.get_channel(int(data["channel_id"])), data=data)
+
+
+def child(kind: str, count: int) -> dict:
+    """Runs in a child process: caches ``count`` messages one way and reports the resident set growth."""
+    from utils.messages import RecentMessages
+
+    fake, state, guild = load_state()
+    stream = list(payloads(fake, guild, count))  # Built up front so only the cache shows in the delta.
+    gc.collect()
+    before = memory_kib()["rss"]
+    started = time.perf_counter()
+    if kind == "stock":
+        cache = deque(maxlen=count)  # What ConnectionState._messages holds with max_messages=count.
+        for data in stream:
+            cache.append(build(state, guild, data))
+        size = None
+    else:
+        cache = RecentMessages(capacity=count, budget=sys.maxsize)
+        for data in stream:
+            cache.add(build(state, guild, data))
+        size = cache.size
+    elapsed = time.perf_counter() - started
+    del stream
+    gc.collect()
+    return {"kind": kind, "count": len(cache), "rss_kib": memory_kib()["rss"] - before, "estimate": size,
+            "ingest_s": elapsed}
+
+
+def run_child(kind: str, count: int) -> dict:
+    output = subprocess.run([sys.executable, "-m", "bench.messages", "--child", kind, "--messages", str(count)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def estimate_accuracy(sample: int):
+    """Compares RecentMessages' own size estimate with what tracemalloc sees."""
+    from utils.messages import RecentMessages
+
+    fake, state, guild = load_state()
+    stream = list(payloads(fake, guild, sample))
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    recent = RecentMessages(capacity=sample, budget=sys.maxsize)
+    for data in stream:
+        recent.add(build(state, guild, data))
+    gc.collect()  # Only the records (and the content they share with the dropped messages) remain.
+    traced = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"   estimate {recent.size / sample:.0f} B/message, tracemalloc {traced / sample:.0f} B/message")
+    return recent
+
+
+def operations(recent, rounds: int):
+    """Times get/edit/pop by message id against a full buffer."""
+    rng = random.Random(3)
+    ids = rng.sample(list(recent._records), rounds)
+    for name, op in (("get", recent.get), ("edit", lambda i: recent.edit(i, "edited")), ("pop", recent.pop)):
+        started = time.perf_counter()
+        for message_id in ids:
+            op(message_id)
+        print(f"   {name:<5} {(time.perf_counter() - started) / rounds * 1e9:.0f}ns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recent-message buffer behind edit/delete logs.")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--stock-sample", type=int, default=100_000,
+                        help="stock Message objects to build; larger counts are extrapolated from this")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.messages)))
+        return
+
+    print(f"== {args.messages:,} messages across {CHANNELS} channels")
+    ring = run_child("ring", args.messages)
+    print(f"   RecentMessages  {ring['rss_kib'] / 1024:.0f}MiB RSS ({ring['rss_kib'] * 1024 / ring['count']:.0f} B/message), "
+          f"estimated {ring['estimate'] / 2 ** 20:.0f}MiB, ingest {ring['ingest_s'] / ring['count'] * 1e6:.1f}us/message")
+    sample = min(args.stock_sample, args.messages)
+    stock = run_child("stock", sample)
+    per_message = stock["rss_kib"] * 1024 / stock["count"]
+    label = "" if sample == args.messages else f" (extrapolated from {sample:,})"
+    print(f"   stock cache     {per_message * args.messages / 2 ** 20:.0f}MiB RSS ({per_message:.0f} B/message){label}, "
+          f"ingest {stock['ingest_s'] / stock['count'] * 1e6:.1f}us/message")
+
+    print("== size estimate at 10,000 messages")
+    recent = estimate_accuracy(10_000)
+    print("== lookups by id")
+    operations(recent, 5000)
+
+
+if __name__ == "__main__":
+    main()
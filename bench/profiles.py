@@ -0,0 +1,56 @@
+# bench/profiles.py - resident memory of the full and lean gateway profiles with the same guilds loaded.
+# Run from the repository root: python -m bench.profiles [--guilds 50 --members 2000]
+import argparse
+import gc
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench.fakes import FakeDiscord
+from bench.harness import memory_kib
+
+
+def gateway_profile(profile: str, guilds: int, members: int) -> dict:
+    """Runs in a child process: loads synthetic guilds the way READY plus member chunks would.
+
+    Both profiles get the same payloads, so only the profile's member cache flags decide what is kept.
+    """
+    os.environ["BOT_PROFILE"] = profile
+    from utils.log import setup_logging
+    setup_logging(os.path.join(tempfile.gettempdir(), "onwhisper-bench.log"), level=logging.WARNING)
+    import bot as bot_module
+
+    fake = FakeDiscord()
+    state = bot_module.bot._connection
+    state.user = None
+    before = memory_kib()["rss"]
+    for _ in range(guilds):
+        state._add_guild_from_data(fake.guild(20, members))
+    gc.collect()
+    cached = sum(len(guild.members) for guild in state.guilds)
+    return {"profile": profile, "rss_kib": memory_kib()["rss"] - before, "members_cached": cached}
+
+
+def gateway_profiles(guilds: int = 50, members: int = 2000):
+    print(f"== gateway profiles: {guilds} guilds x {members} members")
+    for profile in ("full", "lean"):
+        output = subprocess.run([sys.executable, "-m", "bench.profiles", "--child", profile,
+                                 "--guilds", str(guilds), "--members", str(members)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"   {profile:<12} {result['rss_kib'] / 1024:.1f}MiB for {result['members_cached']} cached members")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory of the gateway profiles.")
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--members", type=int, default=2000, help="members per guild")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(gateway_profile(args.child, args.guilds, args.members)))
+    else:
+        gateway_profiles(args.guilds, args.members)
@@ -0,0 +1,55 @@
+# bench/ratelimit.py - check cost and memory of the slash-command rate limiter.
+# Run from the repository root: python -m bench.ratelimit [--users 1000000]
+import argparse
+import gc
+import time
+import tracemalloc
+
+from utils.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def bench(users: int):
+    clock = FakeClock()
+    limiter = RateLimiter(3, 20, clock=clock)
+
+    started = time.perf_counter()
+    for user_id in range(users):
+        limiter.hit(user_id)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    measured = RateLimiter(3, 20, clock=clock)
+    for user_id in range(users):
+        measured.hit(user_id)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del measured
+    print(f"{users:,} distinct users: {elapsed / users * 1e9:.0f}ns per check, "
+          f"{current / 2**20:.1f}MiB held ({current / users:.0f}B per bucket)")
+
+    started = time.perf_counter()
+    rejected = sum(1 for _ in range(4) for user_id in range(users // 10) if limiter.hit(user_id))
+    elapsed = time.perf_counter() - started
+    print(f"Hot keys: {elapsed / (4 * (users // 10)) * 1e9:.0f}ns per check, {rejected:,} rejected")
+
+    clock.now += 21  # Every bucket has refilled; checks sweep them as they go.
+    started = time.perf_counter()
+    for user_id in range(users, users + users // 2):
+        limiter.hit(user_id)
+    elapsed = time.perf_counter() - started
+    print(f"After idling: {elapsed / (users // 2) * 1e9:.0f}ns per check while sweeping, {len(limiter):,} buckets left")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the slash-command rate limiter.")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    bench(parser.parse_args().users)
@@ -0,0 +1,92 @@
+# bench/reveal.py - memory and click latency of click-to-reveal whispers with many outstanding.
+# Run from the repository root: python -m bench.reveal [--whispers 100000]
+import argparse
+import asyncio
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from cogs.whisper import RevealView, SecretStore
+from utils.database import Database
+
+CONTENT = "psst <@123456789012345678> meet me after class, bring the notes from Tuesday"
+
+
+def traced(label: str, build, count: int):
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"   {label:<34} {size / 2 ** 20:7.1f}MiB ({size / count:.0f} B/whisper)")
+    return kept
+
+
+async def bench(count: int, clicks: int):
+    rng = random.Random(9)
+    ids = [10 ** 18 + i for i in range(count)]
+    print(f"== {count:,} outstanding whispers")
+
+    # What a View per message would cost: discord.py keeps each one alive in its view store until it times out.
+    def views():
+        store = {}
+        for message_id in ids:
+            view = RevealView(None)
+            store[message_id] = view
+        return store
+    per_message = traced("one View per message", views, count)
+    for view in per_message.values():
+        view.stop()
+    del per_message
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "reveal.db")
+        db = Database(path)
+        await db.connect()
+        secrets = SecretStore(db)
+        await secrets.start()
+        started = time.perf_counter()
+        await db.executemany("INSERT INTO whisper_secrets VALUES (?, ?, ?, ?, ?)",
+                             [(message_id, 1, "123456789012345678", CONTENT, time.time() + 3600) for message_id in ids])
+        print(f"   stored {count:,} rows in {time.perf_counter() - started:.1f}s")
+
+        async def fill():
+            for message_id in ids[-SecretStore.CACHE_SIZE:]:
+                await secrets.get(message_id)
+        gc.collect()
+        tracemalloc.start()
+        await fill()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   {'shared view + SecretStore LRU':<34} {size / 2 ** 20:7.1f}MiB (cache capped at {SecretStore.CACHE_SIZE:,}; "
+              f"the rest is on disk)")
+
+        for label, pool in (("cached", ids[-SecretStore.CACHE_SIZE:]), ("from SQLite", ids[:count // 2])):
+            sample = rng.sample(pool, min(clicks, len(pool)))
+            started = time.perf_counter()
+            for message_id in sample:
+                await secrets.get(message_id)
+            print(f"   click lookup {label:<12} {(time.perf_counter() - started) / len(sample) * 1e6:.0f}us")
+        await db.close()
+
+        # A restart: a fresh store on the same file still answers every button.
+        db = Database(path)
+        await db.connect()
+        restarted = SecretStore(db)
+        await restarted.start()
+        found = sum(1 for secret in await asyncio.gather(*(restarted.get(message_id) for message_id in rng.sample(ids, 1000))) if secret)
+        print(f"   after a restart {found}/1000 buttons still resolve")
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark click-to-reveal whispers.")
+    parser.add_argument("--whispers", type=int, default=100_000)
+    parser.add_argument("--clicks", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.whispers, args.clicks))
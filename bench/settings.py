@@ -0,0 +1,59 @@
+# bench/settings.py - per-guild settings lookups through the read-through cache.
+# Run from the repository root: python -m bench.settings [--guilds 50000] [--configured 0.1]
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from utils.database import Database
+from utils.settings import SettingsStore
+
+
+async def bench(guilds: int, configured: float, lookups: int):
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "settings.db"))
+        await db.connect()
+        store = SettingsStore(db)
+        await store.start()
+        ids = [10 ** 17 + i for i in range(guilds)]
+        rows = [(guild_id, "?", None, rng.choice((600, 7200)), None, None) for guild_id in rng.sample(ids, int(guilds * configured))]
+        await db.executemany("INSERT INTO guild_settings (guild_id, prefix, whisper_min_seconds, whisper_max_seconds, "
+                             "whisper_max_length, mute_role_id) VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        for guild_id in ids:
+            await store.get(guild_id)
+        cold = (time.perf_counter() - started) / guilds
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Cold: {guilds:,} guilds ({len(rows):,} configured) loaded at {cold * 1e6:.0f}us each; "
+              f"cache holds {len(store):,} ({size / 2 ** 20:.1f}MiB)")
+
+        hot = [rng.choice(ids[-store.cache_size:]) for _ in range(lookups)]
+        started = time.perf_counter()
+        for guild_id in hot:
+            await store.get(guild_id)
+        print(f"Warm: {(time.perf_counter() - started) / lookups * 1e6:.2f}us per lookup, no I/O")
+
+        started = time.perf_counter()
+        burst = rng.sample(ids[:guilds - store.cache_size], min(1000, guilds - store.cache_size)) if guilds > store.cache_size else []
+        await asyncio.gather(*(store.get(guild_id) for guild_id in burst for _ in range(5)))
+        if burst:
+            print(f"Evicted guilds: {len(burst):,} reloaded by 5 concurrent callers each in "
+                  f"{(time.perf_counter() - started) * 1000:.0f}ms with {len(burst):,} queries")
+        print(f"Hits {store.hits:,} · misses {store.misses:,}")
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the per-guild settings cache.")
+    parser.add_argument("--guilds", type=int, default=50_000)
+    parser.add_argument("--configured", type=float, default=0.1, help="share of guilds with a settings row")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.guilds, args.configured, args.lookups))
@@ -0,0 +1,85 @@
+# bench/stats.py - /serverinfo breakdowns from incremental counters versus scanning the member list.
+# Run from the repository root: python -m bench.stats [--members 100000] [--events 100000]
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+import discord
+
+from bench.fakes import FakeDiscord
+
+
+def scan(guild: discord.Guild) -> tuple:
+    """What /serverinfo would have to do per call without the tracker."""
+    humans = bots = online = 0
+    roles = {}
+    for member in guild.members:
+        if member.bot:
+            bots += 1
+        else:
+            humans += 1
+        if member.status is not discord.Status.offline:
+            online += 1
+        for role_id in member._roles:
+            roles[role_id] = roles.get(role_id, 0) + 1
+    return humans, bots, online, roles
+
+
+def bench(member_count: int, events: int):
+    from utils.log import setup_logging
+    setup_logging(os.path.join(tempfile.gettempdir(), "onwhisper-bench.log"), level=logging.WARNING)
+    import bot as bot_module
+
+    fake, rng = FakeDiscord(), random.Random(5)
+    state = bot_module.bot._connection
+    state.user = None
+    guild = state._add_guild_from_data(fake.guild(50, member_count))
+    stats = bot_module.bot.stats
+    roles = [role.id for role in guild.roles if not role.is_default()]
+
+    started = time.perf_counter()
+    tracked = stats.get(guild)
+    print(f"First build for {len(guild.members):,} members: {(time.perf_counter() - started) * 1000:.0f}ms (once per guild)")
+
+    started = time.perf_counter()
+    for _ in range(10):
+        scan(guild)
+    print(f"Full scan per /serverinfo: {(time.perf_counter() - started) * 100:.1f}ms")
+
+    started = time.perf_counter()
+    for _ in range(10_000):
+        tracked.window(86400), tracked.window(7 * 86400), tracked.roles.most_common(5)
+    print(f"Tracked stats per /serverinfo: {(time.perf_counter() - started) * 100:.1f}us")
+
+    # Role churn and leaves through the hooks, then check them against a rescan.
+    members = list(guild.members)
+    started = time.perf_counter()
+    for i in range(events):
+        index = rng.randrange(len(members))
+        member = members[index]
+        if i % 10 == 0:
+            guild._remove_member(member)
+            stats.member_remove(member)
+            members[index] = members[-1]
+            members.pop()
+            continue
+        before = discord.Member._copy(member)
+        role_id = rng.choice(roles)
+        member._roles = discord.utils.SnowflakeList(set(member._roles) ^ {role_id})
+        stats.member_update(before, member)
+    print(f"{events:,} member events applied in {(time.perf_counter() - started) * 1000:.0f}ms")
+    humans, bots, online, counts = scan(guild)
+    exact = (tracked.humans, tracked.bots, tracked.online) == (humans, bots, online) \
+        and {k: v for k, v in tracked.roles.items() if v} == counts
+    print(f"Counters match a rescan: {exact}; leaves in the last 24h: {tracked.window(86400)[1]:,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incrementally kept guild statistics.")
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+    bench(args.members, args.events)
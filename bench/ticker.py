@@ -0,0 +1,67 @@
+# bench/ticker.py - drives CountdownTicker on a simulated clock: edit count and end-time skew for thousands of countdowns.
+# Run from the repository root: python -m bench.ticker [--countdowns 5000]
+import argparse
+import math
+import random
+import time
+from collections import Counter
+
+from utils.ticker import CountdownTicker, GLOBAL_EDIT_BUDGET, GLOBAL_EDIT_REFILL_PER_SECOND
+
+DISCORD_GLOBAL_LIMIT = 50  # Requests per second for the whole bot
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def simulate(label: str, count: int, channels: int, durations: tuple[int, int], step: float, global_budget: float,
+             global_rate: float = GLOBAL_EDIT_REFILL_PER_SECOND):
+    """Adds ``count`` countdowns at t=0 and ticks until every one has had its final edit."""
+    rng = random.Random(3)
+    clock = [0.0]
+    ticker = CountdownTicker(clock=lambda: clock[0], global_budget=global_budget, global_rate=global_rate)
+    ends = {}
+    for message_id in range(count):
+        seconds = rng.randint(*durations)
+        ticker.add(message_id % channels, message_id, "@user", seconds)
+        ends[message_id] = seconds
+
+    started = time.perf_counter()
+    skew, edits, ticks = [], 0, 0
+    per_second = Counter()
+    while len(ticker):
+        clock[0] += step
+        ticks += 1
+        for edit in ticker.tick():
+            edits += 1
+            per_second[math.floor(clock[0])] += 1
+            if edit.final:
+                skew.append(clock[0] - ends[edit.message_id])
+    elapsed = time.perf_counter() - started
+    over = sum(1 for n in per_second.values() if n > DISCORD_GLOBAL_LIMIT)
+    print(f"== {label}: {count} countdowns of {durations[0]}-{durations[1]}s over {channels} channels, {step}s ticks")
+    print(f"   tick cost    {elapsed / ticks * 1e6:.0f}us average over {ticks} ticks")
+    print(f"   final edit   lateness p50 {percentile(skew, 0.5) * 1e3:.0f}ms · p99 {percentile(skew, 0.99) * 1e3:.0f}ms "
+          f"· max {max(skew) * 1e3:.0f}ms")
+    print(f"   edits        {edits} ({edits / count:.1f} per countdown), peak {max(per_second.values())}/s, "
+          f"{over} second(s) over Discord's {DISCORD_GLOBAL_LIMIT}/s")
+
+
+def ticker_simulation(countdowns: int = 5000, channels: int = 40, step: float = 0.1):
+    # Long countdowns spread out, as /countdown allows (10 s to an hour).
+    simulate("ticker: spread", countdowns, channels, (10, 3600), step, GLOBAL_EDIT_BUDGET)
+    # A burst of short countdowns in many channels; only the bot-wide budget keeps this under the global limit.
+    burst = max(countdowns // 5, 1)
+    simulate("ticker: burst, per-channel budget only", burst, 200, (10, 20), step, math.inf, math.inf)
+    simulate("ticker: burst, with the bot-wide budget", burst, 200, (10, 20), step, GLOBAL_EDIT_BUDGET)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate the countdown ticker.")
+    parser.add_argument("--countdowns", type=int, default=5000)
+    parser.add_argument("--channels", type=int, default=40)
+    parser.add_argument("--step", type=float, default=0.1, help="simulated seconds per tick")
+    args = parser.parse_args()
+    ticker_simulation(args.countdowns, args.channels, args.step)
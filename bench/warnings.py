@@ -0,0 +1,88 @@
+# bench/warnings.py - insert throughput and lookup latency of the warnings store at a million rows.
+# Run from the repository root: python -m bench.warnings [--rows 1000000]
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from cogs.moderation import WARN_EXPIRY_DAYS, WarningStore
+from utils.database import Database
+
+
+def latency(samples: list[float]) -> str:
+    samples = sorted(samples)
+    return (f"p50 {samples[len(samples) // 2] * 1e6:.0f}us · p99 {samples[int(len(samples) * 0.99)] * 1e6:.0f}us"
+            f" · max {samples[-1] * 1e6:.0f}us")
+
+
+async def timed(calls) -> list[float]:
+    samples = []
+    for call in calls:
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def bench(rows: int, guilds: int, members: int, wave: int, lookups: int):
+    rng = random.Random(4)
+    now = int(time.time())
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "warnings.db"))
+        await db.connect()
+        store = WarningStore(db)
+        await store.start()
+        print(f"== {rows:,} warnings over {guilds:,} guilds x {members:,} members")
+
+        # History spread over twice the expiry window, so about half of it is expired.
+        started = time.perf_counter()
+        for i in range(0, rows, 100_000):
+            await db.executemany(
+                "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(rng.randrange(guilds), rng.randrange(members), 1, "spam", now - rng.randrange(2 * WARN_EXPIRY_DAYS * 86400))
+                 for _ in range(min(100_000, rows - i))]
+            )
+        print(f"   seeded         {rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+        # A raid wave of /warn on fresh members: write-behind batches against one commit per warning.
+        targets = [(rng.randrange(guilds), members + i) for i in range(wave)]
+        started = time.perf_counter()
+        await asyncio.gather(*(store.add(guild_id, user_id, 2, "raid") for guild_id, user_id in targets))
+        queued = time.perf_counter() - started
+        await store.flush()
+        batched = time.perf_counter() - started
+        print(f"   /warn x {wave:,}   {wave / batched:,.0f}/s write-behind ({queued / wave * 1e6:.0f}us each to answer)")
+
+        started = time.perf_counter()
+        for guild_id, user_id in targets[:wave // 10]:
+            await db.execute("INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                             (guild_id, user_id, 2, "raid", now))
+        print(f"   baseline       {wave // 10 / (time.perf_counter() - started):,.0f}/s with one commit per warning")
+
+        sample = [(rng.randrange(guilds), rng.randrange(members)) for _ in range(lookups)]
+        store._counts.clear()
+        cold = await timed(lambda g=g, u=u: store.count(g, u) for g, u in sample)
+        warm = await timed(lambda g=g, u=u: store.count(g, u) for g, u in sample)
+        print(f"   /warns cold    {latency(cold)} (indexed COUNT)")
+        print(f"   /warns warm    {latency(warm)} (cached)")
+        first = await timed(lambda g=g, u=u: store.history(g, u) for g, u in sample[:1000])
+        print(f"   history page   {latency(first)}")
+
+        started = time.perf_counter()
+        removed = await store.expire()
+        print(f"   expire         {removed:,} old warnings removed in {time.perf_counter() - started:.1f}s")
+        await store.close()
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the warnings store.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=5000, help="members per guild with warnings")
+    parser.add_argument("--wave", type=int, default=20_000, help="warnings issued at once")
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.guilds, args.members, args.wave, args.lookups))
@@ -0,0 +1,111 @@
+# bench/web.py - startup time and request latency of the bot's web server, measured with a local aiohttp client.
+# Run from the repository root: python -m bench.web [--requests 2000] [--concurrency 50]
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+
+import aiohttp
+
+os.environ.setdefault("WEBHOOK_SECRET", "bench")  # Read at import; registers the release webhook.
+os.environ.setdefault("ADMIN_TOKEN", "bench")
+
+from bench.harness import describe
+from utils.metrics import Histogram, Metrics
+import utils.web
+from utils.web import WebServer
+
+
+class StubBot:
+    """What the routes read from the bot, with metrics filled in like a busy production process."""
+    def __init__(self, shards: int, commands: int):
+        rng = random.Random(5)
+        self.metrics = Metrics()
+        self.guilds = [object()] * 2500
+        self.latencies = [(shard_id, rng.uniform(0.03, 0.2)) for shard_id in range(shards)]
+        self.extensions = {}
+        for i in range(commands):
+            histogram = self.metrics.command_latency[f"command{i}"] = Histogram()
+            for _ in range(200):
+                histogram.observe(rng.expovariate(10))
+            self.metrics.command_errors[(f"command{i}", "HTTPException")] += 1
+        for i in range(100):
+            self.metrics.rest_requests[("POST", f"/channels/{{channel_id}}/route{i}", 200)] += rng.randrange(1000)
+        self.metrics.gateway_latency.update(self.latencies)
+
+    def is_ready(self) -> bool:
+        return True
+
+    def is_closed(self) -> bool:
+        return False
+
+
+async def timed_requests(session: aiohttp.ClientSession, method: str, url: str, count: int, concurrency: int, **kwargs):
+    samples, statuses = [], set()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            started = time.perf_counter()
+            async with session.request(method, url, **kwargs) as response:
+                await response.read()
+                statuses.add(response.status)
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return samples, time.perf_counter() - started, statuses
+
+
+async def bench(requests: int, concurrency: int, shards: int, commands: int):
+    bot = StubBot(shards, commands)
+    server = WebServer(bot, "127.0.0.1", 0)
+    started = time.perf_counter()
+    await server.start()
+    startup = time.perf_counter() - started
+    port = server._runner.addresses[0][1]
+    base = f"http://127.0.0.1:{port}"
+    print(f"== web server: {requests:,} requests per route, {concurrency} at a time")
+    print(f"   startup      {startup * 1e3:.1f}ms to listening")
+
+    routes = [
+        ("GET", "/healthz", {}),
+        ("GET", "/readyz", {}),
+        ("GET", "/metrics", {}),
+        ("POST", "/replit-webhook", {}),  # No token: answered 401 without touching the bot.
+        ("POST", "/admin/reload/fun", {"headers": {"Authorization": "Bearer bench"}}),  # Not loaded: 404.
+    ]
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base}/healthz") as response:  # Warm the connection pool.
+            await response.read()
+        for method, path, kwargs in routes:
+            single, _, _ = await timed_requests(session, method, base + path, min(requests, 500), 1, **kwargs)
+            loaded, elapsed, statuses = await timed_requests(session, method, base + path, requests, concurrency, **kwargs)
+            print(f"   {f'{method} {path}':<25} {describe(single)} alone · {requests / elapsed:,.0f}/s under load "
+                  f"({describe(loaded)}) · {'/'.join(map(str, sorted(statuses)))}")
+        async with session.get(f"{base}/metrics") as response:
+            size = len(await response.read())
+        print(f"   /metrics     {size / 1024:.0f}KiB for {commands} commands and {shards} shards")
+    await server.stop()
+
+    # Without a secret the webhook is not registered at all.
+    utils.web.WEBHOOK_SECRET = None
+    server = WebServer(bot, "127.0.0.1", 0)
+    await server.start()
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"http://127.0.0.1:{server._runner.addresses[0][1]}/replit-webhook") as response:
+            print(f"   no secret    POST /replit-webhook answered {response.status}")
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bot's web server.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--commands", type=int, default=60)
+    args = parser.parse_args()
+    logging.getLogger("utils.web").setLevel(logging.ERROR)  # The disabled-webhook warning below is expected.
+    asyncio.run(bench(args.requests, args.concurrency, args.shards, args.commands))
@@ -1,39 +1,300 @@
 import os
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
 import logging
 import asyncio
 import random
 import aiohttp
 import traceback
+import importlib
+import sys
+import hashlib
+import json
+import time
+from utils.database import Database, DATA_DIR
+from utils.expiry import ExpiryScheduler
+from utils.messages import RecentMessages
+from utils.settings import GuildSettings, SettingsStore
+from utils.stats import StatsTracker
+from utils.ticker import CountdownTicker
+from utils.cluster import ClusterClient, is_primary, shard_options
+from utils.log import setup_logging, interaction_context
+from utils.metrics import Metrics
+from utils.ratelimit import RateLimited
+from utils.web import WebServer
 
-class CustomBot(commands.Bot):
+PROCESS_START = time.perf_counter()
+
+EXTENSIONS = ["cogs.whisper", "cogs.owner", "cogs.info", "cogs.help", "cogs.fun", "cogs.moderation", "cogs.logs", "cogs.settings"]
+TREE_HASH_PATH = os.path.join(DATA_DIR, "command_tree.hash")
+# Modules whose objects live on the bot itself; changing them needs a real restart.
+CORE_MODULES = {__name__, "utils.database", "utils.expiry", "utils.messages", "utils.settings", "utils.stats", "utils.ticker", "utils.cluster", "utils.log", "utils.metrics", "utils.ratelimit", "utils.web"}
+
+def read_version(path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "version.txt")) -> str:
+    try:
+        with open(path, "r") as version_file:
+            return version_file.read().strip()
+    except OSError:
+        return "unknown"
+
+def source_mtime(module_name: str) -> float | None:
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    try:
+        return os.path.getmtime(path)
+    except (TypeError, OSError):
+        return None
+
+class InstrumentedTree(app_commands.CommandTree):
+    """Command tree that times every app command for the metrics endpoint."""
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        self.client.metrics.command_started(interaction)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.client.metrics.command_failed(interaction, error)
+        if isinstance(error, RateLimited):
+            message = f"⏳ Slow down! You can use this command again in {error.retry_after:.1f}s."
+            if error.scope != "user":
+                message = f"⏳ This command is busy in this {error.scope}. Try again in {error.retry_after:.1f}s."
+            send = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+            await send(message, ephemeral=True)
+            return
+        await super().on_error(interaction, error)
+
+class CustomBot(commands.AutoShardedBot):
     def __init__(self, *args, **kwargs):
+        self.metrics = Metrics()
+        kwargs.setdefault("tree_cls", InstrumentedTree)
+        kwargs.setdefault("http_trace", self.metrics.trace_config())
         super().__init__(*args, **kwargs)
         self.session: aiohttp.ClientSession = None
+        self.db: Database = None
+        self.settings: SettingsStore = None
+        self.expiry: ExpiryScheduler = None
+        self.ticker: CountdownTicker = None
+        self.cluster: ClusterClient = None
+        self.web: WebServer = None
+        self.change_activity: tasks.Loop = None
+        self.version = read_version()  # Read once; /botinfo serves it from memory.
+        self.recent = RecentMessages()  # Compact records for edit/delete logging instead of a big message cache.
+        self.stats = StatsTracker(self)  # Guild counters for /serverinfo, kept current from gateway events.
+        self.started_up = False
+        self.restart_requested = False
+        self._disconnected_at: dict[int, float] = {}
+        self._source_mtimes: dict[str, float] = {}
 
     async def setup_hook(self):
         self.session = aiohttp.ClientSession()
+        self.db = Database()
+        await self.db.connect()
+        self.settings = SettingsStore(self.db)
+        await self.settings.start()
+        self.expiry = ExpiryScheduler(self, self.db)
+        await self.expiry.start()
+        self.ticker = CountdownTicker(self)
+        self.ticker.start()
+        if os.getenv("CLUSTER_IPC"):
+            self.cluster = ClusterClient(self, os.environ["CLUSTER_IPC"])
+            self.cluster.start()
+        self.metrics.start(self)
+        self.web = WebServer(self)
+        try:
+            await self.web.start()
+        except OSError as e:
+            logger.error(f"Could not start the web server: {e}")
+        await self.load_extensions()
+        await self.sync_commands()
+        self.snapshot_sources()
+
+    async def load_extensions(self):
+        """Loads every extension concurrently and logs how long each one took."""
+        async def load(name: str):
+            started = time.perf_counter()
+            try:
+                await self.load_extension(name)
+            except Exception as e:
+                logger.error(f"Failed to load {name}: {e}")
+                return
+            logger.info(f"{name} loaded successfully in {(time.perf_counter() - started) * 1000:.1f}ms.")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(load(name) for name in EXTENSIONS))
+        logger.info(f"Loaded {len(self.extensions)}/{len(EXTENSIONS)} extensions in {(time.perf_counter() - started) * 1000:.1f}ms.")
+        self.dispatch("extensions_changed")
+
+    async def reload_extensions(self, names: list[str] = None) -> dict[str, str | None]:
+        """Reloads extensions in place and returns each one's error, or None if it reloaded."""
+        started = time.perf_counter()
+        results = {}
+        for name in names or list(self.extensions):
+            try:
+                await self.reload_extension(name)
+                results[name] = None
+            except Exception as e:
+                logger.error(f"Failed to reload {name}: {e}")
+                results[name] = str(e)
+        reloaded = sum(1 for error in results.values() if error is None)
+        logger.info(f"Reloaded {reloaded}/{len(results)} extensions in {(time.perf_counter() - started) * 1000:.1f}ms.")
+        if reloaded:
+            self.dispatch("extensions_changed")
+            await self.sync_commands()
+        return results
+
+    def snapshot_sources(self):
+        """Remembers the modification time of every bot, cog and helper module."""
+        self._source_mtimes = {
+            name: source_mtime(name) for name in list(sys.modules)
+            if name in CORE_MODULES or name.startswith(("cogs.", "utils."))
+        }
+
+    def changed_sources(self) -> tuple[list[str], list[str], list[str]]:
+        """Returns the (extensions, helper modules, core modules) edited since the last snapshot."""
+        changed = [name for name, mtime in self._source_mtimes.items() if source_mtime(name) != mtime]
+        core = [name for name in changed if name in CORE_MODULES]
+        extensions = [name for name in changed if name in self.extensions]
+        helpers = [name for name in changed if name not in CORE_MODULES and name not in self.extensions]
+        return extensions, helpers, core
+
+    async def hot_reload(self, names: list[str] = None) -> tuple[dict[str, str | None], list[str]]:
+        """Reloads the given extensions, or every edited one, without touching the gateway.
+
+        Edited helper modules are re-imported first and then every extension
+        is reloaded, since any cog may use them. State owned by the bot (the
+        whisper expiry heap, running countdowns, the status loop) is not
+        rebuilt and carries straight across. Returns the reload results and
+        the edited core modules that still need a real restart.
+        """
+        extensions, helpers, core = self.changed_sources()
+        for name in helpers:
+            try:
+                importlib.reload(sys.modules[name])
+                logger.info(f"Re-imported {name}.")
+            except Exception as e:
+                logger.error(f"Failed to re-import {name}: {e}")
+        if names is None:
+            names = list(self.extensions) if helpers else extensions
+
+        results = await self.reload_extensions(names) if names else {}
+        stale = {name: self._source_mtimes[name] for name in core}
+        self.snapshot_sources()
+        self._source_mtimes.update(stale)  # Keep reporting them until the process restarts.
+        return results, core
+
+    async def restart(self):
+        """Shuts down cleanly; main() then replaces the process with a fresh one."""
+        self.restart_requested = True
+        await self.close()
+
+    def command_tree_hash(self) -> str:
+        payload = sorted((command.to_dict(self.tree) for command in self.tree.get_commands()), key=lambda c: (c["name"], c.get("type", 1)))
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync_commands(self, force: bool = False):
+        """Syncs the command tree only if its definitions changed since the last sync."""
+        if not force and not is_primary():
+            # The tree is global and cluster workers share the hash file, so only one of them syncs.
+            logger.info("Command sync left to the primary cluster.")
+            return
+        tree_hash = self.command_tree_hash()
+        try:
+            with open(TREE_HASH_PATH, "r") as hash_file:
+                synced_hash = hash_file.read().strip()
+        except OSError:
+            synced_hash = None
+
+        if tree_hash == synced_hash and not force:
+            logger.info("Command tree unchanged, skipping sync.")
+            return
+        try:
+            synced = await self.tree.sync()
+            logger.info(f"Synced {len(synced)} commands.")
+        except Exception as e:
+            logger.error(f"Error syncing commands: {e}")
+            return
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(TREE_HASH_PATH, "w") as hash_file:
+            hash_file.write(tree_hash)
+
+    async def on_shard_disconnect(self, shard_id: int):
+        self._disconnected_at.setdefault(shard_id, time.perf_counter())
+
+    async def on_shard_resumed(self, shard_id: int):
+        self._log_reconnect(shard_id, "resumed")
+
+    async def on_shard_ready(self, shard_id: int):
+        self._log_reconnect(shard_id, "re-identified")
+
+    def _log_reconnect(self, shard_id: int, how: str):
+        disconnected_at = self._disconnected_at.pop(shard_id, None)
+        if disconnected_at is not None:
+            logger.info(f"Shard {shard_id} {how} after {(time.perf_counter() - disconnected_at) * 1000:.0f}ms offline.")
 
     async def close(self):
+        # Unload cogs first so they can flush their state while the database is still open.
+        for extension in tuple(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception as e:
+                logger.error(f"Failed to unload {extension}: {e}")
+        if self.expiry:
+            self.expiry.stop()
+        if self.ticker:
+            self.ticker.stop()
+        if self.cluster:
+            self.cluster.stop()
+        self.metrics.stop()
+        if self.web:
+            await self.web.stop()
         await self.session.close()
+        if self.db:
+            await self.db.close()
         await super().close()
         logger.info("Bot session closed.")
 
 
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 
-logging.basicConfig(level=logging.INFO,
-                    format="%(asctime)s [%(levelname)s] %(message)s",
-                    handlers=[
-                        logging.FileHandler("bot.log", encoding='utf-8'),
-                        logging.StreamHandler()
-                    ])
+log_listener = setup_logging(os.getenv("LOG_FILE", "bot.log"))
 logger = logging.getLogger(__name__)
 
-intents = discord.Intents.all()
+BOT_PROFILE = os.getenv("BOT_PROFILE", "full").lower()
+# discord.py's own cache of full Message objects. Edit/delete logging uses bot.recent instead,
+# so this only needs to cover recent interaction and view messages.
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", 100))
+
+def gateway_options(profile: str) -> dict:
+    """Returns the intents and member cache settings for a runtime profile.
 
-bot = CustomBot(command_prefix="!", intents=intents, help_command=None)
+    ``full`` keeps every intent and caches all members. ``lean`` drops the
+    member, presence, typing and message content intents, caches no members
+    and skips chunking; commands fetch members on demand instead. Both keep
+    only MESSAGE_CACHE_SIZE full messages cached.
+    """
+    if profile == "lean":
+        intents = discord.Intents.default()
+        intents.typing = False
+        return {
+            "intents": intents,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+            "max_messages": MESSAGE_CACHE_SIZE or None,
+        }
+    intents = discord.Intents.all()
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        "chunk_guilds_at_startup": True,
+        "max_messages": MESSAGE_CACHE_SIZE or None,
+    }
+
+async def guild_prefix(bot: CustomBot, message: discord.Message) -> str:
+    """Returns the guild's configured text command prefix; the default in DMs."""
+    if message.guild is None or bot.settings is None:
+        return GuildSettings.DEFAULTS["prefix"]
+    return (await bot.settings.get(message.guild.id)).prefix
+
+bot = CustomBot(command_prefix=guild_prefix, help_command=None, **gateway_options(BOT_PROFILE), **shard_options())
 
 statuses = [
     discord.Game("with the code"),
@@ -44,28 +305,19 @@ statuses = [
     discord.Game("Version 1.0.0 is out now!")
 ]
 
-async def load_cogs():
-    cogs = ["cogs.whisper", "cogs.owner", "cogs.info", "cogs.help"]
-    for cog in cogs:
-        try:
-            await bot.load_extension(cog)
-            logger.info(f"{cog} loaded successfully.")
-        except Exception as e:
-            logger.error(f"Failed to load {cog}: {e}")
-
 @bot.event
 async def on_ready():
-    await load_cogs()
+    # on_ready fires again after every full reconnect; startup work only runs once.
+    if bot.started_up:
+        logger.info("Gateway reconnected, cache rebuilt.")
+        return
+    bot.started_up = True
     logger.info(
         f"Bot is online as {bot.user} (ID: {bot.user.id if bot.user else 'Unknown'})"
     )
+    logger.info(f"Cold start took {time.perf_counter() - PROCESS_START:.2f}s.")
     if not change_activity.is_running():
         change_activity.start()
-    try:
-        synced = await bot.tree.sync()
-        logger.info(f"Synced {len(synced)} commands.")
-    except Exception as e:
-        logger.error(f"Error syncing commands: {e}")
 
 @tasks.loop(seconds=280)
 async def change_activity():
@@ -73,6 +325,15 @@ async def change_activity():
     await bot.change_presence(activity=activity)
     logger.info(f"Changed bot activity to: {activity.name}")
 
+# Cogs reach the loop through the bot so a reload never creates a second copy.
+bot.change_activity = change_activity
+
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    latency = bot.metrics.command_completed(interaction, command)
+    latency_ms = round(latency * 1000, 1) if latency is not None else None
+    logger.info(f"/{command.qualified_name} completed", extra=interaction_context(interaction, latency_ms=latency_ms))
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -83,7 +344,7 @@ async def on_command_error(ctx, error):
 async def main():
     if DISCORD_TOKEN:
         try:
-            logger.info("Starting bot...")
+            logger.info(f"Starting bot with the {BOT_PROFILE} profile...")
             await bot.start(DISCORD_TOKEN)
         except Exception as e:
             logger.critical(f"Error running bot: {e}")
@@ -91,6 +352,12 @@ async def main():
         logger.critical(
             "No token found. Set DISCORD_TOKEN in your environment variables."
         )
+    if bot.restart_requested:
+        logger.info("Restarting process...")
+    log_listener.stop()
+    if bot.restart_requested:
+        python = sys.executable
+        os.execl(python, python, *sys.argv)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,130 @@
+# cluster.py - runs onWhisper as several worker processes, each owning a range of shards.
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+
+import aiohttp
+
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s [%(levelname)s] [launcher] %(message)s")
+logger = logging.getLogger("cluster")
+
+DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
+IPC_PATH = os.getenv("CLUSTER_IPC", "/tmp/onwhisper-cluster.sock")
+WEB_PORT = int(os.getenv("WEB_PORT", 8080))  # Cluster N serves on WEB_PORT + N.
+STALE_AFTER = 60  # Seconds without a report before a worker's stats are dropped.
+
+
+async def recommended_shards(token: str) -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get("https://discord.com/api/v10/gateway/bot",
+                               headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+
+def split_shards(shard_count: int, clusters: int) -> list[list[int]]:
+    """Splits shard ids into contiguous, evenly sized ranges."""
+    per_cluster, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        size = per_cluster + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return [r for r in ranges if r]
+
+
+class Launcher:
+    def __init__(self, shard_count: int, clusters: int, command: list[str]):
+        self.shard_count = shard_count
+        self.ranges = split_shards(shard_count, clusters)
+        self.command = command
+        self.stats: dict[str, dict] = {}
+        self.processes: dict[int, asyncio.subprocess.Process] = {}
+        self.stopping = False
+
+    async def handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Stores each report a worker sends and answers with the cluster-wide view."""
+        try:
+            while line := await reader.readline():
+                report = json.loads(line)
+                self.stats[str(report["cluster"])] = report
+                now = time.time()
+                for cluster_id in [c for c, s in self.stats.items() if now - s["reported"] > STALE_AFTER]:
+                    del self.stats[cluster_id]
+                writer.write(json.dumps({"clusters": self.stats}).encode() + b"\n")
+                await writer.drain()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Dropped a worker connection: {e}")
+        finally:
+            writer.close()
+
+    async def supervise(self, cluster_id: int, shard_ids: list[int]):
+        """Runs one worker and restarts it with backoff whenever it dies."""
+        # Each worker gets its own log file and web port; 0 keeps letting the OS pick one.
+        env = dict(os.environ,
+                   CLUSTER_ID=str(cluster_id),
+                   CLUSTER_IPC=IPC_PATH,
+                   SHARD_COUNT=str(self.shard_count),
+                   SHARD_IDS=",".join(map(str, shard_ids)),
+                   LOG_FILE=f"bot.cluster{cluster_id}.log",
+                   WEB_PORT=str(WEB_PORT + cluster_id if WEB_PORT else 0))
+        backoff = 5
+        while not self.stopping:
+            started = time.monotonic()
+            logger.info(f"Starting cluster {cluster_id} with shards {shard_ids[0]}-{shard_ids[-1]}.")
+            process = await asyncio.create_subprocess_exec(*self.command, env=env)
+            self.processes[cluster_id] = process
+            code = await process.wait()
+            self.stats.pop(str(cluster_id), None)
+            if self.stopping:
+                break
+            if time.monotonic() - started > 60:
+                backoff = 5  # It ran for a while; treat this as a fresh failure.
+            logger.error(f"Cluster {cluster_id} exited with code {code}, restarting in {backoff}s.")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 300)
+
+    def stop(self):
+        self.stopping = True
+        for process in self.processes.values():
+            if process.returncode is None:
+                process.terminate()
+
+    async def run(self):
+        if os.path.exists(IPC_PATH):
+            os.unlink(IPC_PATH)
+        server = await asyncio.start_unix_server(self.handle_worker, IPC_PATH)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+        logger.info(f"Launching {len(self.ranges)} clusters for {self.shard_count} shards.")
+        async with server:
+            await asyncio.gather(*(self.supervise(i, ids) for i, ids in enumerate(self.ranges)))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run onWhisper as a multi-process shard cluster.")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--shards", type=int, help="total shard count (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    shard_count = args.shards
+    if shard_count is None:
+        if not DISCORD_TOKEN:
+            logger.critical("No token found. Set DISCORD_TOKEN in your environment variables.")
+            return
+        shard_count = await recommended_shards(DISCORD_TOKEN)
+
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")]
+    await Launcher(shard_count, max(1, min(args.clusters, shard_count)), command).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,13 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import random
 import asyncio
-import aiohttp
+import random
 import logging
+from utils.cache import TTLCache
+from utils.dice import DiceExpression, PERCENTILES, describe_roll
+from utils.jokes import JokePool
+from utils.ratelimit import rate_limit
 
 
 # Set up logging for the Fun Cog
@@ -13,19 +16,45 @@ logger = logging.getLogger(__name__)
 class Fun(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.jokes = JokePool(bot.session)
+        self.dice_stats = TTLCache(maxsize=256, ttl=3600)  # Distributions by normalized expression
+
+    async def cog_load(self):
+        self.jokes.start()
 
-    @app_commands.command(name="roll", description="Rolls a dice in NdN format.")
-    async def roll(self, interaction: discord.Interaction, dice: str):
+    async def cog_unload(self):
+        self.jokes.stop()
+
+    @app_commands.command(name="roll", description="Rolls dice, e.g. 2d6, 4d6kh3 + 2 or 1d20! - 1.")
+    @app_commands.describe(dice="Dice expression: NdM, + / - terms, kh/kl/dh/dl keep or drop, ! explode, r reroll",
+                           stats="Show the distribution of the total instead of rolling")
+    async def roll(self, interaction: discord.Interaction, dice: str, stats: bool = False):
         try:
-            rolls, limit = map(int, dice.lower().split('d'))
-            if rolls <= 0 or limit <= 0:
-                raise ValueError  # Prevent negative or zero values
-        except ValueError:
-            await interaction.response.send_message("❌ Format must be `NdN` (e.g., `2d6`).", ephemeral=True)
+            expression = DiceExpression.parse(dice)
+            if stats:
+                result = self.dice_stats.get(str(expression))
+                if result is None:
+                    # Exact and approximate stats are instant; simulated ones (keep/drop) can take tens of ms, so keep them off the loop.
+                    result = await asyncio.to_thread(expression.stats)
+                    self.dice_stats.set(str(expression), result)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+
+        if stats:
+            percentiles = " · ".join(f"p{p} **{result.percentiles[p]:,.0f}**" for p in PERCENTILES)
+            embed = discord.Embed(title="📊 Dice Stats", description=f"`{expression}`", color=discord.Color.blue())
+            embed.add_field(name="Mean", value=f"{result.mean:,.2f}")
+            embed.add_field(name="Std Dev", value=f"{result.std:,.2f}")
+            embed.add_field(name="Range", value=f"{result.low:,} to {result.high:,}")
+            embed.add_field(name="Percentiles", value=percentiles, inline=False)
+            embed.set_footer(text=result.method.capitalize())
+            await interaction.response.send_message(embed=embed)
             return
 
-        results = ', '.join(str(random.randint(1, limit)) for _ in range(rolls))
-        embed = discord.Embed(title="🎲 Dice Roll", description=f"{interaction.user.mention}, you rolled: **{results}**", color=discord.Color.blue())
+        total, rolls = expression.roll()
+        embed = discord.Embed(title="🎲 Dice Roll", description=f"{interaction.user.mention}, you rolled: **{total:,}**\n{describe_roll(rolls, expression.constant)}",
+                              color=discord.Color.blue())
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="choose", description="Chooses between multiple choices.")
@@ -66,23 +95,20 @@ class Fun(commands.Cog):
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="joke", description="Tell a random joke.")
+    @rate_limit(3, 15)
+    @rate_limit(30, 60, scope="guild")
     async def joke(self, interaction: discord.Interaction):
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://official-joke-api.appspot.com/random_joke") as response:
-                    if response.status == 200:
-                        joke_data = await response.json()
-                        joke = f"{joke_data['setup']} - {joke_data['punchline']}"
-                    else:
-                        joke = f"❌ Failed to fetch a joke. API error {response.status}."
-        except Exception as e:
-            logger.error(f"❌ Error fetching joke: {e}")
-            joke = f"❌ Error fetching joke: {e}"
+        joke = self.jokes.get()
+        if joke is None:
+            await interaction.response.send_message("❌ No jokes are available right now. Try again in a moment.", ephemeral=True)
+            return
 
         embed = discord.Embed(title="😂 Joke", description=f"{interaction.user.mention}, here's a joke for you: {joke}", color=discord.Color.blue())
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="countdown", description="Start a countdown timer.")
+    @rate_limit(2, 60)
+    @rate_limit(5, 60, scope="channel")
     async def countdown(self, interaction: discord.Interaction, seconds: int):
         if seconds < 1 or seconds > 3600:
             await interaction.response.send_message("❌ Please enter a time between 1 and 3600 seconds.", ephemeral=True)
@@ -90,14 +116,8 @@ class Fun(commands.Cog):
 
         await interaction.response.defer()
         message = await interaction.followup.send(f"⏳ {interaction.user.mention}, countdown started for {seconds} seconds...")
-
-        while seconds > 0:
-            await asyncio.sleep(1)
-            seconds -= 1
-            if seconds % 10 == 0 or seconds <= 5:  # Update every 10 seconds, and last 5 seconds
-                await message.edit(content=f"⏳ {interaction.user.mention}, {seconds} seconds remaining...")
-
-        await message.edit(content=f"🎉 {interaction.user.mention}, countdown has ended!")
+        # The shared ticker drives the remaining edits for every countdown.
+        self.bot.ticker.add(message.channel.id, message.id, interaction.user.mention, seconds)
 
     
 async def setup(bot: commands.Bot):
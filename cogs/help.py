@@ -1,57 +1,45 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import logging
+from utils.render import help_pages
+
+logger = logging.getLogger(__name__)
+
+class HelpView(discord.ui.View):
+    """Category picker for the prebuilt help pages; it only swaps in an embed that already exists."""
+    def __init__(self, pages: list[tuple[str, discord.Embed]]):
+        super().__init__(timeout=180)
+        self.pages = pages
+        self.category.options = [discord.SelectOption(label=label, value=str(index))
+                                 for index, (label, _) in enumerate(pages[:25])]
+
+    @discord.ui.select(placeholder="Choose a category...")
+    async def category(self, interaction: discord.Interaction, select: discord.ui.Select):
+        await interaction.response.edit_message(embed=self.pages[int(select.values[0])][1])
 
 class Help(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.pages: list[tuple[str, discord.Embed]] = []
+
+    async def cog_load(self):
+        self.rebuild()
+
+    def rebuild(self):
+        self.pages = help_pages(self.bot.tree)
+        logger.info(f"Built {len(self.pages)} help pages.")
+
+    @commands.Cog.listener()
+    async def on_extensions_changed(self):
+        """Extensions were loaded or reloaded, so the command list may have changed."""
+        self.rebuild()
 
     @app_commands.command(name="help", description="Displays help for available commands.")
     async def help(self, interaction: discord.Interaction):
         """Slash command help menu for onWhisper."""
-        embed = discord.Embed(
-            title="🗯 onWhisper Command Guide 🗯",
-            description="Here is a list of available commands organized by category.",
-            color=discord.Color.gold()
-        )
-
-        # Whisper Commands
-        embed.add_field(
-            name="🤖 Whisper Commands",
-            value=(
-                "• **/whisper** - Send a whispered message.\n"
-                "• **/admin_whisper** - Whisper command for moderators/admins.\n"
-            ),
-            inline=False
-        )
-
-        # Info Commands
-        embed.add_field(
-            name="ℹ️ Info Commands",
-            value=(
-                "• **/help** - Displays this help menu.\n"
-                "• **/info** - Shows information about the bot.\n"
-                "• **/ping** - Displays the bot's latency.\n"
-                "• **/uptime** - Shows how long the bot has been online.\n"
-                "• **/server_info** - Displays server details.\n"
-                "• **/user_info** - Provides info about a user."
-            ),
-            inline=False
-        )
-
-        # Voting Commands
-        embed.add_field(
-            name="🗳 Voting",
-            value=(
-                "• **/vote_reward** - Claim your reward for voting on Top.gg.\n"
-                "  *Vote for the bot here:* [Top.gg Link](https://top.gg)"
-            ),
-            inline=False
-        )
-
-        embed.set_footer(text="Use these commands to enhance your onWhisper experience!")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        view = HelpView(self.pages) if len(self.pages) > 1 else discord.utils.MISSING
+        await interaction.response.send_message(embed=self.pages[0][1], view=view, ephemeral=True)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Help(bot))
-
@@ -1,38 +1,117 @@
 # cogs/info.py 🎉 V1.0.0
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import time
 import logging
+from utils.cache import TTLCache
+from utils.cluster import cluster_totals, format_latency
+from utils.metrics import percentile
+from utils.ratelimit import rate_limit
+
+RECONCILE_MINUTES = 30  # How often guild stats are rescanned to correct drift
+TOP_ROLES = 5
 
-# Initialize logger with timestamp formatting
 logger = logging.getLogger(__name__)
-logging.basicConfig(format="%(asctime)s - %(message)s", level=logging.INFO)
 
 class Info(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.bot.start_time = time.time()  # Store bot start time
+        self.members = TTLCache(maxsize=1000, ttl=300)  # Members fetched on demand (lean profile)
+        self._botinfo: discord.Embed = None
         logger.info("Info cog initialized.")
 
+    async def cog_load(self):
+        self.reconcile_stats.start()
+
+    async def cog_unload(self):
+        self.reconcile_stats.cancel()
+
+    @tasks.loop(minutes=RECONCILE_MINUTES)
+    async def reconcile_stats(self):
+        await self.bot.stats.reconcile()
+
+    @reconcile_stats.before_loop
+    async def before_reconcile_stats(self):
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.bot.stats.member_join(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.bot.stats.member_remove(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before._roles != after._roles:
+            self.bot.stats.member_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        self.bot.stats.presence_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.bot.stats.role_delete(role)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self.bot.stats.channel_change(channel.guild, None, str(channel.type))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self.bot.stats.channel_change(channel.guild, str(channel.type), None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.type != after.type:
+            self.bot.stats.channel_change(after.guild, str(before.type), str(after.type))
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.bot.stats.forget(guild.id)
+
+    async def get_member(self, guild: discord.Guild, user_id: int) -> discord.Member | None:
+        """Returns a cached member, fetching it over REST when the member cache is off."""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        key = (guild.id, user_id)
+        member = self.members.get(key)
+        if member is None:
+            try:
+                member = await guild.fetch_member(user_id)
+            except discord.NotFound:
+                return None
+            self.members.set(key, member)
+        return member
+
     @app_commands.command(name="ping", description="Check the bot's latency.")
-    @commands.cooldown(1, 5, commands.BucketType.user)  # Prevent spamming
+    @rate_limit(1, 5)
     async def ping(self, interaction: discord.Interaction):
         try:
-            start_time = time.time()
-            await interaction.response.send_message("Pinging...")
-            end_time = time.time()
-            latency = round((end_time - start_time) * 1000, 2)
+            metrics = self.bot.metrics
+            heartbeat = [latency * 1000 for latency in metrics.recent_heartbeat]
+            handlers = [latency * 1000 for latency in metrics.recent_latency]
 
-            embed = discord.Embed(title="Pong!", description=f"Latency: {latency}ms", color=discord.Color.green())
-            await interaction.followup.send(embed=embed)
+            embed = discord.Embed(title="Pong!", description=f"Gateway latency: {round(self.bot.latency * 1000, 2)}ms", color=discord.Color.green())
+            if heartbeat:
+                embed.add_field(name="Heartbeat", value=f"p50 {percentile(heartbeat, 0.5):.0f}ms · p99 {percentile(heartbeat, 0.99):.0f}ms", inline=False)
+            if handlers:
+                embed.add_field(name=f"Command Handlers (last {len(handlers)})",
+                                value=f"p50 {percentile(handlers, 0.5):.1f}ms · p90 {percentile(handlers, 0.9):.1f}ms · p99 {percentile(handlers, 0.99):.1f}ms",
+                                inline=False)
+            await interaction.response.send_message(embed=embed)
             logger.info(f"Ping command used by {interaction.user}")
         except Exception as e:
             logger.error(f"Error in ping command: {e}")
             await interaction.response.send_message("An error occurred while processing your request.")
 
     @app_commands.command(name="uptime", description="Check the bot's uptime.")
-    @commands.cooldown(1, 10, commands.BucketType.user)  # Prevent spamming
+    @rate_limit(1, 10)
     async def uptime(self, interaction: discord.Interaction):
         try:
             uptime_seconds = round(time.time() - self.bot.start_time, 2)
@@ -46,6 +125,9 @@ class Info(commands.Cog):
             embed = discord.Embed(title="Bot Uptime", 
                                   description=f"Bot has been running for {uptime_str}.", 
                                   color=discord.Color.blue())
+            totals = cluster_totals(self.bot)
+            if totals["clusters"] > 1:
+                embed.add_field(name="Clusters Online", value=totals["clusters"], inline=False)
             await interaction.response.send_message(embed=embed)
             logger.info(f"Uptime command used by {interaction.user}")
         except Exception as e:
@@ -60,6 +142,7 @@ class Info(commands.Cog):
                 await interaction.response.send_message("This command can only be used in a server.")
                 return
 
+            owner = await self.get_member(guild, guild.owner_id) if guild.owner_id else None
             embed = discord.Embed(
                 title=f"Server Information - {guild.name}",
                 color=discord.Color.blue()
@@ -67,21 +150,49 @@ class Info(commands.Cog):
             if guild.icon:
                 embed.set_thumbnail(url=guild.icon.url)
             embed.add_field(name="Server ID", value=guild.id, inline=False)
-            embed.add_field(name="Owner", value=guild.owner.mention if guild.owner else "Unknown", inline=False)
+            embed.add_field(name="Owner", value=owner.mention if owner else "Unknown", inline=False)
             embed.add_field(name="Created At", value=guild.created_at.strftime("%Y-%m-%d %H:%M:%S") if guild.created_at else "Unknown", inline=False)
             embed.add_field(name="Members", value=guild.member_count, inline=False)
             embed.add_field(name="Roles", value=len(guild.roles), inline=False)
             embed.add_field(name="Channels", value=len(guild.channels), inline=False)
+            self.add_stats_fields(embed, guild)
+            shard = self.bot.get_shard(guild.shard_id)
+            embed.add_field(name="Shard", value=f"{guild.shard_id} ({format_latency(shard.latency if shard else None)})", inline=False)
             await interaction.response.send_message(embed=embed)
             logger.info(f"Server info command used by {interaction.user}")
         except Exception as e:
             logger.error(f"Error in serverinfo command: {e}")
             await interaction.response.send_message("An error occurred while processing your request.")
 
+    def add_stats_fields(self, embed: discord.Embed, guild: discord.Guild):
+        """Adds the breakdowns from the incrementally kept guild stats; nothing here scans the member list."""
+        stats = self.bot.stats.get(guild)
+        if stats is None:
+            return  # Members aren't loaded yet, or the lean profile doesn't track them.
+        members = f"👤 {stats.humans} humans · 🤖 {stats.bots} bots"
+        if self.bot.stats.tracks_presence:
+            members += f"\n🟢 {stats.online} online · ⚫ {stats.members - stats.online} offline"
+        embed.add_field(name="Member Breakdown", value=members, inline=False)
+
+        joins_day, leaves_day = stats.window(86400)
+        joins_week, leaves_week = stats.window(7 * 86400)
+        embed.add_field(name="Joins / Leaves",
+                        value=f"24h: +{joins_day} / -{leaves_day}\n7d: +{joins_week} / -{leaves_week}\n"
+                              f"-# Leaves counted since <t:{int(stats.since)}:R>", inline=False)
+
+        channels = " · ".join(f"{count} {kind}" for kind, count in stats.channels.most_common() if count > 0)
+        if channels:
+            embed.add_field(name="Channel Types", value=channels[:1024], inline=False)
+        top = [(role_id, count) for role_id, count in stats.roles.most_common(TOP_ROLES) if count > 0]
+        if top:
+            embed.add_field(name="Largest Roles", value="\n".join(f"<@&{role_id}>: {count}" for role_id, count in top), inline=False)
+
     @app_commands.command(name="userinfo", description="Get information about a user.")
     async def userinfo(self, interaction: discord.Interaction, user: discord.Member = None):
         try:
             user = user or interaction.user
+            if interaction.guild and not isinstance(user, discord.Member):
+                user = await self.get_member(interaction.guild, user.id)
             if user is None:
                 await interaction.response.send_message("Could not find the user.")
                 return
@@ -102,22 +213,29 @@ class Info(commands.Cog):
             logger.error(f"Error in userinfo command: {e}")
             await interaction.response.send_message("An error occurred while processing your request.")
 
-    @app_commands.command(name="botinfo", description="Get information about the bot.")
-    async def botinfo(self, interaction: discord.Interaction):
-        try:
-            # Read the version dynamically from a file
-            with open("version.txt", "r") as version_file:
-                bot_version = version_file.read().strip()
-
+    def botinfo_embed(self) -> discord.Embed:
+        """Returns the static part of /botinfo, built once on first use."""
+        if self._botinfo is None:
             embed = discord.Embed(
                 title="Bot Information",
                 color=discord.Color.gold()
             )
             embed.add_field(name="onWhisper", value=self.bot.user.name, inline=False)
-            embed.add_field(name="Bot Version", value=bot_version, inline=False)
+            embed.add_field(name="Bot Version", value=self.bot.version, inline=False)
             embed.add_field(name="Bot Owner", value="@og.kpnworld", inline=False)
             embed.add_field(name="Suport Server", value="https://discord.gg/64bGK2SQpX", inline=False)
             embed.add_field(name="Bot Language", value="Python / discord.py", inline=False)
+            self._botinfo = embed
+        return self._botinfo
+
+    @app_commands.command(name="botinfo", description="Get information about the bot.")
+    async def botinfo(self, interaction: discord.Interaction):
+        try:
+            embed = self.botinfo_embed().copy()
+            totals = cluster_totals(self.bot)
+            shards = ", ".join(f"{sid}: {format_latency(latency)}" for sid, latency in totals["shards"].items())
+            embed.insert_field_at(2, name="Servers", value=totals["guilds"], inline=False)
+            embed.insert_field_at(3, name=f"Shards ({len(totals['shards'])})", value=shards[:1024] or "n/a", inline=False)
             await interaction.response.send_message(embed=embed)
             logger.info(f"Bot info command used by {interaction.user}")
         except Exception as e:
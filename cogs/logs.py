@@ -0,0 +1,392 @@
+# cogs/logs.py
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_destinations (
+    guild_id INTEGER PRIMARY KEY,
+    channel_id INTEGER,
+    webhook_url TEXT
+);
+CREATE TABLE IF NOT EXISTS log_message_capacity (
+    guild_id INTEGER PRIMARY KEY,
+    capacity INTEGER NOT NULL
+);
+"""
+
+FLUSH_INTERVAL = 2.0  # Seconds between flushes.
+MESSAGES_PER_FLUSH = 2  # Per guild; Discord allows about 5 messages per 5 seconds in a channel.
+EMBEDS_PER_MESSAGE = 10  # Discord's caps for one message.
+EMBED_CHARS_PER_MESSAGE = 6000
+MAX_PENDING = 200  # Entries buffered per guild before the oldest are dropped.
+MAX_LINES = 15  # Lines shown in one coalesced entry.
+SHUTDOWN_FLUSH_TIMEOUT = 10.0
+MAX_MESSAGE_CAPACITY = 1000  # Messages remembered per channel for edit/delete logs, at most
+LOGGED_CONTENT = 300  # Characters of an edited or deleted message shown in the log
+WEBHOOK_PATTERN = re.compile(r"^https://(?:(?:canary|ptb)\.)?discord(?:app)?\.com/api/(?:v\d+/)?webhooks/\d+/[\w-]+$")
+
+
+class LogEntry:
+    """One embed-to-be; events that share a key while it is pending add lines to it."""
+    __slots__ = ("title", "color", "lines", "count", "timestamp")
+
+    def __init__(self, title: str, color: discord.Color):
+        self.title = title
+        self.color = color
+        self.lines: list[str] = []
+        self.count = 0
+        self.timestamp = discord.utils.utcnow()
+
+    def add(self, line: str):
+        self.count += 1
+        if len(self.lines) < MAX_LINES:
+            self.lines.append(line)
+
+    def render(self) -> discord.Embed:
+        title = self.title if self.count == 1 else f"{self.title} ({self.count})"
+        embed = discord.Embed(title=title, description="\n".join(self.lines)[:4000], color=self.color, timestamp=self.timestamp)
+        if self.count > len(self.lines):
+            embed.set_footer(text=f"…and {self.count - len(self.lines)} more")
+        return embed
+
+
+class GuildLog:
+    """A guild's pending log entries, oldest first and bounded by MAX_PENDING."""
+    __slots__ = ("entries", "dropped", "flushing")
+
+    def __init__(self):
+        self.entries: OrderedDict[object, LogEntry] = OrderedDict()
+        self.dropped = 0
+        self.flushing = False
+
+    def add(self, key, title: str, line: str, color: discord.Color):
+        entry = self.entries.get(key) if key is not None else None
+        if entry is None:
+            if len(self.entries) >= MAX_PENDING:
+                self.entries.popitem(last=False)
+                self.dropped += 1
+            entry = LogEntry(title, color)
+            self.entries[key if key is not None else object()] = entry
+        entry.add(line)
+
+    def take(self, messages: int = None) -> list[list[discord.Embed]]:
+        """Removes pending entries and packs them into at most ``messages`` messages of embeds."""
+        batches, batch, size = [], [], 0
+        if self.dropped:
+            notice = discord.Embed(title="⚠️ Log entries dropped",
+                                   description=f"{self.dropped} entries were dropped while the log destination was rate limited or unreachable.",
+                                   color=discord.Color.orange())
+            batch, size = [notice], len(notice)
+            self.dropped = 0
+        while self.entries:
+            embed = next(iter(self.entries.values())).render()
+            if len(batch) == EMBEDS_PER_MESSAGE or size + len(embed) > EMBED_CHARS_PER_MESSAGE:
+                batches.append(batch)
+                batch, size = [], 0
+                if messages is not None and len(batches) == messages:
+                    return batches
+            self.entries.popitem(last=False)
+            batch.append(embed)
+            size += len(embed)
+        if batch:
+            batches.append(batch)
+        return batches
+
+
+class LogDestinations:
+    """Where each guild's audit log goes (a channel ID or a webhook URL) and how many messages
+    per channel it remembers for edit/delete logs, cached from SQLite."""
+    def __init__(self, db):
+        self.db = db
+        self._destinations: dict[int, tuple[int | None, str | None]] = {}
+        self.capacities: dict[int, int] = {}
+
+    async def start(self):
+        await self.db.executescript(LOG_SCHEMA)
+        rows = await self.db.fetchall("SELECT guild_id, channel_id, webhook_url FROM log_destinations")
+        self._destinations = {guild_id: (channel_id, webhook_url) for guild_id, channel_id, webhook_url in rows}
+        self.capacities = dict(await self.db.fetchall("SELECT guild_id, capacity FROM log_message_capacity"))
+
+    async def set_capacity(self, guild_id: int, capacity: int):
+        await self.db.execute("INSERT OR REPLACE INTO log_message_capacity (guild_id, capacity) VALUES (?, ?)", (guild_id, capacity))
+        self.capacities[guild_id] = capacity
+
+    def get(self, guild_id: int) -> tuple[int | None, str | None] | None:
+        return self._destinations.get(guild_id)
+
+    async def set(self, guild_id: int, channel_id: int = None, webhook_url: str = None):
+        await self.db.execute("INSERT OR REPLACE INTO log_destinations (guild_id, channel_id, webhook_url) VALUES (?, ?, ?)",
+                              (guild_id, channel_id, webhook_url))
+        self._destinations[guild_id] = (channel_id, webhook_url)
+
+    async def clear(self, guild_id: int) -> bool:
+        removed = await self.db.execute("DELETE FROM log_destinations WHERE guild_id = ?", (guild_id,))
+        self._destinations.pop(guild_id, None)
+        return bool(removed)
+
+
+class Logs(commands.Cog):
+    """Posts moderation actions, whispers and member events to each guild's log channel or webhook.
+
+    Events are buffered per guild and flushed every FLUSH_INTERVAL seconds as
+    messages of up to 10 embeds; repeated events of the same kind (whispers in
+    one channel, joins, leaves) are coalesced into one embed. A guild whose
+    previous flush is still waiting on Discord's rate limit is skipped, and
+    its buffer drops the oldest entries once it is full.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.destinations = LogDestinations(bot.db)
+        self.buffers: dict[int, GuildLog] = {}
+        self._webhooks: dict[str, discord.Webhook] = {}
+        self._flushing: set[asyncio.Task] = set()
+
+    async def cog_load(self):
+        await self.destinations.start()
+        for guild_id, capacity in self.destinations.capacities.items():
+            self.bot.recent.set_capacity(guild_id, capacity)
+        self.flush_logs.start()
+
+    async def cog_unload(self):
+        self.flush_logs.cancel()
+        try:
+            await asyncio.wait_for(self._drain(), timeout=SHUTDOWN_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            pending = sum(len(log.entries) for log in self.buffers.values())
+            logger.warning(f"[Logs] Gave up flushing {pending} log entries on unload.")
+
+    async def _drain(self):
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+        await asyncio.gather(*(self._flush(guild_id, log, None) for guild_id, log in list(self.buffers.items())))
+
+    def record(self, guild_id: int, key, title: str, line: str, color: discord.Color = discord.Color.blurple()):
+        """Buffers one event for a guild that has a log destination; ``key`` coalesces repeats."""
+        if guild_id is None or self.destinations.get(guild_id) is None:
+            return
+        log = self.buffers.get(guild_id)
+        if log is None:
+            log = self.buffers[guild_id] = GuildLog()
+        log.add(key, title, line, color)
+
+    @tasks.loop(seconds=FLUSH_INTERVAL)
+    async def flush_logs(self):
+        for guild_id, log in list(self.buffers.items()):
+            if log.flushing:
+                continue  # Still waiting on Discord; let the buffer absorb new events.
+            if not log.entries and not log.dropped:
+                del self.buffers[guild_id]
+                continue
+            task = asyncio.create_task(self._flush(guild_id, log, MESSAGES_PER_FLUSH))
+            self._flushing.add(task)
+            task.add_done_callback(self._flushing.discard)
+
+    @flush_logs.before_loop
+    async def before_flush_logs(self):
+        await self.bot.wait_until_ready()
+
+    async def _flush(self, guild_id: int, log: GuildLog, messages: int | None):
+        log.flushing = True
+        try:
+            for embeds in log.take(messages):
+                if not await self._send(guild_id, embeds):
+                    log.dropped += len(embeds)
+        finally:
+            log.flushing = False
+
+    async def _send(self, guild_id: int, embeds: list[discord.Embed]) -> bool:
+        destination = self.destinations.get(guild_id)
+        if destination is None:
+            return True  # Logging was turned off; nothing to deliver.
+        channel_id, webhook_url = destination
+        try:
+            if webhook_url:
+                webhook = self._webhooks.get(webhook_url)
+                if webhook is None:
+                    webhook = self._webhooks[webhook_url] = discord.Webhook.from_url(webhook_url, client=self.bot)
+                await webhook.send(embeds=embeds, username=f"{self.bot.user.name} Logs",
+                                   avatar_url=self.bot.user.display_avatar.url)
+            else:
+                await self.bot.get_partial_messageable(channel_id, guild_id=guild_id).send(embeds=embeds)
+            return True
+        except discord.NotFound:
+            logger.warning(f"[Logs] Log destination of guild {guild_id} no longer exists; turning logging off.")
+            await self.destinations.clear(guild_id)
+            self._webhooks.pop(webhook_url, None)
+        except discord.HTTPException as e:
+            logger.error(f"[Logs] Could not post {len(embeds)} log entries for guild {guild_id}: {e}")
+        return False
+
+    # Events
+
+    @commands.Cog.listener()
+    async def on_moderation_action(self, guild: discord.Guild, moderator, action: str, targets: list, reason: str = None, details: str = None):
+        if len(targets) > 1:
+            subject = " ".join(f"<@{target.id}>" for target in targets[:30]) + (f" and {len(targets) - 30} more" if len(targets) > 30 else "")
+        else:
+            subject = f"<@{targets[0].id}>" if targets else "—"
+        line = f"**Target:** {subject}\n**By:** {moderator.mention if moderator else 'automatic'}"
+        if reason:
+            line += f"\n**Reason:** {reason[:500]}"
+        if details:
+            line += f"\n{details}"
+        self.record(guild.id, None, f"🛡️ {action}", line, discord.Color.red())
+
+    @commands.Cog.listener()
+    async def on_whisper_sent(self, message: discord.Message, author: discord.abc.User, delete_after: int):
+        # The content stays out of the log; whispers are meant to stay secret.
+        self.record(message.guild.id, ("whisper", message.channel.id), f"💬 Whispers in #{message.channel.name}",
+                    f"{author.mention} · [message]({message.jump_url}) · expires <t:{int(message.created_at.timestamp()) + delete_after}:R>")
+
+    @commands.Cog.listener()
+    async def on_whisper_broadcast(self, messages: list[discord.Message], author: discord.abc.User, delete_after: int):
+        # One line per broadcast rather than one per channel it reached.
+        first = messages[0]
+        self.record(first.guild.id, ("broadcast", author.id), "📣 Whisper broadcasts",
+                    f"{author.mention} · {len(messages)} channel(s) · expires <t:{int(first.created_at.timestamp()) + delete_after}:R>")
+
+    @commands.Cog.listener()
+    async def on_whisper_expire(self, channel_id: int, message_ids: list[int]):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None or getattr(channel, "guild", None) is None:
+            return
+        self.record(channel.guild.id, ("expire", channel_id), f"🗑️ Whispers expired in #{channel.name}",
+                    f"{len(message_ids)} deleted", discord.Color.dark_grey())
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        # Only remember what a configured guild could log; bots (and so whispers) are never recorded.
+        if message.guild is not None and not message.author.bot and self.destinations.get(message.guild.id) is not None:
+            self.bot.recent.add(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        record = self.bot.recent.pop(payload.message_id)
+        if record is not None:
+            self.record(payload.guild_id, ("deleted", payload.channel_id), f"🗑️ Messages deleted in {self._channel_name(payload.channel_id)}",
+                        self._describe(record), discord.Color.dark_red())
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        records = [record for record in map(self.bot.recent.pop, payload.message_ids) if record is not None]
+        key = ("bulk", payload.channel_id)
+        title = f"🧹 Messages bulk deleted in {self._channel_name(payload.channel_id)}"
+        for record in sorted(records, key=lambda r: r.id):
+            self.record(payload.guild_id, key, title, self._describe(record), discord.Color.dark_red())
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        content = payload.data.get("content")
+        if content is None:
+            return  # Embed or flag update only.
+        record = self.bot.recent.get(payload.message_id)
+        before = self.bot.recent.edit(payload.message_id, content)
+        if before is None:
+            return
+        jump = f"https://discord.com/channels/{payload.guild_id}/{payload.channel_id}/{payload.message_id}"
+        self.record(payload.guild_id, ("edited", payload.channel_id), f"✏️ Messages edited in {self._channel_name(payload.channel_id)}",
+                    f"<@{record.author_id}> · [message]({jump})\n**Before:** {self._excerpt(before)}\n**After:** {self._excerpt(content)}",
+                    discord.Color.gold())
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self.bot.recent.forget_channel(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.bot.recent.forget_guild(guild.id)
+
+    def _channel_name(self, channel_id: int) -> str:
+        channel = self.bot.get_channel(channel_id)
+        return f"#{channel.name}" if channel is not None else f"<#{channel_id}>"
+
+    @staticmethod
+    def _excerpt(content: str) -> str:
+        if not content:
+            return "*(no text)*"
+        text = discord.utils.escape_markdown(content)
+        return text if len(text) <= LOGGED_CONTENT else text[:LOGGED_CONTENT] + "…"
+
+    def _describe(self, record) -> str:
+        line = f"<@{record.author_id}> <t:{int(record.created_at.timestamp())}:R>: {self._excerpt(record.content)}"
+        if record.attachments:
+            line += "\n" + " ".join(f"[attachment {i}]({url})" for i, url in enumerate(record.attachments, start=1))
+        return line
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.record(member.guild.id, ("join",), "📥 Members joined",
+                    f"{member.mention} · account created <t:{int(member.created_at.timestamp())}:R>", discord.Color.green())
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.record(member.guild.id, ("leave",), "📤 Members left", f"{member.mention} ({member})", discord.Color.dark_orange())
+
+    # Commands
+
+    logs = app_commands.Group(name="logs", description="Configure this server's audit log.",
+                              guild_only=True, default_permissions=discord.Permissions(manage_guild=True))
+
+    @logs.command(name="channel", description="Post the audit log in a channel.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def logs_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
+        permissions = channel.permissions_for(interaction.guild.me)
+        if not (permissions.send_messages and permissions.embed_links):
+            await interaction.response.send_message(f"❌ I need Send Messages and Embed Links in {channel.mention}.", ephemeral=True)
+            return
+        await self.destinations.set(interaction.guild.id, channel_id=channel.id)
+        await interaction.response.send_message(f"✅ The audit log now goes to {channel.mention}.", ephemeral=True)
+
+    @logs.command(name="webhook", description="Post the audit log through a webhook URL.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def logs_webhook(self, interaction: discord.Interaction, url: str):
+        url = url.strip()
+        if not WEBHOOK_PATTERN.match(url):
+            await interaction.response.send_message("❌ That isn't a Discord webhook URL.", ephemeral=True)
+            return
+        await self.destinations.set(interaction.guild.id, webhook_url=url)
+        await interaction.response.send_message("✅ The audit log now goes to that webhook.", ephemeral=True)
+
+    @logs.command(name="disable", description="Stop posting the audit log.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def logs_disable(self, interaction: discord.Interaction):
+        removed = await self.destinations.clear(interaction.guild.id)
+        self.buffers.pop(interaction.guild.id, None)
+        self.bot.recent.forget_guild(interaction.guild.id)
+        await interaction.response.send_message("✅ Audit logging is off." if removed else "ℹ️ Audit logging was not on.", ephemeral=True)
+
+    @logs.command(name="messages", description="Set how many recent messages per channel are kept for edit/delete logs.")
+    @app_commands.describe(per_channel="Messages remembered per channel (0 turns edit/delete logging off)")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def logs_messages(self, interaction: discord.Interaction, per_channel: app_commands.Range[int, 0, MAX_MESSAGE_CAPACITY]):
+        await self.destinations.set_capacity(interaction.guild.id, per_channel)
+        self.bot.recent.set_capacity(interaction.guild.id, per_channel)
+        await interaction.response.send_message(
+            f"✅ Keeping the last {per_channel} messages per channel for edit and delete logs." if per_channel
+            else "✅ Edited and deleted messages are no longer logged.", ephemeral=True)
+
+    @logs.command(name="status", description="Show where the audit log goes.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def logs_status(self, interaction: discord.Interaction):
+        destination = self.destinations.get(interaction.guild.id)
+        if destination is None:
+            where = "Off"
+        else:
+            where = f"<#{destination[0]}>" if destination[0] else "Webhook"
+        log = self.buffers.get(interaction.guild.id)
+        embed = discord.Embed(title="📜 Audit Log", color=discord.Color.blurple())
+        embed.add_field(name="Destination", value=where)
+        embed.add_field(name="Pending", value=str(len(log.entries) if log else 0))
+        embed.add_field(name="Messages kept per channel", value=str(self.bot.recent.capacity_for(interaction.guild.id)))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Logs(bot))
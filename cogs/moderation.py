@@ -1,18 +1,312 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from datetime import datetime
+from datetime import timedelta
+from collections import Counter, OrderedDict
+import asyncio
 import logging
+import os
+import time
+from utils.cluster import shard_filter
+from utils.mass import MassAction, MAX_TARGETS, parse_ids, select_members
+from utils.purge import PurgeRun, SCAN_LIMIT
+from utils.roles import RoleIndex
+
+logger = logging.getLogger(__name__)
+
+WARN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS warnings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_warnings_member ON warnings (guild_id, user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_warnings_created_at ON warnings (created_at);
+"""
+
+MUTE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mute_expiry (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    role_id INTEGER NOT NULL,
+    expires_at INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_mute_expiry_expires_at ON mute_expiry (expires_at);
+"""
+
+WARN_EXPIRY_DAYS = int(os.getenv("WARN_EXPIRY_DAYS", 90))
+WARNS_PER_PAGE = 10
+MUTE_ROLE_NAME = "Muted"
+MAX_TIMEOUT_MINUTES = 28 * 24 * 60  # Discord's limit for a native timeout.
+UNMUTE_CONCURRENCY = 5
+
+
+class WarningStore:
+    """Persistent warnings with write-behind batching and an LRU of per-member counts.
+
+    New warnings are queued in memory and written in one transaction per
+    flush, so a burst of warns costs one commit instead of one per warn.
+    Counts are served from the LRU and include warnings not yet flushed.
+    """
+    FLUSH_INTERVAL = 1.0
+    FLUSH_BATCH = 200
+    CACHE_SIZE = 10_000
+
+    def __init__(self, db):
+        self.db = db
+        self._pending: list[tuple[int, int, int, str, int]] = []
+        self._pending_counts: Counter[tuple[int, int]] = Counter()  # Queued warnings per member
+        self._counts: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._lock = asyncio.Lock()  # Keeps cache misses from racing a flush.
+        self._flush_now = asyncio.Event()
+        self._task: asyncio.Task = None
+
+    async def start(self):
+        await self.db.executescript(WARN_SCHEMA)
+        self._task = asyncio.create_task(self._run(), name="warning-flush")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    @staticmethod
+    def cutoff() -> int:
+        return int(time.time()) - WARN_EXPIRY_DAYS * 86400
+
+    async def add(self, guild_id: int, user_id: int, moderator_id: int, reason: str) -> int:
+        """Queues a warning and returns the member's new warning count."""
+        key = (guild_id, user_id)
+        count = await self.count(guild_id, user_id)
+        count = self._counts.get(key, count) + 1
+        self._pending.append((guild_id, user_id, moderator_id, reason, int(time.time())))
+        self._pending_counts[key] += 1
+        self._counts[key] = count
+        if len(self._pending) >= self.FLUSH_BATCH:
+            self._flush_now.set()
+        return count
+
+    async def count(self, guild_id: int, user_id: int) -> int:
+        key = (guild_id, user_id)
+        if key in self._counts:
+            self._counts.move_to_end(key)
+            return self._counts[key]
+
+        async with self._lock:
+            row = await self.db.fetchone(
+                "SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ? AND created_at >= ?",
+                (guild_id, user_id, self.cutoff())
+            )
+            count = row[0] + self._pending_counts[key]
+        self._counts[key] = count
+        if len(self._counts) > self.CACHE_SIZE:
+            self._counts.popitem(last=False)
+        return count
+
+    async def history(self, guild_id: int, user_id: int, page: int = 1):
+        """Returns one page of (moderator_id, reason, created_at) rows, newest first."""
+        await self.flush()
+        return await self.db.fetchall(
+            "SELECT moderator_id, reason, created_at FROM warnings"
+            " WHERE guild_id = ? AND user_id = ? AND created_at >= ?"
+            " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            (guild_id, user_id, self.cutoff(), WARNS_PER_PAGE, (page - 1) * WARNS_PER_PAGE)
+        )
+
+    async def expire(self) -> int:
+        """Deletes this worker's guilds' warnings older than WARN_EXPIRY_DAYS and resets the cached counts."""
+        condition, params = shard_filter()
+        async with self._lock:
+            removed = await self.db.execute(f"DELETE FROM warnings WHERE created_at < ? AND {condition}", (self.cutoff(), *params))
+            self._counts.clear()
+        return removed
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            counts, self._pending_counts = self._pending_counts, Counter()
+            try:
+                await self.db.executemany(
+                    "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                    batch
+                )
+            except Exception:
+                self._pending[:0] = batch  # Keep them for the next attempt.
+                self._pending_counts.update(counts)
+                raise
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"[WarningStore] Failed to write warnings: {e}")
+
+
+class MuteQueue:
+    """Role-based mutes waiting to expire, kept in SQLite so they survive restarts."""
+    def __init__(self, db):
+        self.db = db
+
+    async def start(self):
+        await self.db.executescript(MUTE_SCHEMA)
+
+    async def schedule(self, guild_id: int, user_id: int, role_id: int, seconds: int):
+        await self.db.execute(
+            "INSERT OR REPLACE INTO mute_expiry (guild_id, user_id, role_id, expires_at) VALUES (?, ?, ?, ?)",
+            (guild_id, user_id, role_id, int(time.time()) + seconds)
+        )
+
+    async def cancel(self, guild_id: int, user_id: int):
+        await self.db.execute("DELETE FROM mute_expiry WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+
+    async def due(self, limit: int = 500):
+        """Returns up to ``limit`` expired (guild_id, user_id, role_id) rows in this worker's guilds, grouped by guild."""
+        condition, params = shard_filter()
+        return await self.db.fetchall(
+            f"SELECT guild_id, user_id, role_id FROM mute_expiry WHERE expires_at <= ? AND {condition} ORDER BY guild_id LIMIT ?",
+            (int(time.time()), *params, limit)
+        )
+
+    async def done(self, rows):
+        await self.db.executemany(
+            "DELETE FROM mute_expiry WHERE guild_id = ? AND user_id = ? AND role_id = ?", rows
+        )
+
+
+class PurgeCancelView(discord.ui.View):
+    """Cancel button shown on a running purge's progress message."""
+    def __init__(self, purge: PurgeRun, author_id: int):
+        super().__init__(timeout=None)
+        self.purge = purge
+        self.author_id = author_id
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ Only the moderator who started this purge can cancel it.", ephemeral=True)
+            return
+        self.purge.cancel()
+        button.disabled = True
+        button.label = "Cancelling..."
+        await interaction.response.edit_message(view=self)
+
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.warnings = WarningStore(bot.db)
+        self.mutes = MuteQueue(bot.db)
+        self.roles = RoleIndex()
+
+    async def cog_load(self):
+        await self.warnings.start()
+        await self.mutes.start()
+        self.expire_warnings.start()
+        self.expire_mutes.start()
+
+    async def cog_unload(self):
+        self.expire_warnings.cancel()
+        self.expire_mutes.cancel()
+        await self.warnings.close()
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self.roles.add(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self.roles.update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.roles.remove(role)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.roles.forget(guild.id)
+
+    async def mute_role(self, guild: discord.Guild) -> discord.Role | None:
+        """Returns the guild's configured mute role, falling back to a role named MUTE_ROLE_NAME."""
+        settings = await self.bot.settings.get(guild.id)
+        return self.roles.get(guild, name=MUTE_ROLE_NAME, role_id=settings.mute_role_id)
+
+    def _log_action(self, interaction: discord.Interaction, action: str, targets: list, reason: str = None, details: str = None):
+        """Reports a moderation action to listeners such as the audit log."""
+        self.bot.dispatch("moderation_action", interaction.guild, interaction.user, action, targets, reason, details)
+
+    @tasks.loop(hours=1)
+    async def expire_warnings(self):
+        try:
+            removed = await self.warnings.expire()
+        except Exception as e:
+            logger.error(f"Unexpected error while expiring warnings: {e}")
+            return
+        if removed:
+            logger.info(f"Expired {removed} warnings older than {WARN_EXPIRY_DAYS} days.")
+
+    @tasks.loop(seconds=30)
+    async def expire_mutes(self):
+        """Removes the mute role from every member whose role-based mute has expired."""
+        try:
+            await self._lift_expired_mutes()
+        except Exception as e:
+            # Rows stay queued and are retried next tick; letting this escape would stop the loop for good.
+            logger.error(f"Unexpected error while lifting expired mutes: {e}")
+
+    async def _lift_expired_mutes(self):
+        rows = await self.mutes.due()
+        if not rows:
+            return
+
+        slots = asyncio.Semaphore(UNMUTE_CONCURRENCY)
+        finished = []
+
+        async def unmute(guild_id: int, user_id: int, role_id: int):
+            async with slots:
+                try:
+                    await self.bot.http.remove_role(guild_id, user_id, role_id, reason="Mute expired")
+                except (discord.NotFound, discord.Forbidden) as e:
+                    logger.warning(f"Dropping expired mute of {user_id} in guild {guild_id}: {e}")
+                except discord.HTTPException as e:
+                    logger.error(f"Failed to unmute {user_id} in guild {guild_id}, will retry: {e}")
+                    return
+                finished.append((guild_id, user_id, role_id))
+
+        await asyncio.gather(*(unmute(*row) for row in rows))
+        await self.mutes.done(finished)
+        logger.info(f"Lifted {len(finished)} expired mutes.")
+
+        by_guild = {}
+        for guild_id, user_id, _ in finished:
+            by_guild.setdefault(guild_id, []).append(discord.Object(id=user_id))
+        for guild_id, targets in by_guild.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                self.bot.dispatch("moderation_action", guild, None, "Mute Expired", targets, None, None)
+
+    @expire_mutes.before_loop
+    async def before_expire_mutes(self):
+        await self.bot.wait_until_ready()
 
     @app_commands.command(name="kick", description="Kicks a member from the server.")
     @app_commands.checks.has_permissions(kick_members=True)
     async def kick(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
         try:
             await member.kick(reason=reason)
+            self._log_action(interaction, "Kick", [member], reason)
             embed = discord.Embed(title="Member Kicked", description=f"{member.mention} has been kicked.", color=discord.Color.red())
             embed.add_field(name="Reason", value=reason, inline=False)
             await interaction.response.send_message(embed=embed)
@@ -26,6 +320,7 @@ class Moderation(commands.Cog):
     async def ban(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
         try:
             await member.ban(reason=reason)
+            self._log_action(interaction, "Ban", [member], reason)
             embed = discord.Embed(title="Member Banned", description=f"{member.mention} has been banned.", color=discord.Color.red())
             embed.add_field(name="Reason", value=reason, inline=False)
             await interaction.response.send_message(embed=embed)
@@ -39,6 +334,7 @@ class Moderation(commands.Cog):
     async def unban(self, interaction: discord.Interaction, user: discord.User, reason: str = "No reason provided"):
         try:
             await interaction.guild.unban(user, reason=reason)
+            self._log_action(interaction, "Unban", [user], reason)
             embed = discord.Embed(title="Member Unbanned", description=f"{user.mention} has been unbanned.", color=discord.Color.green())
             embed.add_field(name="Reason", value=reason, inline=False)
             await interaction.response.send_message(embed=embed)
@@ -47,74 +343,273 @@ class Moderation(commands.Cog):
         except discord.HTTPException as e:
             await interaction.response.send_message(f"❌ Failed to unban member: {str(e)}", ephemeral=True)
 
+    mass = app_commands.Group(name="mass", description="Ban, kick or time out many members at once.", guild_only=True)
+
+    @mass.command(name="ban", description="Bans many members at once, by list or by filters.")
+    @app_commands.describe(members="Mentions or user IDs, separated by spaces or commas",
+                           joined_within="Only members who joined in the last N minutes",
+                           account_age="Only accounts younger than N days",
+                           delete_days="Also delete their messages from the last N days",
+                           dry_run="Only show who would be banned")
+    @app_commands.checks.has_permissions(ban_members=True)
+    async def mass_ban(self, interaction: discord.Interaction, members: str = None, joined_within: int = None,
+                       account_age: int = None, reason: str = "No reason provided",
+                       delete_days: app_commands.Range[int, 0, 7] = 0, dry_run: bool = False):
+        action = MassAction(interaction.guild, "ban", reason, delete_message_seconds=delete_days * 86400)
+        await self._run_mass(interaction, action, members, joined_within, account_age, dry_run)
+
+    @mass.command(name="kick", description="Kicks many members at once, by list or by filters.")
+    @app_commands.describe(members="Mentions or user IDs, separated by spaces or commas",
+                           joined_within="Only members who joined in the last N minutes",
+                           account_age="Only accounts younger than N days",
+                           dry_run="Only show who would be kicked")
+    @app_commands.checks.has_permissions(kick_members=True)
+    async def mass_kick(self, interaction: discord.Interaction, members: str = None, joined_within: int = None,
+                        account_age: int = None, reason: str = "No reason provided", dry_run: bool = False):
+        action = MassAction(interaction.guild, "kick", reason)
+        await self._run_mass(interaction, action, members, joined_within, account_age, dry_run)
+
+    @mass.command(name="timeout", description="Times out many members at once, by list or by filters.")
+    @app_commands.describe(minutes="How long the timeout lasts",
+                           members="Mentions or user IDs, separated by spaces or commas",
+                           joined_within="Only members who joined in the last N minutes",
+                           account_age="Only accounts younger than N days",
+                           dry_run="Only show who would be timed out")
+    @app_commands.checks.has_permissions(moderate_members=True)
+    async def mass_timeout(self, interaction: discord.Interaction, minutes: app_commands.Range[int, 1, MAX_TIMEOUT_MINUTES],
+                           members: str = None, joined_within: int = None, account_age: int = None,
+                           reason: str = "No reason provided", dry_run: bool = False):
+        action = MassAction(interaction.guild, "timeout", reason, until=discord.utils.utcnow() + timedelta(minutes=minutes))
+        await self._run_mass(interaction, action, members, joined_within, account_age, dry_run)
+
+    async def _run_mass(self, interaction: discord.Interaction, action: MassAction, members: str,
+                        joined_within: int, account_age: int, dry_run: bool):
+        """Resolves the targets of a mass action, runs it and answers with one summary embed."""
+        if not members and joined_within is None and account_age is None:
+            await interaction.response.send_message("❌ Give members to act on, a `joined_within` or `account_age` filter, or both.", ephemeral=True)
+            return
+        if (joined_within is not None and joined_within < 1) or (account_age is not None and account_age < 1):
+            await interaction.response.send_message("❌ Filters must be at least 1.", ephemeral=True)
+            return
+        filtered = joined_within is not None or account_age is not None
+        if filtered and not interaction.guild.chunked:
+            await interaction.response.send_message("❌ Filtering by join time or account age needs the member cache, which this bot runs without.", ephemeral=True)
+            return
+
+        await interaction.response.defer(thinking=True)
+        user_ids = parse_ids(members) if members else None
+        if filtered:
+            matches = select_members(interaction.guild,
+                                     timedelta(minutes=joined_within) if joined_within else None,
+                                     timedelta(days=account_age) if account_age else None)
+            if user_ids is None:
+                user_ids = [member.id for member in matches]
+            else:
+                matching = {member.id for member in matches}
+                user_ids = [user_id for user_id in user_ids if user_id in matching]
+        if not user_ids:
+            await interaction.followup.send("❌ No members matched.", ephemeral=True)
+            return
+        if len(user_ids) > MAX_TARGETS:
+            await interaction.followup.send(f"❌ {len(user_ids)} members matched; narrow it down to at most {MAX_TARGETS}.", ephemeral=True)
+            return
+
+        targets = await action.resolve(interaction.user, user_ids)
+        verb = {"ban": "Banned", "kick": "Kicked", "timeout": "Timed Out"}[action.kind]
+        result = action.result
+        if dry_run or not targets:
+            embed = discord.Embed(title=f"Mass {action.kind.title()} Preview" if dry_run else f"Nobody {verb}",
+                                  description=f"{len(targets)} of {len(user_ids)} member(s) would be affected.",
+                                  color=discord.Color.light_grey())
+            if targets:
+                embed.add_field(name="Targets", value=self._mention_list([target.id for target in targets]), inline=False)
+        else:
+            await action.run(targets)
+            self._log_action(interaction, f"Mass {action.kind.title()}", [discord.Object(id=user_id) for user_id in result.done], action.reason,
+                             f"**Failed:** {sum(result.failed.values())}" if result.failed else None)
+            logger.info(f"Mass {action.kind} by {interaction.user} in guild {interaction.guild.id}: "
+                        f"{len(result.done)} done, {sum(result.failed.values())} failed in {result.elapsed:.1f}s")
+            embed = discord.Embed(title=f"Members {verb}", description=f"{len(result.done)} of {len(user_ids)} member(s) {verb.lower()}.",
+                                  color=discord.Color.red())
+            embed.add_field(name="Reason", value=action.reason, inline=False)
+            if result.done:
+                embed.add_field(name=verb, value=self._mention_list(result.done), inline=False)
+            if result.failed:
+                embed.add_field(name="Failed", value="\n".join(f"{count} × {reason}" for reason, count in result.failed.most_common()), inline=False)
+            embed.set_footer(text=f"{result.requests} requests in {result.elapsed:.1f}s")
+        if result.skipped:
+            embed.add_field(name="Skipped", value="\n".join(f"{count} × {reason}" for reason, count in result.skipped.most_common()), inline=False)
+        await interaction.followup.send(embed=embed)
+
+    @staticmethod
+    def _mention_list(user_ids: list[int], limit: int = 40) -> str:
+        listing = " ".join(f"<@{user_id}>" for user_id in user_ids[:limit])
+        return listing + (f" and {len(user_ids) - limit} more" if len(user_ids) > limit else "")
+
+    async def _run_purge(self, interaction: discord.Interaction, purge: PurgeRun, describe, targets: list = ()):
+        """Runs a deferred purge, reporting progress by editing the original response."""
+        view = PurgeCancelView(purge, interaction.user.id)
+
+        async def report(run: PurgeRun, done: bool):
+            failed = [job for job in run.jobs if job.error is not None]
+            embed = discord.Embed(
+                title=("Purge Cancelled" if run.cancelled else "Messages Purged") if done else "Purging Messages...",
+                description=describe(run.deleted),
+                color=discord.Color.blue()
+            )
+            if failed:
+                embed.add_field(name="Errors", value=f"Stopped early in {len(failed)} channel(s): {failed[0].error}", inline=False)
+            embed.set_footer(text=f"{run.scanned} messages scanned")
+            if done:
+                view.stop()
+            try:
+                await interaction.edit_original_response(embed=embed, view=None if done else view)
+            except discord.HTTPException as e:
+                logger.warning(f"Could not update purge progress: {e}")
+
+        purge.report = report
+        await report(purge, False)
+        await purge.run()
+        channels = ", ".join(f"<#{job.channel.id}>" for job in purge.jobs if job.deleted)
+        self._log_action(interaction, "Purge", targets, details=f"{describe(purge.deleted)}\n**Channels:** {channels or 'none'}")
+
     @app_commands.command(name="clear", description="Clears a specified amount of messages.")
+    @app_commands.describe(amount=f"How many messages to delete (1-{SCAN_LIMIT})")
     @app_commands.checks.has_permissions(manage_messages=True)
-    async def clear(self, interaction: discord.Interaction, amount: int):
-        try:
-            await interaction.channel.purge(limit=amount)
-            embed = discord.Embed(title="Messages Cleared", description=f"{amount} messages have been cleared.", color=discord.Color.blue())
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-        except discord.Forbidden:
-            await interaction.response.send_message("❌ I do not have permission to delete messages in this channel.", ephemeral=True)
-        except discord.HTTPException as e:
-            await interaction.response.send_message(f"❌ Failed to delete messages: {str(e)}", ephemeral=True)
+    async def clear(self, interaction: discord.Interaction, amount: app_commands.Range[int, 1, SCAN_LIMIT]):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        purge = PurgeRun()
+        purge.add(interaction.channel, amount)
+        await self._run_purge(interaction, purge, lambda n: f"{n} messages have been cleared.")
 
     @app_commands.command(name="mute", description="Mutes a member.")
+    @app_commands.describe(duration="Minutes until the mute is lifted (uses Discord's timeout when possible)")
     @app_commands.checks.has_permissions(manage_roles=True)
-    async def mute(self, interaction: discord.Interaction, member: discord.Member):
-        role = discord.utils.get(interaction.guild.roles, name="Muted")
+    async def mute(self, interaction: discord.Interaction, member: discord.Member, duration: int = None):
+        if duration is not None and duration < 1:
+            await interaction.response.send_message("❌ The duration must be at least 1 minute.", ephemeral=True)
+            return
+
+        if duration and duration <= MAX_TIMEOUT_MINUTES and interaction.guild.me.guild_permissions.moderate_members:
+            try:
+                await member.timeout(timedelta(minutes=duration), reason=f"Muted by {interaction.user}")
+                self._log_action(interaction, "Timeout", [member], details=f"**Duration:** {duration} minute(s)")
+                embed = discord.Embed(title="Member Muted", description=f"{member.mention} has been timed out for {duration} minute(s).", color=discord.Color.orange())
+                await interaction.response.send_message(embed=embed)
+                return
+            except discord.Forbidden:
+                pass  # e.g. the member outranks the bot; try the role instead.
+            except discord.HTTPException as e:
+                logger.error(f"Failed to time out {member} in guild {interaction.guild.id}: {e}")
+                await interaction.response.send_message("❌ Discord refused the timeout; please try again.", ephemeral=True)
+                return
+
+        role = await self.mute_role(interaction.guild)
         if role is None:
-            await interaction.response.send_message("❌ The 'Muted' role does not exist. Please create one first.", ephemeral=True)
+            await interaction.response.send_message("❌ No mute role is set up. Create a 'Muted' role or pick one with `/settings mute_role`.", ephemeral=True)
             return
-        
+
         try:
             await member.add_roles(role)
-            embed = discord.Embed(title="Member Muted", description=f"{member.mention} has been muted.", color=discord.Color.orange())
+            if duration:
+                await self.mutes.schedule(interaction.guild.id, member.id, role.id, duration * 60)
+            self._log_action(interaction, "Mute", [member], details=f"**Duration:** {duration} minute(s)" if duration else None)
+            description = f"{member.mention} has been muted" + (f" for {duration} minute(s)." if duration else ".")
+            embed = discord.Embed(title="Member Muted", description=description, color=discord.Color.orange())
             await interaction.response.send_message(embed=embed)
         except discord.Forbidden:
             await interaction.response.send_message("❌ I do not have permission to mute this member.", ephemeral=True)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to mute {member} in guild {interaction.guild.id}: {e}")
+            await interaction.response.send_message("❌ Could not mute this member; please try again.", ephemeral=True)
 
     @app_commands.command(name="unmute", description="Unmutes a member.")
     @app_commands.checks.has_permissions(manage_roles=True)
     async def unmute(self, interaction: discord.Interaction, member: discord.Member):
-        role = discord.utils.get(interaction.guild.roles, name="Muted")
-        if role is None:
-            await interaction.response.send_message("❌ The 'Muted' role does not exist. Please create one first.", ephemeral=True)
+        role = await self.mute_role(interaction.guild)
+        timed_out = member.is_timed_out()
+        if role is None and not timed_out:
+            await interaction.response.send_message("❌ No mute role is set up. Create a 'Muted' role or pick one with `/settings mute_role`.", ephemeral=True)
             return
-        
+
         try:
-            await member.remove_roles(role)
+            if timed_out:
+                await member.timeout(None, reason=f"Unmuted by {interaction.user}")
+            if role is not None and role in member.roles:
+                await member.remove_roles(role)
+            await self.mutes.cancel(interaction.guild.id, member.id)
+            self._log_action(interaction, "Unmute", [member])
             embed = discord.Embed(title="Member Unmuted", description=f"{member.mention} has been unmuted.", color=discord.Color.green())
             await interaction.response.send_message(embed=embed)
         except discord.Forbidden:
             await interaction.response.send_message("❌ I do not have permission to unmute this member.", ephemeral=True)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to unmute {member} in guild {interaction.guild.id}: {e}")
+            await interaction.response.send_message("❌ Could not unmute this member; please try again.", ephemeral=True)
 
     @app_commands.command(name="warn", description="Warns a member.")
     @app_commands.checks.has_permissions(manage_messages=True)
     async def warn(self, interaction: discord.Interaction, member: discord.Member, reason: str):
+        count = await self.warnings.add(interaction.guild.id, member.id, interaction.user.id, reason)
+        self._log_action(interaction, "Warn", [member], reason, f"**Total warnings:** {count}")
         embed = discord.Embed(title="Member Warned", description=f"{member.mention} has been warned.", color=discord.Color.yellow())
         embed.add_field(name="Reason", value=reason, inline=False)
+        embed.add_field(name="Total Warnings", value=count, inline=False)
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="warns", description="Displays the number of warnings a member has.")
-    async def warns(self, interaction: discord.Interaction, member: discord.Member):
-        embed = discord.Embed(title="Member Warnings", description=f"{member.mention} has warnings.", color=discord.Color.yellow())
+    @app_commands.describe(page="Show this page of the member's warning history")
+    async def warns(self, interaction: discord.Interaction, member: discord.Member, page: int = None):
+        count = await self.warnings.count(interaction.guild.id, member.id)
+        embed = discord.Embed(title="Member Warnings", description=f"{member.mention} has {count} warning(s).", color=discord.Color.yellow())
+
+        if page is not None and count:
+            pages = (count + WARNS_PER_PAGE - 1) // WARNS_PER_PAGE
+            page = min(max(page, 1), pages)
+            rows = await self.warnings.history(interaction.guild.id, member.id, page)
+            first = count - (page - 1) * WARNS_PER_PAGE
+            for index, (moderator_id, reason, created_at) in enumerate(rows):
+                embed.add_field(name=f"Warning #{first - index}", value=f"{reason[:900]}\nBy <@{moderator_id}> <t:{created_at}:R>", inline=False)
+            embed.set_footer(text=f"Page {page}/{pages}")
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="purge", description="Purges a specified amount of messages from a member.")
+    @app_commands.describe(amount=f"How many of their messages to delete (1-{SCAN_LIMIT})",
+                           contains="Only delete messages containing this text", hours="Only delete messages from the last N hours")
     @app_commands.checks.has_permissions(manage_messages=True)
-    async def purge(self, interaction: discord.Interaction, member: discord.Member, amount: int):
-        def check(message):
-            return message.author == member
+    async def purge(self, interaction: discord.Interaction, member: discord.Member, amount: app_commands.Range[int, 1, SCAN_LIMIT],
+                    contains: str = None, hours: app_commands.Range[int, 1] = None):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        after = discord.utils.utcnow() - timedelta(hours=hours) if hours else None
+        purge = PurgeRun()
+        purge.add(interaction.channel, amount, check=self._member_filter(member, contains), after=after)
+        await self._run_purge(interaction, purge, lambda n: f"{n} messages from {member.mention} have been purged.", [member])
 
-        try:
-            deleted = await interaction.channel.purge(limit=amount, check=check)
-            embed = discord.Embed(title="Messages Purged", description=f"{len(deleted)} messages from {member.mention} have been purged.", color=discord.Color.blue())
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-        except discord.Forbidden:
-            await interaction.response.send_message("❌ I do not have permission to delete messages in this channel.", ephemeral=True)
-        except discord.HTTPException as e:
-            await interaction.response.send_message(f"❌ Failed to delete messages: {str(e)}", ephemeral=True)
+    @app_commands.command(name="purge_everywhere", description="Purges a member's recent messages from every text channel.")
+    @app_commands.describe(hours="How far back to look (default 24)", contains="Only delete messages containing this text")
+    @app_commands.checks.has_permissions(manage_messages=True)
+    async def purge_everywhere(self, interaction: discord.Interaction, member: discord.Member, hours: int = 24, contains: str = None):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        me = interaction.guild.me
+        after = discord.utils.utcnow() - timedelta(hours=max(hours, 1))
+        check = self._member_filter(member, contains)
+        purge = PurgeRun()
+        for channel in interaction.guild.text_channels:
+            permissions = channel.permissions_for(me)
+            if permissions.manage_messages and permissions.read_message_history:
+                purge.add(channel, SCAN_LIMIT, check=check, after=after)
+        if not purge.jobs:
+            await interaction.followup.send("❌ I cannot delete messages in any channel.", ephemeral=True)
+            return
+        await self._run_purge(interaction, purge, lambda n: f"{n} messages from {member.mention} have been purged across {len(purge.jobs)} channels.", [member])
+
+    @staticmethod
+    def _member_filter(member: discord.Member, contains: str = None):
+        needle = contains.lower() if contains else None
+
+        def check(message: discord.Message):
+            return message.author.id == member.id and (needle is None or needle in message.content.lower())
+        return check
 
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
@@ -5,8 +5,7 @@ import asyncio
 import logging
 from discord import app_commands
 from discord.ext import commands
-from bot import change_activity 
-import sys
+import time
 
 owner_id = int(os.environ.get('OWNER_ID', 0))
 
@@ -32,7 +31,7 @@ class Owner(commands.Cog):
         if await self.is_owner(interaction):
             await self.bot.change_presence(activity=discord.Game(name=status))
             logger.info(f"Custom status set by {interaction.user}: {status}")
-            change_activity.stop() 
+            self.bot.change_activity.stop()
 
             embed = discord.Embed(title="✅ Status Updated", 
                                   description=f"Custom status set to: `{status}`", 
@@ -46,7 +45,8 @@ class Owner(commands.Cog):
         """Removes custom status and resumes normal activity change"""
         if await self.is_owner(interaction):
             await self.bot.change_presence(activity=None)
-            change_activity.start() 
+            if not self.bot.change_activity.is_running():
+                self.bot.change_activity.start()
 
             logger.info(f"Custom status deleted by {interaction.user}. Resuming normal activity change.")
             embed = discord.Embed(title="🔄 Status Cleared", 
@@ -56,6 +56,39 @@ class Owner(commands.Cog):
         else:
             await self.send_unauthorized_response(interaction)
 
+    @app_commands.command(name="reload", description="Hot-reload edited extensions without reconnecting.")
+    @app_commands.describe(extension="Extension to reload, e.g. fun (default: every edited one)")
+    async def reload(self, interaction: discord.Interaction, extension: str = None):
+        """Reloads one extension, or every extension whose source changed on disk"""
+        if not await self.is_owner(interaction):
+            await self.send_unauthorized_response(interaction)
+            return
+
+        names = None
+        if extension:
+            names = [extension if extension.startswith("cogs.") else f"cogs.{extension}"]
+            if names[0] not in self.bot.extensions:
+                await interaction.response.send_message(f"❌ `{names[0]}` is not loaded.", ephemeral=True)
+                return
+
+        await interaction.response.defer(ephemeral=True)
+        async with self.lock:
+            started = time.perf_counter()
+            results, core = await self.bot.hot_reload(names)
+            elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"Reload by {interaction.user}: {len(results)} extensions in {elapsed:.1f}ms")
+
+        failed = {name: error for name, error in results.items() if error}
+        embed = discord.Embed(title="🔁 Reload Complete" if not failed else "⚠️ Reload Finished With Errors",
+                              color=discord.Color.green() if not failed else discord.Color.orange())
+        embed.add_field(name="Reloaded", value="\n".join(f"`{name}`" for name in results if name not in failed) or "Nothing changed", inline=False)
+        for name, error in failed.items():
+            embed.add_field(name=f"❌ {name}", value=error[:1024], inline=False)
+        if core:
+            embed.add_field(name="Needs /restart", value="\n".join(f"`{name}`" for name in core), inline=False)
+        embed.set_footer(text=f"Took {elapsed:.1f}ms")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
     @app_commands.command(name="restart", description="Restart the bot.")
     async def restart(self, interaction: discord.Interaction):
         """Restarts the bot"""
@@ -66,10 +99,7 @@ class Owner(commands.Cog):
                                       description="The bot is restarting...", 
                                       color=discord.Color.orange())
                 await interaction.response.send_message(embed=embed)
-
-               
-                python = sys.executable
-                os.execl(python, python, *sys.argv)  
+                await self.bot.restart()
         else:
             await self.send_unauthorized_response(interaction)
 
@@ -0,0 +1,91 @@
+# cogs/settings.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+import logging
+from utils.settings import GuildSettings, MAX_PREFIX_LENGTH, WHISPER_LENGTH_LIMIT, WHISPER_SECONDS_LIMIT
+
+logger = logging.getLogger(__name__)
+
+
+class Settings(commands.Cog):
+    """Admin commands for the per-guild settings kept in ``bot.settings``."""
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.bot.settings.forget(guild.id)
+
+    settings = app_commands.Group(name="settings", description="Configure the bot for this server.",
+                                  guild_only=True, default_permissions=discord.Permissions(manage_guild=True))
+
+    def settings_embed(self, guild: discord.Guild, settings: GuildSettings) -> discord.Embed:
+        role = guild.get_role(settings.mute_role_id) if settings.mute_role_id else None
+        embed = discord.Embed(title="⚙️ Server Settings", color=discord.Color.blurple())
+        embed.add_field(name="Text Command Prefix", value=f"`{settings.prefix}`")
+        embed.add_field(name="Whisper Duration", value=f"{settings.whisper_min_seconds}-{settings.whisper_max_seconds} seconds")
+        embed.add_field(name="Whisper Length", value=f"{settings.whisper_max_length} characters")
+        embed.add_field(name="Whisper Mode", value="Click to reveal" if settings.whisper_reveal else "Shown in the channel")
+        embed.add_field(name="Mute Role", value=role.mention if role else "Role named 'Muted'")
+        return embed
+
+    async def _update(self, interaction: discord.Interaction, **changes):
+        try:
+            settings = await self.bot.settings.update(interaction.guild.id, **changes)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+        logger.info(f"[Settings] {interaction.user} changed {', '.join(sorted(changes))} in guild {interaction.guild.id}.")
+        await interaction.response.send_message("✅ Settings updated.", embed=self.settings_embed(interaction.guild, settings), ephemeral=True)
+
+    @settings.command(name="show", description="Show this server's settings.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def settings_show(self, interaction: discord.Interaction):
+        settings = await self.bot.settings.get(interaction.guild.id)
+        await interaction.response.send_message(embed=self.settings_embed(interaction.guild, settings), ephemeral=True)
+
+    @settings.command(name="whisper", description="Set the allowed whisper durations, length and mode.")
+    @app_commands.describe(min_seconds="Shortest time before a whisper is deleted",
+                           max_seconds="Longest time before a whisper is deleted",
+                           max_length="Longest whisper in characters",
+                           reveal="Only mentioned members can read whispers, through a Reveal button")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def settings_whisper(self, interaction: discord.Interaction,
+                               min_seconds: app_commands.Range[int, 1, WHISPER_SECONDS_LIMIT] = None,
+                               max_seconds: app_commands.Range[int, 1, WHISPER_SECONDS_LIMIT] = None,
+                               max_length: app_commands.Range[int, 1, WHISPER_LENGTH_LIMIT] = None, reveal: bool = None):
+        changes = {key: value for key, value in (("whisper_min_seconds", min_seconds), ("whisper_max_seconds", max_seconds),
+                                                 ("whisper_max_length", max_length), ("whisper_reveal", reveal)) if value is not None}
+        if not changes:
+            await interaction.response.send_message("❌ Give at least one value to change.", ephemeral=True)
+            return
+        await self._update(interaction, **changes)
+
+    @settings.command(name="mute_role", description="Pick the role /mute gives (leave empty to use the role named 'Muted').")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def settings_mute_role(self, interaction: discord.Interaction, role: discord.Role = None):
+        if role is not None and (role.is_default() or role.managed):
+            await interaction.response.send_message("❌ That role can't be given to members.", ephemeral=True)
+            return
+        if role is not None and role >= interaction.guild.me.top_role:
+            await interaction.response.send_message("❌ That role is above my highest role, so I couldn't give it.", ephemeral=True)
+            return
+        await self._update(interaction, mute_role_id=role.id if role else None)
+
+    @settings.command(name="prefix", description="Set the prefix for text commands.")
+    @app_commands.describe(prefix=f"Up to {MAX_PREFIX_LENGTH} characters, no spaces")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def settings_prefix(self, interaction: discord.Interaction, prefix: str):
+        await self._update(interaction, prefix=prefix)
+
+    @settings.command(name="reset", description="Restore every setting to its default.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def settings_reset(self, interaction: discord.Interaction):
+        settings = await self.bot.settings.reset(interaction.guild.id)
+        logger.info(f"[Settings] {interaction.user} reset the settings in guild {interaction.guild.id}.")
+        await interaction.response.send_message("✅ Settings reset.", embed=self.settings_embed(interaction.guild, settings), ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Settings(bot))
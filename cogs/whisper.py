@@ -1,53 +1,364 @@
 "cogs/whisper.py 🎉 V1.0.0"
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import asyncio
 import logging
 import re
+import time
+from collections import OrderedDict
+from utils.broadcast import Broadcast, MAX_CHANNELS, SendPacer, parse_channel_ids
+from utils.cluster import is_primary
+from utils.filter import ContentFilter, MAX_RECIPIENTS
+from utils.log import interaction_context
+from utils.ratelimit import rate_limit
+from utils.settings import DEFAULT_SETTINGS, GuildSettings, WHISPER_LENGTH_LIMIT, WHISPER_PREFIX
 
 logger = logging.getLogger(__name__)
 
+BLOCKLIST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS whisper_blocklist (
+    guild_id INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    PRIMARY KEY (guild_id, term)
+) WITHOUT ROWID;
+"""
+
+SECRET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS whisper_secrets (
+    message_id INTEGER PRIMARY KEY,
+    author_id INTEGER NOT NULL,
+    recipients TEXT NOT NULL,
+    content TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS whisper_secrets_expiry ON whisper_secrets (expires_at);
+"""
+
+MAX_BLOCKLIST_TERMS = 10_000
+MAX_TERM_LENGTH = 100
+REVEAL_CUSTOM_ID = "whisper:reveal"
+MENTION_PATTERN = re.compile(r"<@!?(\d{15,20})>")
+# An anonymous whisper may ping the users it names, never a role or the whole server.
+PLAIN_MENTIONS = discord.AllowedMentions(everyone=False, roles=False, users=True)
+
+class BlocklistStore:
+    """Per-guild whisper blocklists, each compiled once into a ContentFilter and kept in an LRU.
+
+    A guild's filter is built on first use and dropped whenever its list
+    changes, so submits only ever pay for a scan. Compiling a large list
+    runs in a worker thread to keep the event loop responsive.
+    """
+    CACHE_SIZE = 1000
+
+    def __init__(self, db):
+        self.db = db
+        self._filters: OrderedDict[int, ContentFilter] = OrderedDict()
+        self._loading: dict[int, asyncio.Task] = {}
+
+    async def start(self):
+        await self.db.executescript(BLOCKLIST_SCHEMA)
+
+    async def filter(self, guild_id: int) -> ContentFilter:
+        content_filter = self._filters.get(guild_id)
+        if content_filter is not None:
+            self._filters.move_to_end(guild_id)
+            return content_filter
+        task = self._loading.get(guild_id)
+        if task is None:
+            task = self._loading[guild_id] = asyncio.create_task(self._compile(guild_id))
+        return await asyncio.shield(task)  # Other submits may be waiting on the same build.
+
+    async def _compile(self, guild_id: int) -> ContentFilter:
+        terms = await self.terms(guild_id)
+        content_filter = await asyncio.to_thread(ContentFilter, terms) if terms else ContentFilter()
+        if self._loading.get(guild_id) is asyncio.current_task():  # Not invalidated while building.
+            del self._loading[guild_id]
+            self._filters[guild_id] = content_filter
+            if len(self._filters) > self.CACHE_SIZE:
+                self._filters.popitem(last=False)
+        return content_filter
+
+    def invalidate(self, guild_id: int):
+        self._filters.pop(guild_id, None)
+        self._loading.pop(guild_id, None)
+
+    async def terms(self, guild_id: int) -> list[str]:
+        rows = await self.db.fetchall("SELECT term FROM whisper_blocklist WHERE guild_id = ? ORDER BY term", (guild_id,))
+        return [row[0] for row in rows]
+
+    async def add(self, guild_id: int, terms: list[str]) -> int:
+        """Adds terms up to MAX_BLOCKLIST_TERMS; returns how many were new."""
+        row = await self.db.fetchone("SELECT COUNT(*) FROM whisper_blocklist WHERE guild_id = ?", (guild_id,))
+        terms = terms[:max(0, MAX_BLOCKLIST_TERMS - row[0])]
+        added = await self.db.executemany("INSERT OR IGNORE INTO whisper_blocklist (guild_id, term) VALUES (?, ?)",
+                                          [(guild_id, term) for term in terms])
+        if added:
+            self.invalidate(guild_id)
+        return added
+
+    async def remove(self, guild_id: int, terms: list[str]) -> int:
+        removed = await self.db.executemany("DELETE FROM whisper_blocklist WHERE guild_id = ? AND term = ?",
+                                            [(guild_id, term) for term in terms])
+        if removed:
+            self.invalidate(guild_id)
+        return removed
+
+class Secret:
+    __slots__ = ("author_id", "recipients", "content", "expires_at")
+
+    def __init__(self, author_id: int, recipients: tuple[int, ...], content: str, expires_at: float):
+        self.author_id = author_id
+        self.recipients = recipients
+        self.content = content
+        self.expires_at = expires_at
+
+    def readable_by(self, user_id: int) -> bool:
+        return user_id == self.author_id or user_id in self.recipients
+
+
+class SecretStore:
+    """The text behind click-to-reveal whispers, keyed by placeholder message ID.
+
+    Rows live in SQLite so buttons keep working across restarts; a bounded
+    LRU keeps recently sent or revealed whispers in memory. A whisper stops
+    being readable at ``expires_at`` and its row is removed when the message
+    is deleted or by the periodic ``sweep``, whichever comes first.
+    """
+    CACHE_SIZE = 10_000
+
+    def __init__(self, db):
+        self.db = db
+        self._cache: OrderedDict[int, Secret] = OrderedDict()
+
+    async def start(self):
+        await self.db.executescript(SECRET_SCHEMA)
+
+    def _remember(self, message_id: int, secret: Secret):
+        self._cache[message_id] = secret
+        self._cache.move_to_end(message_id)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def add(self, message_id: int, author_id: int, recipients: tuple[int, ...], content: str, ttl: float):
+        secret = Secret(author_id, recipients, content, time.time() + ttl)
+        await self.db.execute("INSERT OR REPLACE INTO whisper_secrets (message_id, author_id, recipients, content, expires_at) VALUES (?, ?, ?, ?, ?)",
+                              (message_id, author_id, ",".join(map(str, recipients)), content, secret.expires_at))
+        self._remember(message_id, secret)
+
+    def hold(self, message_id: int, secret: Secret):
+        """Makes a placeholder revealable right away, before ``add_many`` writes its row."""
+        self._remember(message_id, secret)
+
+    async def add_many(self, secrets: list[tuple[int, Secret]]):
+        """Stores many placeholders' whispers in one transaction."""
+        await self.db.executemany("INSERT OR REPLACE INTO whisper_secrets (message_id, author_id, recipients, content, expires_at) VALUES (?, ?, ?, ?, ?)",
+                                  [(message_id, secret.author_id, ",".join(map(str, secret.recipients)), secret.content, secret.expires_at)
+                                   for message_id, secret in secrets])
+        for message_id, secret in secrets:
+            self._remember(message_id, secret)
+
+    async def get(self, message_id: int) -> Secret | None:
+        """Returns the whisper behind a placeholder, or None once it has expired."""
+        secret = self._cache.get(message_id)
+        if secret is None:
+            row = await self.db.fetchone("SELECT author_id, recipients, content, expires_at FROM whisper_secrets WHERE message_id = ?", (message_id,))
+            if row is None:
+                return None
+            author_id, recipients, content, expires_at = row
+            secret = Secret(author_id, tuple(int(r) for r in recipients.split(",") if r), content, expires_at)
+        if secret.expires_at <= time.time():
+            self._cache.pop(message_id, None)
+            return None
+        self._remember(message_id, secret)
+        return secret
+
+    async def remove(self, message_ids: list[int]):
+        for message_id in message_ids:
+            self._cache.pop(message_id, None)
+        await self.db.executemany("DELETE FROM whisper_secrets WHERE message_id = ?", [(message_id,) for message_id in message_ids])
+
+    async def sweep(self) -> int:
+        """Deletes every expired whisper; returns how many rows went."""
+        now = time.time()
+        for message_id in [mid for mid, secret in self._cache.items() if secret.expires_at <= now]:
+            del self._cache[message_id]
+        return await self.db.execute("DELETE FROM whisper_secrets WHERE expires_at <= ?", (now,))
+
+
+class RevealView(discord.ui.View):
+    """The one persistent view behind every whisper's Reveal button.
+
+    It is registered once with ``bot.add_view`` and every placeholder shares
+    its ``custom_id``, so a click is looked up by the clicked message's ID
+    in the SecretStore; no view object exists per whisper. Placeholders are
+    sent with a stopped copy (``layout``) that discord.py doesn't track.
+    """
+    def __init__(self, secrets: SecretStore | None):
+        super().__init__(timeout=None)
+        self.secrets = secrets
+
+    @classmethod
+    def layout(cls) -> "RevealView":
+        view = cls(None)
+        view.stop()
+        return view
+
+    @discord.ui.button(label="Reveal", emoji="🔓", style=discord.ButtonStyle.secondary, custom_id=REVEAL_CUSTOM_ID)
+    async def reveal(self, interaction: discord.Interaction, button: discord.ui.Button):
+        secret = await self.secrets.get(interaction.message.id)
+        if secret is None:
+            await interaction.response.send_message("⌛ This whisper has expired.", ephemeral=True)
+        elif not secret.readable_by(interaction.user.id):
+            await interaction.response.send_message("🔒 This whisper isn't for you.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"{WHISPER_PREFIX}{secret.content}", ephemeral=True)
+
+def parse_terms(raw: str) -> list[str]:
+    """Splits a comma-separated list into normalized, de-duplicated terms."""
+    terms = dict.fromkeys(term.strip().lower() for term in raw.split(","))
+    return [term for term in terms if term and len(term) <= MAX_TERM_LENGTH]
+
+def mentioned_users(message: str) -> tuple[int, ...]:
+    """Returns the users a whisper mentions, in order, without duplicates and capped at MAX_RECIPIENTS."""
+    return tuple(dict.fromkeys(int(user_id) for user_id in MENTION_PATTERN.findall(message)))[:MAX_RECIPIENTS]
+
 class Whisper(commands.Cog):
     """Cog for whisper commands."""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.filters = BlocklistStore(bot.db)
+        self.secrets = SecretStore(bot.db)
+        self.pacer = SendPacer()
         logger.info("Whisper cog initialized.")
 
-    @app_commands.command(name="admin_whisper", description="Send a secret message to a specified channel (admins/mods).")
-    @app_commands.describe(channel="The channel to send the whisper to")
+    async def cog_load(self):
+        await self.filters.start()
+        await self.secrets.start()
+        # Replaces the previous registration on reload, since the custom_id is the same.
+        self.bot.add_view(RevealView(self.secrets))
+        if is_primary():  # Rows carry no guild, so one cluster worker sweeps for all of them.
+            self.sweep_secrets.start()
+
+    async def cog_unload(self):
+        self.sweep_secrets.cancel()
+
+    @tasks.loop(minutes=5)
+    async def sweep_secrets(self):
+        removed = await self.secrets.sweep()
+        if removed:
+            logger.info(f"[Whisper] Swept {removed} expired whisper(s).")
+
+    @commands.Cog.listener()
+    async def on_whisper_expire(self, channel_id: int, message_ids: list[int]):
+        await self.secrets.remove(message_ids)
+
+    blocklist = app_commands.Group(name="blocklist", description="Manage the terms blocked in whispers.",
+                                   guild_only=True, default_permissions=discord.Permissions(manage_guild=True))
+
+    @blocklist.command(name="add", description="Block terms in whispers (comma-separated).")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def blocklist_add(self, interaction: discord.Interaction, terms: str):
+        terms = parse_terms(terms)
+        if not terms:
+            await interaction.response.send_message(f"❌ Give one or more comma-separated terms of up to {MAX_TERM_LENGTH} characters.", ephemeral=True)
+            return
+        added = await self.filters.add(interaction.guild_id, terms)
+        logger.info(f"[Whisper] {interaction.user} blocked {added} terms in guild {interaction.guild_id}.")
+        await interaction.response.send_message(f"✅ Added {added} term(s) to the whisper blocklist.", ephemeral=True)
+
+    @blocklist.command(name="remove", description="Unblock terms in whispers (comma-separated).")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def blocklist_remove(self, interaction: discord.Interaction, terms: str):
+        removed = await self.filters.remove(interaction.guild_id, parse_terms(terms))
+        await interaction.response.send_message(f"✅ Removed {removed} term(s) from the whisper blocklist.", ephemeral=True)
+
+    @blocklist.command(name="list", description="Show the terms blocked in whispers.")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def blocklist_list(self, interaction: discord.Interaction):
+        terms = await self.filters.terms(interaction.guild_id)
+        listing = ", ".join(f"`{term}`" for term in terms)
+        if len(listing) > 4000:
+            listing = listing[:4000].rsplit(", ", 1)[0] + ", …"
+        embed = discord.Embed(title=f"🚫 Whisper Blocklist ({len(terms)} terms)",
+                              description=listing or "No terms are blocked.", color=discord.Color.red())
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="admin_whisper", description="Send a secret message to one or more channels (admins/mods).")
+    @app_commands.describe(channel="The channel to send the whisper to",
+                           channels="Broadcast to several channels, as #mentions or IDs",
+                           category="Broadcast to every text channel in a category",
+                           everywhere="Broadcast to every text channel in the server")
     @app_commands.checks.has_permissions(manage_messages=True)
-    async def admin_whisper(self, interaction: discord.Interaction, channel: discord.TextChannel):
-        """Command to send a whisper to a specified channel."""
+    @rate_limit(5, 30)
+    async def admin_whisper(self, interaction: discord.Interaction, channel: discord.TextChannel = None, channels: str = None,
+                            category: discord.CategoryChannel = None, everywhere: bool = False):
+        """Command to send a whisper to a specified channel, or broadcast it to many."""
+        if interaction.guild is None:
+            await interaction.response.send_message("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        if everywhere:
+            targets = [target.id for target in interaction.guild.text_channels]
+        else:
+            targets = [channel.id] if channel else []
+            targets += parse_channel_ids(channels)
+            if category is not None:
+                targets += [target.id for target in category.text_channels]
+            targets = list(dict.fromkeys(targets))
+        if not targets:
+            await interaction.response.send_message("❌ Pick a channel, several `channels`, a `category` or `everywhere`.", ephemeral=True)
+            return
+        if len(targets) > MAX_CHANNELS:
+            await interaction.response.send_message(f"❌ That's {len(targets)} channels; broadcast to at most {MAX_CHANNELS} at once.", ephemeral=True)
+            return
         try:
-            # Pass the chosen channel's ID to the modal.
-            await interaction.response.send_modal(WhisperModal(self.bot, channel_select=False, default_channel=channel.id))
+            # Pass the chosen channel IDs to the modal; permissions are checked once it is submitted.
+            settings = await self.bot.settings.get(interaction.guild_id)
+            if len(targets) == 1:
+                modal = WhisperModal(self.bot, self.filters, self.secrets, channel_select=False, default_channel=targets[0], settings=settings)
+            else:
+                modal = WhisperModal(self.bot, self.filters, self.secrets, channel_select=False, settings=settings,
+                                     targets=targets, pacer=self.pacer)
+            await interaction.response.send_modal(modal)
         except Exception as err:
             logger.error("[Whisper] Unexpected error: %s", err)
             await interaction.response.send_message("❌ Could not open whisper modal.", ephemeral=True)
 
     @app_commands.command(name="whisper", description="Send a secret message in this channel.")
+    @rate_limit(3, 20)
+    @rate_limit(20, 60, scope="channel")
     async def whisper(self, interaction: discord.Interaction):
         """Command to send a whisper in the current channel."""
         try:
-            await interaction.response.send_modal(WhisperModal(self.bot, channel_select=False, default_channel=interaction.channel.id))
+            settings = await self.bot.settings.get(interaction.guild_id)
+            await interaction.response.send_modal(WhisperModal(self.bot, self.filters, self.secrets, channel_select=False, default_channel=interaction.channel.id, settings=settings))
         except Exception as err:
             logger.error("[Whisper] Unexpected error: %s", err)
             await interaction.response.send_message("❌ Could not open whisper modal.", ephemeral=True)
 
 class WhisperModal(discord.ui.Modal):
     """Modal for sending a whisper message."""
-    def __init__(self, bot: commands.Bot, channel_select: bool = True, default_channel: int = None):
-        # The modal title remains the same.
-        super().__init__(title="Send a Whisper")
+    def __init__(self, bot: commands.Bot, filters: BlocklistStore, secrets: SecretStore, channel_select: bool = True,
+                 default_channel: int = None, settings: GuildSettings = DEFAULT_SETTINGS, targets: list[int] = None,
+                 pacer: SendPacer = None):
+        super().__init__(title=f"Broadcast a Whisper to {len(targets)} Channels" if targets else "Send a Whisper")
         self.bot = bot
+        self.filters = filters
+        self.secrets = secrets
         self.channel_select = channel_select
         self.default_channel = default_channel  # ID of the channel chosen before submission
+        self.targets = targets  # IDs of the channels a broadcast goes to, instead of default_channel
+        self.pacer = pacer
+        self.settings = settings
+        # The inputs are per-instance copies, so the guild's limits can be applied here.
+        # Clamped as well, since rows saved under the old 4000-character limit may still be above it.
+        self.message.max_length = min(settings.whisper_max_length, WHISPER_LENGTH_LIMIT)
+        self.duration.placeholder = f"{settings.whisper_min_seconds}-{settings.whisper_max_seconds}, e.g. {min(max(10, settings.whisper_min_seconds), settings.whisper_max_seconds)}"
 
     message = discord.ui.TextInput(
         label="Secret Message",
         placeholder="Enter your whisper... You can @mention someone.",
-        max_length=200
+        max_length=DEFAULT_SETTINGS.whisper_max_length
     )
     duration = discord.ui.TextInput(
         label="Delete After (Seconds)",
@@ -64,18 +375,30 @@ class WhisperModal(discord.ui.Modal):
 
             await interaction.response.defer(ephemeral=True)
             delete_after = int(self.duration.value)
-            if delete_after < 1 or delete_after > 3600:
+            if not self.settings.whisper_min_seconds <= delete_after <= self.settings.whisper_max_seconds:
                 raise ValueError("Invalid duration")
 
             # If channel selection is not needed, use the default channel.
-            channel = self.bot.get_channel(self.default_channel)
-            if not isinstance(channel, discord.TextChannel):
+            channel = None if self.targets else self.bot.get_channel(self.default_channel)
+            if not self.targets and not isinstance(channel, discord.TextChannel):
                 await interaction.followup.send("❌ The selected channel is invalid.", ephemeral=True)
                 return
 
-            await self.send_whisper(interaction, channel, self.message.value, delete_after)
+            content_filter = await self.filters.filter(interaction.guild.id)
+            reason = content_filter.violation(self.message.value, self.settings.whisper_reveal)
+            if reason:
+                await interaction.followup.send(f"🚫 {reason}", ephemeral=True)
+                return
+            message, blocked = content_filter.redact(self.message.value)
+            if blocked:
+                logger.info("[WhisperModal] Redacted %d blocked term(s).", blocked, extra=interaction_context(interaction))
+
+            if self.targets:
+                await self.broadcast_whisper(interaction, message, delete_after)
+            else:
+                await self.send_whisper(interaction, channel, message, delete_after)
         except ValueError:
-            await interaction.followup.send("⚠️ Invalid duration. Please enter a number between 1 and 3600.", ephemeral=True)
+            await interaction.followup.send(f"⚠️ Invalid duration. Please enter a number between {self.settings.whisper_min_seconds} and {self.settings.whisper_max_seconds}.", ephemeral=True)
             logger.warning("[WhisperModal] Invalid duration entered: %s", self.duration.value)
         except Exception as err:
             logger.error("[WhisperModal] Unexpected error: %s", err)
@@ -91,20 +414,79 @@ class WhisperModal(discord.ui.Modal):
                 await interaction.followup.send("❌ I don't have permission to send messages in the selected channel.", ephemeral=True)
                 return
 
-            msg = await channel.send(f"💬 **Secret Message:** {message}")
-            logger.info("[WhisperModal] Whisper sent to #%s: %s", channel.name, message)
+            if self.settings.whisper_reveal:
+                recipients = mentioned_users(message)
+                if not recipients:
+                    await interaction.followup.send("❌ Mention who the whisper is for; only they will be able to reveal it.", ephemeral=True)
+                    return
+                mentions = ", ".join(f"<@{user_id}>" for user_id in recipients)
+                msg = await channel.send(f"🤫 **Secret whisper** for {mentions}. Only they can reveal it.", view=RevealView.layout(),
+                                         allowed_mentions=discord.AllowedMentions(everyone=False, roles=False, users=True))
+                await self.secrets.add(msg.id, interaction.user.id, recipients, message, delete_after)
+            else:
+                msg = await channel.send(f"{WHISPER_PREFIX}{message}", allowed_mentions=PLAIN_MENTIONS)
+            # Never log the whisper itself; it is meant to stay secret.
+            logger.info("[WhisperModal] Whisper sent to #%s (%d chars).", channel.name, len(message),
+                        extra=interaction_context(interaction, channel=channel.id))
             if delete_after > 0:
-                await asyncio.sleep(delete_after)
-                try:
-                    await msg.delete()
-                    logger.info("[WhisperModal] Whisper deleted in #%s after %s seconds.", channel.name, delete_after)
-                except Exception as e:
-                    logger.error("[WhisperModal] Failed to delete whisper in #%s: %s", channel.name, e)
+                # The expiry scheduler owns the deletion, so the user is answered right away.
+                await self.bot.expiry.schedule(channel.id, msg.id, delete_after, guild_id=guild.id)
+            self.bot.dispatch("whisper_sent", msg, interaction.user, delete_after)
             await interaction.followup.send("✅ Whisper sent!", ephemeral=True)
         except Exception as err:
             logger.error("[WhisperModal] Failed to send whisper: %s", err)
             await interaction.followup.send("❌ Failed to send the whisper message.", ephemeral=True)
 
+    async def broadcast_whisper(self, interaction: discord.Interaction, message: str, delete_after: int):
+        """Sends a whisper to every target channel at once and answers with one delivery report."""
+        recipients = mentioned_users(message) if self.settings.whisper_reveal else ()
+        if self.settings.whisper_reveal and not recipients:
+            await interaction.followup.send("❌ Mention who the whisper is for; only they will be able to reveal it.", ephemeral=True)
+            return
+        broadcast = Broadcast(interaction.guild, self.pacer)
+        channels = broadcast.resolve(interaction.user, self.targets)
+        author_id = interaction.user.id
+        held = []
+
+        if recipients:
+            layout = RevealView.layout()  # Stopped, so one copy can go out with every placeholder.
+            mentions = ", ".join(f"<@{user_id}>" for user_id in recipients)
+            allowed = discord.AllowedMentions(everyone=False, roles=False, users=True)
+
+            async def send(channel: discord.TextChannel) -> discord.Message:
+                msg = await channel.send(f"🤫 **Secret whisper** for {mentions}. Only they can reveal it.", view=layout, allowed_mentions=allowed)
+                secret = Secret(author_id, recipients, message, time.time() + delete_after)
+                self.secrets.hold(msg.id, secret)
+                held.append((msg.id, secret))
+                return msg
+        else:
+            async def send(channel: discord.TextChannel) -> discord.Message:
+                return await channel.send(f"{WHISPER_PREFIX}{message}", allowed_mentions=PLAIN_MENTIONS)
+
+        result = await broadcast.run(channels, send)
+        if held:
+            await self.secrets.add_many(held)
+        if result.sent and delete_after > 0:
+            # Each copy expires delete_after seconds after it was itself sent.
+            await self.bot.expiry.schedule_many([(msg.channel.id, msg.id, sent_at + delete_after) for msg, sent_at in result.sent],
+                                              guild_id=interaction.guild.id)
+        # Never log the whisper itself; it is meant to stay secret.
+        logger.info("[WhisperModal] Whisper broadcast to %d/%d channels (%d chars) in %.1fs.", len(result.sent), len(self.targets),
+                    len(message), result.elapsed, extra=interaction_context(interaction))
+        if result.sent:
+            self.bot.dispatch("whisper_broadcast", [msg for msg, _ in result.sent], interaction.user, delete_after)
+
+        embed = discord.Embed(title="📣 Whisper Broadcast", description=f"Delivered to {len(result.sent)} of {len(self.targets)} channel(s).",
+                              color=discord.Color.green() if result.sent and not result.failed else discord.Color.orange())
+        if result.sent:
+            delivered = " ".join(f"<#{msg.channel.id}>" for msg, _ in result.sent[:40])
+            embed.add_field(name="Delivered", value=delivered + (f" and {len(result.sent) - 40} more" if len(result.sent) > 40 else ""), inline=False)
+        for name, reasons in (("Skipped", result.skipped), ("Failed", result.failed)):
+            if reasons:
+                embed.add_field(name=name, value="\n".join(f"{count} × {reason}" for reason, count in reasons.most_common()), inline=False)
+        embed.set_footer(text=f"{result.requests} requests in {result.elapsed:.1f}s")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
 async def setup(bot: commands.Bot):
     """Adds the Whisper cog to the bot."""
     await bot.add_cog(Whisper(bot))
@@ -0,0 +1,137 @@
+# utils/broadcast.py
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from typing import Awaitable, Callable
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+MAX_CHANNELS = 500  # Per broadcast; pick a category for more targeted announcements.
+SEND_CONCURRENCY = 20  # Sends in flight at once.
+# Discord allows 50 requests per second for the whole bot; broadcasts share most of that and leave the rest for commands.
+# The burst is kept small so that no one-second window sees more than the refill plus the burst.
+SEND_BUDGET = 10
+SEND_REFILL_PER_SECOND = 40.0
+
+CHANNEL_PATTERN = re.compile(r"<#(\d{15,20})>|(?<!\d)(\d{15,20})(?!\d)")
+
+
+def parse_channel_ids(text: str) -> list[int]:
+    """Returns the channel IDs in pasted text (#mentions or raw IDs), in order and without duplicates."""
+    ids = {}
+    for match in CHANNEL_PATTERN.finditer(text or ""):
+        ids[int(match.group(1) or match.group(2))] = None
+    return list(ids)
+
+
+def skip_reason(user: discord.Member, channel) -> str | None:
+    """Returns why ``user`` may not whisper into ``channel`` through the bot, or None."""
+    if channel is None:
+        return "channel not found"
+    if not isinstance(channel, discord.TextChannel):
+        return "not a text channel"
+    mine = channel.permissions_for(channel.guild.me)
+    if not (mine.view_channel and mine.send_messages):
+        return "I can't post there"
+    theirs = channel.permissions_for(user)
+    if not (theirs.view_channel and theirs.send_messages):
+        return "you can't post there"
+    return None
+
+
+class SendPacer:
+    """Token bucket for the bot-wide request limit, shared by every broadcast.
+
+    A send waits for a token instead of going out and coming back as a 429,
+    so concurrent broadcasts together stay under the global limit.
+    """
+    def __init__(self, budget: int = SEND_BUDGET, rate: float = SEND_REFILL_PER_SECOND, clock=time.monotonic):
+        self.budget = budget
+        self.rate = rate
+        self.clock = clock
+        self._tokens = float(budget)
+        self._updated = clock()
+
+    async def take(self) -> float:
+        """Waits for a token; returns how many seconds that took."""
+        waited = 0.0
+        while True:
+            now = self.clock()
+            self._tokens = min(self.budget, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return waited
+            delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class BroadcastResult:
+    """Outcome of one broadcast: the copies sent, and why the other channels were skipped or failed."""
+    def __init__(self):
+        self.sent: list[tuple[discord.Message, float]] = []  # (copy, Unix time it was sent)
+        self.skipped: Counter[str] = Counter()
+        self.failed: Counter[str] = Counter()
+        self.requests = 0
+        self.elapsed = 0.0
+
+    def fail(self, reason: str):
+        self.failed[reason] += 1
+
+
+class Broadcast:
+    """Sends one message to many channels of a guild.
+
+    Permissions for the bot and the sender are checked for every target in
+    one pass (``resolve``) before anything is sent. Sends then fan out
+    SEND_CONCURRENCY at a time, each taking a token from the shared
+    SendPacer; every channel is its own message route, so only the global
+    limit is contended and discord.py keeps handling per-route buckets.
+    """
+    def __init__(self, guild: discord.Guild, pacer: SendPacer):
+        self.guild = guild
+        self.pacer = pacer
+        self.result = BroadcastResult()
+        self._slots = asyncio.Semaphore(SEND_CONCURRENCY)
+
+    def resolve(self, user: discord.Member, channel_ids: list[int]) -> list[discord.TextChannel]:
+        """Returns the channels ``user`` may broadcast to, counting the rest as skipped."""
+        channels = []
+        for channel_id in dict.fromkeys(channel_ids):
+            channel = self.guild.get_channel(channel_id)
+            reason = skip_reason(user, channel)
+            if reason is not None:
+                self.result.skipped[reason] += 1
+                continue
+            channels.append(channel)
+        return channels
+
+    async def run(self, channels: list[discord.TextChannel],
+                  send: Callable[[discord.TextChannel], Awaitable[discord.Message]]) -> BroadcastResult:
+        started = time.perf_counter()
+        await asyncio.gather(*(self._send(channel, send) for channel in channels))
+        self.result.elapsed = time.perf_counter() - started
+        return self.result
+
+    async def _send(self, channel: discord.TextChannel, send):
+        async with self._slots:
+            await self.pacer.take()
+            self.result.requests += 1
+            try:
+                message = await send(channel)
+            except discord.NotFound:
+                self.result.fail("channel deleted")
+                return
+            except discord.Forbidden:
+                self.result.fail("missing permissions")
+                return
+            except discord.HTTPException as e:
+                logger.error(f"[Broadcast] Could not send to channel {channel.id} in guild {self.guild.id}: {e}")
+                self.result.fail(e.text or str(e))
+                return
+        self.result.sent.append((message, time.time()))
@@ -0,0 +1,123 @@
+# utils/cluster.py
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+STATS_INTERVAL = 10  # Seconds between stat reports from each worker.
+
+
+def shard_options() -> dict:
+    """Returns the shard settings the cluster launcher passed in, if any."""
+    options = {}
+    if os.getenv("SHARD_COUNT"):
+        options["shard_count"] = int(os.environ["SHARD_COUNT"])
+    if os.getenv("SHARD_IDS"):
+        options["shard_ids"] = [int(sid) for sid in os.environ["SHARD_IDS"].split(",")]
+    return options
+
+
+def owned_shards() -> tuple[int, list[int]] | None:
+    """Returns (shard_count, shard_ids) for a cluster worker, or None when this process runs every shard."""
+    options = shard_options()
+    if "shard_ids" not in options:
+        return None
+    return options["shard_count"], options["shard_ids"]
+
+
+def is_primary() -> bool:
+    """True for the worker that runs cluster-wide chores: the one holding shard 0, or the only process."""
+    shards = owned_shards()
+    return shards is None or 0 in shards[1]
+
+
+def shard_filter(column: str = "guild_id") -> tuple[str, tuple]:
+    """Returns an SQL condition and its parameters matching rows of guilds on this worker's shards.
+
+    Workers share one database, so background jobs use this to pick up only
+    their own guilds' rows. Rows without a guild go to the primary worker.
+    Outside a cluster every row matches.
+    """
+    shards = owned_shards()
+    if shards is None:
+        return "1", ()
+    shard_count, shard_ids = shards
+    condition = f"({column} >> 22) % ? IN ({', '.join('?' * len(shard_ids))})"
+    if 0 in shard_ids:
+        condition = f"({column} IS NULL OR {condition})"
+    return condition, (shard_count, *shard_ids)
+
+
+def local_stats(bot) -> dict:
+    return {
+        "cluster": int(os.getenv("CLUSTER_ID", 0)),
+        "guilds": len(bot.guilds),
+        "shards": {str(shard_id): latency for shard_id, latency in bot.latencies},
+        "started": getattr(bot, "start_time", time.time()),
+        "reported": time.time(),
+    }
+
+
+class ClusterClient:
+    """Reports this worker's stats to the launcher and keeps the cluster-wide view it sends back."""
+    def __init__(self, bot, path: str):
+        self.bot = bot
+        self.path = path
+        self.clusters: dict[str, dict] = {}
+        self._task: asyncio.Task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name="cluster-ipc")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError as e:
+                logger.warning(f"[ClusterClient] Launcher unreachable, retrying: {e}")
+                await asyncio.sleep(STATS_INTERVAL)
+                continue
+            try:
+                while True:
+                    writer.write(json.dumps(local_stats(self.bot)).encode() + b"\n")
+                    await writer.drain()
+                    line = await asyncio.wait_for(reader.readline(), timeout=STATS_INTERVAL)
+                    if not line:
+                        raise ConnectionResetError("launcher closed the connection")
+                    self.clusters = json.loads(line)["clusters"]
+                    await asyncio.sleep(STATS_INTERVAL)
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"[ClusterClient] Lost the launcher connection: {e}")
+            finally:
+                writer.close()
+
+
+def cluster_totals(bot) -> dict:
+    """Returns guild and shard totals across every cluster (or just this process)."""
+    clusters = dict(getattr(bot, "cluster", None) and bot.cluster.clusters or {})
+    mine = local_stats(bot)
+    clusters[str(mine["cluster"])] = mine  # Our own numbers are always freshest.
+
+    shards = {}
+    for stats in clusters.values():
+        for shard_id, latency in stats["shards"].items():
+            shards[int(shard_id)] = latency
+    return {
+        "clusters": len(clusters),
+        "guilds": sum(stats["guilds"] for stats in clusters.values()),
+        "shards": dict(sorted(shards.items())),
+    }
+
+
+def format_latency(latency: float) -> str:
+    return "n/a" if latency is None or math.isinf(latency) or math.isnan(latency) else f"{latency * 1000:.0f}ms"
@@ -0,0 +1,73 @@
+# utils/database.py
+import asyncio
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.getenv("DATA_DIR", "data")
+
+
+class Database:
+    """Async wrapper around one SQLite connection that lives on its own thread."""
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(DATA_DIR, "onwhisper.db")
+        self._conn: sqlite3.Connection = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def connect(self):
+        """Opens the connection in WAL mode."""
+        def _connect():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            return conn
+
+        self._conn = await self._run(_connect)
+        logger.info(f"Database opened at {self.path}")
+
+    async def close(self):
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    async def executescript(self, script: str):
+        await self._run(self._conn.executescript, script)
+
+    async def execute(self, sql: str, params=()) -> int:
+        """Runs a single statement and returns the number of affected rows."""
+        def _execute():
+            return self._conn.execute(sql, params).rowcount
+        return await self._run(_execute)
+
+    async def executemany(self, sql: str, rows) -> int:
+        """Runs a statement for every row inside one transaction (one fsync)."""
+        rows = list(rows)
+
+        def _executemany():
+            with self._conn:
+                self._conn.execute("BEGIN")
+                return self._conn.executemany(sql, rows).rowcount
+        if not rows:
+            return 0
+        return await self._run(_executemany)
+
+    async def fetchone(self, sql: str, params=()):
+        def _fetchone():
+            return self._conn.execute(sql, params).fetchone()
+        return await self._run(_fetchone)
+
+    async def fetchall(self, sql: str, params=()):
+        def _fetchall():
+            return self._conn.execute(sql, params).fetchall()
+        return await self._run(_fetchall)
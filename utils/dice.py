@@ -0,0 +1,367 @@
+# utils/dice.py
+import heapq
+import math
+import random
+import re
+from statistics import NormalDist
+
+MAX_TERMS = 10
+MAX_DICE = 10 ** 9  # Per term
+MAX_SIDES = 10 ** 9
+MAX_CONSTANT = 10 ** 9
+SIMULATE_LIMIT = 10_000  # Dice rolled one by one per expression; larger terms sample their total.
+SHOW_DICE = 100  # Individual dice listed in a reply
+EXPLODE_LIMIT = 20  # Extra rolls one exploding die may chain
+EXACT_WORK = 1_000_000  # Multiply-adds allowed for an exact distribution
+STATS_WORK = 200_000  # Dice rolled when a distribution has to be simulated (keep/drop)
+STATS_SAMPLES = 2000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+TERM_PATTERN = re.compile(r"([+-])?(?:(\d*)d(\d+|%)((?:kh|kl|dh|dl|k|d|r|!|\d)*)|(\d+))")
+MODIFIER_PATTERN = re.compile(r"(kh|kl|dh|dl|k|d)(\d*)|(!)|r(\d*)")
+
+
+class DiceTerm:
+    """``NdM`` with its modifiers: keep/drop (``kh3``, ``kl1``, ``dl1``, ``dh1``),
+    exploding on the highest face (``!``) or rerolling low results once (``r1``)."""
+    __slots__ = ("sign", "count", "sides", "keep", "explode", "reroll")
+
+    def __init__(self, sign: int, count: int, sides: int, keep: tuple[str, int] = None, explode: bool = False, reroll: int = 0):
+        self.sign = sign
+        self.count = count
+        self.sides = sides
+        self.keep = keep  # ("h" | "l", how many)
+        self.explode = explode
+        self.reroll = reroll  # Results of this or lower are rerolled once.
+
+    @property
+    def kept(self) -> int:
+        return self.keep[1] if self.keep else self.count
+
+    def __str__(self):
+        text = f"{self.count}d{self.sides}"
+        if self.reroll:
+            text += f"r{self.reroll}"
+        if self.explode:
+            text += "!"
+        if self.keep:
+            text += f"k{self.keep[0]}{self.keep[1]}"
+        return text
+
+    def moments(self) -> tuple[float, float]:
+        """Returns the mean and second moment of one die."""
+        m = self.sides
+        mean, second = (m + 1) / 2, (m + 1) * (2 * m + 1) / 6
+        if self.reroll:
+            t = self.reroll
+            high1 = (m * (m + 1) - t * (t + 1)) / 2 / m
+            high2 = (m * (m + 1) * (2 * m + 1) - t * (t + 1) * (2 * t + 1)) / 6 / m
+            mean, second = high1 + t / m * mean, high2 + t / m * second
+        elif self.explode:
+            # A die is X plus, on the top face (probability p), another exploding die.
+            p, plain_mean, plain_second = 1 / m, mean, second
+            for _ in range(EXPLODE_LIMIT):
+                mean, second = plain_mean + p * mean, plain_second + 2 * mean + p * second
+        return mean, second
+
+    def explode_depth(self) -> int:
+        """Returns how many top faces in a row ``pmf`` follows an exploding die for."""
+        return min(EXPLODE_LIMIT, math.ceil(12 / math.log10(self.sides)))
+
+    def pmf_width(self) -> int:
+        """Returns the length of ``pmf()`` without building it."""
+        return self.sides * (self.explode_depth() + 1) if self.explode else self.sides
+
+    def pmf(self) -> list[float]:
+        """Returns one die's distribution as probabilities of 1, 2, 3, ..."""
+        m = self.sides
+        if self.reroll:
+            t = self.reroll
+            return [(t / m) / m + (1 / m if face > t else 0) for face in range(1, m + 1)]
+        if not self.explode:
+            return [1 / m] * m
+        # A total of m*d + f: the top face d times in a row, then face f. The chain is cut at EXPLODE_LIMIT
+        # (where the last roll may be the top face too) or once it is too unlikely to matter.
+        depth = self.explode_depth()
+        probs = [0.0] * (m * (depth + 1))
+        for d in range(depth + 1):
+            chance = m ** -(d + 1)
+            for f in range(1, m):
+                probs[m * d + f - 1] = chance
+        probs[-1] = m ** -(depth + 1)
+        return probs
+
+
+class DieRoll:
+    __slots__ = ("value", "label", "kept")
+
+    def __init__(self, value: int, label: str):
+        self.value = value
+        self.label = label
+        self.kept = True
+
+
+class TermRoll:
+    """One term's outcome: every die when it was rolled one by one, or only a sampled total."""
+    __slots__ = ("term", "total", "dice", "sampled")
+
+    def __init__(self, term: DiceTerm, total: int, dice: list[DieRoll] = None, sampled: bool = False):
+        self.term = term
+        self.total = total
+        self.dice = dice
+        self.sampled = sampled
+
+
+class DiceStats:
+    __slots__ = ("mean", "std", "low", "high", "percentiles", "method")
+
+    def __init__(self, mean: float, std: float, low: int, high: int, percentiles: dict[int, float], method: str):
+        self.mean = mean
+        self.std = std
+        self.low = low
+        self.high = high
+        self.percentiles = percentiles
+        self.method = method
+
+
+class DiceExpression:
+    """A parsed dice expression such as ``4d6kh3 + 1d8! - 2``.
+
+    Every operation has bounded cost whatever the dice count: up to
+    SIMULATE_LIMIT dice are rolled one by one, bigger terms sample their
+    total from the normal approximation of the sum (keep/drop needs every
+    die, so it is limited to SIMULATE_LIMIT), and ``stats`` uses an exact
+    distribution while it fits in EXACT_WORK, otherwise the normal
+    approximation or a bounded simulation.
+    """
+    def __init__(self, terms: list[DiceTerm], constant: int):
+        self.terms = terms
+        self.constant = constant
+
+    def __str__(self):
+        parts = [("-" if term.sign < 0 else "+", str(term)) for term in self.terms]
+        if self.constant or not parts:
+            parts.append(("-" if self.constant < 0 else "+", str(abs(self.constant))))
+        text = " ".join(f"{sign} {part}" for sign, part in parts)
+        return text[2:] if text.startswith("+ ") else text
+
+    @property
+    def dice(self) -> int:
+        return sum(term.count for term in self.terms)
+
+    @property
+    def low(self) -> int:
+        return self.constant + sum(t.kept * (1 if t.sign > 0 else -self._die_max(t)) for t in self.terms)
+
+    @property
+    def high(self) -> int:
+        return self.constant + sum(t.kept * (self._die_max(t) if t.sign > 0 else -1) for t in self.terms)
+
+    @staticmethod
+    def _die_max(term: DiceTerm) -> int:
+        return term.sides * (EXPLODE_LIMIT + 1) if term.explode else term.sides
+
+    @classmethod
+    def parse(cls, text: str) -> "DiceExpression":
+        """Parses an expression; raises ValueError with a message fit to show the user."""
+        source = re.sub(r"\s+", "", (text or "").lower())
+        if not source:
+            raise ValueError("Enter a dice expression such as `2d6` or `4d6kh3 + 2`.")
+        terms, constant, position, count = [], 0, 0, 0
+        while position < len(source):
+            match = TERM_PATTERN.match(source, position)
+            if match is None or match.end() == position or (position and not match.group(1)):
+                raise ValueError(f"Couldn't read `{source[position:position + 20]}`. Try something like `2d6 + 3`.")
+            position = match.end()
+            count += 1
+            if count > MAX_TERMS:
+                raise ValueError(f"Use at most {MAX_TERMS} terms.")
+            sign = -1 if match.group(1) == "-" else 1
+            if match.group(5) is not None:
+                value = int(match.group(5))
+                if value > MAX_CONSTANT:
+                    raise ValueError(f"Numbers can be at most {MAX_CONSTANT:,}.")
+                constant += sign * value
+                continue
+            terms.append(cls._parse_dice(sign, match.group(2), match.group(3), match.group(4)))
+        return cls(terms, constant)
+
+    @staticmethod
+    def _parse_dice(sign: int, count: str, sides: str, modifiers: str) -> DiceTerm:
+        count = int(count) if count else 1
+        sides = 100 if sides == "%" else int(sides)
+        if not 1 <= count <= MAX_DICE:
+            raise ValueError(f"Roll between 1 and {MAX_DICE:,} dice per term.")
+        if not 1 <= sides <= MAX_SIDES:
+            raise ValueError(f"Dice need between 1 and {MAX_SIDES:,} sides.")
+        term = DiceTerm(sign, count, sides)
+        position = 0
+        while position < len(modifiers):
+            match = MODIFIER_PATTERN.match(modifiers, position)
+            if match is None:
+                raise ValueError(f"Unknown modifier `{modifiers[position:]}` on `{count}d{sides}`.")
+            position = match.end()
+            if match.group(1):
+                if term.keep:
+                    raise ValueError("Use one keep or drop modifier per term.")
+                how_many = int(match.group(2)) if match.group(2) else 1
+                kind = match.group(1)
+                if kind in ("kh", "k", "kl"):
+                    if how_many > count:
+                        raise ValueError(f"Can't keep {how_many} of {count} dice.")
+                    term.keep = ("l" if kind == "kl" else "h", how_many)
+                else:
+                    if how_many >= count:
+                        raise ValueError(f"Can't drop {how_many} of {count} dice.")
+                    term.keep = ("h" if kind in ("dl", "d") else "l", count - how_many)
+            elif match.group(3):
+                if sides == 1:
+                    raise ValueError("A one-sided die can't explode.")
+                term.explode = True
+            else:
+                term.reroll = int(match.group(4)) if match.group(4) else 1
+                if not 1 <= term.reroll < sides:
+                    raise ValueError(f"Rerolls need a threshold below {sides}.")
+        if term.explode and term.reroll:
+            raise ValueError("Use either `!` or `r` on a term, not both.")
+        if term.keep and count > SIMULATE_LIMIT:
+            raise ValueError(f"Keep and drop work on at most {SIMULATE_LIMIT:,} dice.")
+        return term
+
+    def roll(self, rng: random.Random = random, detailed: bool = True) -> tuple[int, list[TermRoll]]:
+        """Rolls the expression; returns the total and each term's outcome."""
+        budget = SIMULATE_LIMIT
+        rolls = []
+        for term in self.terms:
+            if term.count <= budget or term.keep:
+                budget -= term.count
+                rolls.append(self._roll_each(term, rng, detailed and term.count <= SHOW_DICE))
+            else:
+                rolls.append(TermRoll(term, self._sample_total(term, rng), sampled=True))
+        return self.constant + sum(roll.term.sign * roll.total for roll in rolls), rolls
+
+    @staticmethod
+    def _roll_each(term: DiceTerm, rng: random.Random, detailed: bool) -> TermRoll:
+        faces = range(1, term.sides + 1)
+        values = rng.choices(faces, k=term.count)
+        labels = [str(value) for value in values] if detailed else None
+        if term.reroll:
+            for i, value in enumerate(values):
+                if value <= term.reroll:
+                    values[i] = rng.choice(faces)
+                    if detailed:
+                        labels[i] = f"~~{value}~~ {values[i]}"
+        elif term.explode:
+            for i, value in enumerate(values):
+                chain = 0
+                while value == term.sides and chain < EXPLODE_LIMIT:
+                    value = rng.choice(faces)
+                    values[i] += value
+                    chain += 1
+                if chain and detailed:
+                    labels[i] = f"{values[i]}💥"
+
+        if not detailed:
+            if term.keep:
+                pick = heapq.nlargest if term.keep[0] == "h" else heapq.nsmallest
+                values = pick(term.keep[1], values)
+            return TermRoll(term, sum(values))
+
+        dice = [DieRoll(value, label) for value, label in zip(values, labels)]
+        if term.keep:
+            order = sorted(range(len(dice)), key=lambda i: dice[i].value, reverse=term.keep[0] == "h")
+            for i in order[term.keep[1]:]:
+                dice[i].kept = False
+        return TermRoll(term, sum(die.value for die in dice if die.kept), dice)
+
+    @staticmethod
+    def _sample_total(term: DiceTerm, rng: random.Random) -> int:
+        mean, second = term.moments()
+        total = rng.gauss(term.count * mean, math.sqrt(max(0.0, term.count * (second - mean * mean))))
+        return min(max(round(total), term.count), term.count * DiceExpression._die_max(term))
+
+    def stats(self, rng: random.Random = random) -> DiceStats:
+        """Returns the distribution of the total, without rolling every die where it can be avoided."""
+        if any(term.keep for term in self.terms):
+            return self._simulated_stats(rng)
+        mean = self.constant + sum(term.sign * term.count * term.moments()[0] for term in self.terms)
+        variance = sum(term.count * (term.moments()[1] - term.moments()[0] ** 2) for term in self.terms)
+        std = math.sqrt(max(0.0, variance))
+        exact = self._exact_distribution()
+        if exact is not None:
+            offset, probs = exact
+            return DiceStats(mean, std, self.low, self.high, self._pmf_percentiles(offset, probs), "exact")
+        normal = NormalDist(mean, std) if std > 0 else None
+        percentiles = {p: min(max(round(normal.inv_cdf(p / 100) if normal else mean), self.low), self.high) for p in PERCENTILES}
+        return DiceStats(mean, std, self.low, self.high, percentiles, "normal approximation")
+
+    def _exact_distribution(self) -> tuple[int, list[float]] | None:
+        """Convolves every die's distribution if that fits in EXACT_WORK; returns (lowest total, probabilities)."""
+        work = 0
+        offset, probs = self.constant, [1.0]
+        for term in self.terms:
+            if term.count * term.sides > EXACT_WORK:
+                return None
+            width, n = term.pmf_width(), term.count
+            # Adding the k-th die costs (current width) x (die width), and the width grows by width - 1 each time.
+            work += n * len(probs) * width + width * (width - 1) * n * (n - 1) // 2
+            if work > EXACT_WORK:
+                return None  # Checked before pmf(), which for a huge exploding die is itself millions of entries.
+            die = term.pmf()
+            if term.sign < 0:
+                die = die[::-1]
+            for _ in range(term.count):
+                probs = _convolve(probs, die)
+                offset += 1 if term.sign > 0 else -width
+        return offset, probs
+
+    @staticmethod
+    def _pmf_percentiles(offset: int, probs: list[float]) -> dict[int, float]:
+        percentiles, cumulative, targets = {}, 0.0, list(PERCENTILES)
+        for i, p in enumerate(probs):
+            cumulative += p
+            while targets and cumulative >= targets[0] / 100 - 1e-12:
+                percentiles[targets.pop(0)] = offset + i
+        for target in targets:
+            percentiles[target] = offset + len(probs) - 1
+        return percentiles
+
+    def _simulated_stats(self, rng: random.Random) -> DiceStats:
+        # Terms too big to roll die by die are sampled in O(1), so only the others count.
+        per_sample = sum(term.count for term in self.terms if term.keep or term.count <= SIMULATE_LIMIT) or 1
+        samples = min(STATS_SAMPLES, STATS_WORK // per_sample)
+        if samples < 100:
+            raise ValueError(f"That's too many dice to work out the distribution; keep it under {STATS_WORK // 100:,} dice.")
+        totals = sorted(self.roll(rng, detailed=False)[0] for _ in range(samples))
+        mean = sum(totals) / samples
+        std = math.sqrt(sum((t - mean) ** 2 for t in totals) / samples)
+        percentiles = {p: totals[min(samples - 1, int(p / 100 * samples))] for p in PERCENTILES}
+        return DiceStats(mean, std, self.low, self.high, percentiles, f"simulated from {samples:,} rolls")
+
+
+def _convolve(a: list[float], b: list[float]) -> list[float]:
+    out = [0.0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return out
+
+
+def describe_roll(rolls: list[TermRoll], constant: int, limit: int = 1500) -> str:
+    """Lists each term's dice (dropped ones struck through), or just its total when there are too many to show."""
+    parts = []
+    for roll in rolls:
+        sign = "-" if roll.term.sign < 0 else "+"
+        if roll.dice is not None:
+            dice = ", ".join(die.label if die.kept else f"~~{die.label}~~" for die in roll.dice)
+            parts.append(f"{sign} {roll.term} [{dice}] = {roll.total:,}")
+        elif roll.sampled:
+            parts.append(f"{sign} {roll.term} = {roll.total:,} *(total sampled)*")
+        else:
+            parts.append(f"{sign} {roll.term} = {roll.total:,}")
+    if constant:
+        parts.append(f"{'-' if constant < 0 else '+'} {abs(constant):,}")
+    text = "\n".join(parts)
+    text = text[2:] if text.startswith("+ ") else text
+    return text if len(text) <= limit else text[:limit - 1] + "…"
@@ -0,0 +1,169 @@
+# utils/expiry.py
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections import defaultdict
+
+import discord
+
+from utils.cluster import shard_filter
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS whisper_expiry (
+    message_id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    expires_at INTEGER NOT NULL,
+    guild_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_whisper_expiry_expires_at ON whisper_expiry (expires_at);
+"""
+
+BULK_DELETE_LIMIT = 100  # Discord's cap for one bulk delete request
+RETRY_DELAY = 30  # Seconds before retrying a batch that failed for a transient reason
+MAX_RETRIES = 5  # Transient failures before a whisper is given up on
+
+
+class ExpiryScheduler:
+    """Deletes expired whisper messages from a single timer heap backed by SQLite.
+
+    Deadlines are rounded up to whole seconds so that whispers expiring in the
+    same second are removed together with one bulk delete per channel.
+    """
+    def __init__(self, bot, db):
+        self.bot = bot
+        self.db = db
+        self._heap: list[tuple[int, int, int]] = []  # (expires_at, message_id, channel_id)
+        self._retries: dict[int, int] = {}  # message_id -> transient failures so far
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    async def start(self):
+        """Loads pending deletions from disk and starts the timer task."""
+        await self.db.executescript(SCHEMA)
+        columns = {row[1] for row in await self.db.fetchall("PRAGMA table_info(whisper_expiry)")}
+        if "guild_id" not in columns:
+            await self.db.execute("ALTER TABLE whisper_expiry ADD COLUMN guild_id INTEGER")
+        # Cluster workers share the table; each one only deletes whispers in its own guilds.
+        condition, params = shard_filter()
+        rows = await self.db.fetchall(f"SELECT expires_at, message_id, channel_id FROM whisper_expiry WHERE {condition}", params)
+        self._heap = [tuple(row) for row in rows]
+        heapq.heapify(self._heap)
+        self._task = asyncio.create_task(self._run(), name="whisper-expiry")
+        logger.info(f"Expiry scheduler started with {len(self._heap)} pending deletions.")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def schedule(self, channel_id: int, message_id: int, delete_after: float, guild_id: int = None):
+        """Persists a deletion and queues it on the heap."""
+        expires_at = math.ceil(time.time() + delete_after)
+        await self.db.execute(
+            "INSERT OR REPLACE INTO whisper_expiry (message_id, channel_id, expires_at, guild_id) VALUES (?, ?, ?, ?)",
+            (message_id, channel_id, expires_at, guild_id)
+        )
+        self._push((expires_at, message_id, channel_id))
+
+    async def schedule_many(self, entries: list[tuple[int, int, float]], guild_id: int = None):
+        """Persists many deletions in one transaction; each entry is (channel_id, message_id, expires_at as a Unix time)."""
+        rows = [(message_id, channel_id, math.ceil(expires_at), guild_id) for channel_id, message_id, expires_at in entries]
+        await self.db.executemany(
+            "INSERT OR REPLACE INTO whisper_expiry (message_id, channel_id, expires_at, guild_id) VALUES (?, ?, ?, ?)", rows
+        )
+        for message_id, channel_id, expires_at, _ in rows:
+            self._push((expires_at, message_id, channel_id))
+
+    def _push(self, entry: tuple[int, int, int]):
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._wakeup.set()  # New earliest deadline, re-arm the timer.
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.time()
+            by_channel = defaultdict(list)
+            while self._heap and self._heap[0][0] <= now:
+                _, message_id, channel_id = heapq.heappop(self._heap)
+                by_channel[channel_id].append(message_id)
+
+            try:
+                await asyncio.gather(*(self._delete_channel(cid, ids) for cid, ids in by_channel.items()))
+            except Exception as e:
+                logger.error(f"[ExpiryScheduler] Unexpected error while deleting whispers: {e}")
+
+    async def _delete_channel(self, channel_id: int, message_ids: list[int]):
+        """Deletes one channel's due whispers in bulk batches of up to 100."""
+        channel = self.bot.get_channel(channel_id)
+        done = []
+        for i in range(0, len(message_ids), BULK_DELETE_LIMIT):
+            batch = message_ids[i:i + BULK_DELETE_LIMIT]
+            try:
+                if channel is not None:
+                    await channel.delete_messages([discord.Object(id=mid) for mid in batch])
+                elif len(batch) == 1:
+                    await self.bot.http.delete_message(channel_id, batch[0])
+                else:
+                    await self.bot.http.delete_messages(channel_id, batch)
+                logger.info(f"[ExpiryScheduler] Deleted {len(batch)} whisper(s) in channel {channel_id}.")
+            except (discord.NotFound, discord.Forbidden) as e:
+                # Already gone or no longer deletable; nothing left to retry.
+                logger.warning(f"[ExpiryScheduler] Could not delete whispers in channel {channel_id}: {e}")
+            except discord.HTTPException as e:
+                if 400 <= e.status < 500 and e.status != 429:
+                    # Retrying won't help. The usual cause is a bulk delete with messages older than 14 days
+                    # (rows loaded after a long downtime), and those can still be deleted one at a time.
+                    logger.warning(f"[ExpiryScheduler] Bulk delete rejected in channel {channel_id}, deleting singly: {e}")
+                    if len(batch) > 1:
+                        await self._delete_singly(channel_id, batch)
+                else:
+                    retry = [mid for mid in batch if self._retries.get(mid, 0) < MAX_RETRIES]
+                    if retry:
+                        logger.error(f"[ExpiryScheduler] Failed to delete whispers in channel {channel_id}, retrying: {e}")
+                        retry_at = math.ceil(time.time() + RETRY_DELAY)
+                        for mid in retry:
+                            self._retries[mid] = self._retries.get(mid, 0) + 1
+                            self._push((retry_at, mid, channel_id))
+                    if len(retry) < len(batch):
+                        logger.error(f"[ExpiryScheduler] Giving up on {len(batch) - len(retry)} whisper(s) in channel {channel_id} "
+                                     f"after {MAX_RETRIES} retries: {e}")
+                    retrying = set(retry)
+                    batch = [mid for mid in batch if mid not in retrying]
+            for mid in batch:
+                self._retries.pop(mid, None)
+            done.extend(batch)
+
+        await self.db.executemany("DELETE FROM whisper_expiry WHERE message_id = ?", ((mid,) for mid in done))
+        if done:
+            self.bot.dispatch("whisper_expire", channel_id, done)
+
+    async def _delete_singly(self, channel_id: int, message_ids: list[int]):
+        """Deletes messages one request each; whatever still fails is dropped, not retried."""
+        for mid in message_ids:
+            try:
+                await self.bot.http.delete_message(channel_id, mid)
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                logger.warning(f"[ExpiryScheduler] Could not delete whisper {mid} in channel {channel_id}: {e}")
@@ -0,0 +1,130 @@
+# utils/filter.py
+import os
+import re
+from collections import deque
+
+MAX_MENTIONS = int(os.getenv("WHISPER_MAX_MENTIONS", 3))
+MAX_RECIPIENTS = int(os.getenv("WHISPER_MAX_RECIPIENTS", 25))  # Users a click-to-reveal whisper can be for
+MAX_INVITES = int(os.getenv("WHISPER_MAX_INVITES", 0))
+REDACTION = "█"
+
+MENTION_PATTERN = re.compile(r"<@[!&]?\d+>|@everyone|@here")
+USER_MENTION_PATTERN = re.compile(r"<@!?\d+>")
+INVITE_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?(?:discord(?:app)?\.com/invite|discord\.gg)/[\w-]+", re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    """Lowercases ``text`` while keeping every character at its original offset."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class Automaton:
+    """Aho-Corasick matcher: finds every blocklisted term in one left-to-right pass.
+
+    Scanning costs O(len(text) + matches) no matter how many terms there are,
+    unlike trying each pattern in turn. Terms match case-insensitively and
+    only as whole words, so "ass" does not fire inside "class".
+    """
+    __slots__ = ("goto", "fail", "output", "size")
+
+    def __init__(self, terms):
+        self.goto: list[dict[str, int]] = [{}]
+        self.output: list[tuple[int, ...]] = [()]  # Lengths of the terms ending at each state.
+        self.size = 0
+        for term in terms:
+            term = normalize(term.strip())
+            if term:
+                self._insert(term)
+        self.fail = [0] * len(self.goto)
+        self._link()
+
+    def _insert(self, term: str):
+        state = 0
+        for char in term:
+            following = self.goto[state].get(char)
+            if following is None:
+                following = len(self.goto)
+                self.goto[state][char] = following
+                self.goto.append({})
+                self.output.append(())
+            state = following
+        if len(term) not in self.output[state]:
+            self.output[state] += (len(term),)
+            self.size += 1
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(char, 0)
+                self.output[following] += self.output[self.fail[following]]
+
+    def __len__(self):
+        return self.size
+
+    def find(self, text: str) -> list[tuple[int, int]]:
+        """Returns the (start, end) spans of every whole-word match in ``text``."""
+        if not self.size:
+            return []
+        goto, fail, output = self.goto, self.fail, self.output
+        folded = normalize(text)
+        spans = []
+        state = 0
+        for end, char in enumerate(folded, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in output[state]:
+                start = end - length
+                if (start == 0 or not folded[start - 1].isalnum()) and (end == len(folded) or not folded[end].isalnum()):
+                    spans.append((start, end))
+        return spans
+
+
+class ContentFilter:
+    """One guild's compiled whisper rules: blocklisted terms plus mention and invite limits."""
+    __slots__ = ("automaton", "max_mentions", "max_recipients", "max_invites")
+
+    def __init__(self, terms=(), max_mentions: int = MAX_MENTIONS, max_invites: int = MAX_INVITES, max_recipients: int = MAX_RECIPIENTS):
+        self.automaton = Automaton(terms)
+        self.max_mentions = max_mentions
+        self.max_recipients = max_recipients
+        self.max_invites = max_invites
+
+    def violation(self, text: str, reveal: bool = False) -> str | None:
+        """Returns why ``text`` must be rejected outright, or None.
+
+        A click-to-reveal whisper is for the users it mentions, so those count
+        against ``max_recipients`` instead; roles and @everyone/@here still
+        count against ``max_mentions``.
+        """
+        mentions = len(MENTION_PATTERN.findall(text))
+        if reveal:
+            users = len(USER_MENTION_PATTERN.findall(text))
+            if users > self.max_recipients:
+                return f"Whispers can be for at most {self.max_recipients} users."
+            mentions -= users
+        if mentions > self.max_mentions:
+            return f"Whispers can mention at most {self.max_mentions} users or roles."
+        invites = len(INVITE_PATTERN.findall(text))
+        if invites > self.max_invites:
+            return "Whispers can't contain server invites." if not self.max_invites else f"Whispers can contain at most {self.max_invites} invites."
+        return None
+
+    def redact(self, text: str) -> tuple[str, int]:
+        """Blanks out every blocklisted term; returns the new text and how many were hit."""
+        spans = self.automaton.find(text)
+        if not spans:
+            return text, 0
+        chars = list(text)
+        for start, end in spans:
+            chars[start:end] = REDACTION * (end - start)
+        return "".join(chars), len(spans)
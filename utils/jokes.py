@@ -0,0 +1,99 @@
+# utils/jokes.py
+import asyncio
+import logging
+import os
+import random
+from collections import deque
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+JOKE_API_URL = os.getenv("JOKE_API_URL", "https://official-joke-api.appspot.com/random_ten")
+POOL_SIZE = 50
+LOW_WATER = 20
+RECENT_SIZE = 200
+FETCH_TIMEOUT = 5
+MAX_BACKOFF = 300
+
+
+class JokePool:
+    """Keeps a bounded pool of prefetched jokes so /joke never waits on the network.
+
+    A background task refills the pool over the bot's shared HTTP session
+    whenever it drops below the low-water mark. Jokes seen recently are
+    skipped, and when the upstream is down the pool falls back to jokes
+    that were already served.
+    """
+    def __init__(self, session: aiohttp.ClientSession, url: str = JOKE_API_URL):
+        self.session = session
+        self.url = url
+        self.pool: deque[str] = deque(maxlen=POOL_SIZE)
+        self.served: deque[str] = deque(maxlen=RECENT_SIZE)
+        self._recent: deque[int] = deque(maxlen=RECENT_SIZE)
+        self._recent_ids: set[int] = set()
+        self._refill = asyncio.Event()
+        self._task: asyncio.Task = None
+
+    def start(self):
+        self._refill.set()
+        self._task = asyncio.create_task(self._run(), name="joke-pool")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get(self) -> str | None:
+        """Returns a joke without touching the network, or None if nothing was ever fetched."""
+        if len(self.pool) <= LOW_WATER:
+            self._refill.set()
+        if self.pool:
+            joke = self.pool.popleft()
+            self.served.append(joke)
+            return joke
+        if self.served:
+            return random.choice(self.served)
+        return None
+
+    def _remember(self, joke_id: int) -> bool:
+        """Records a joke id, returning False if it was seen recently."""
+        if joke_id in self._recent_ids:
+            return False
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_ids.discard(self._recent[0])
+        self._recent.append(joke_id)
+        self._recent_ids.add(joke_id)
+        return True
+
+    async def fetch(self) -> int:
+        """Fetches one batch from the API and returns how many new jokes were pooled."""
+        timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+        async with self.session.get(self.url, timeout=timeout) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        added = 0
+        for joke_data in data if isinstance(data, list) else [data]:
+            joke_id = joke_data.get("id") or hash(joke_data["setup"])
+            if self._remember(joke_id):
+                self.pool.append(f"{joke_data['setup']} - {joke_data['punchline']}")
+                added += 1
+        return added
+
+    async def _run(self):
+        backoff = 1
+        while True:
+            await self._refill.wait()
+            try:
+                added = await self.fetch()
+                backoff = 1
+                if added == 0 or len(self.pool) > POOL_SIZE - 10:
+                    # Full enough, or the API keeps repeating itself; wait for demand.
+                    self._refill.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[JokePool] Joke API unavailable, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
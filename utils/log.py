@@ -0,0 +1,171 @@
+# utils/log.py
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+# Fields that handlers may attach with ``extra=`` and that end up as JSON keys.
+CONTEXT_FIELDS = ("guild", "channel", "command", "user", "latency_ms")
+
+# Per-logger budgets for noisy paths: (records per second, burst).
+RATE_LIMITS = {
+    "discord.gateway": (1.0, 20),
+    "discord.client": (1.0, 20),
+    "discord.http": (2.0, 50),
+    "utils.expiry": (5.0, 100),
+}
+
+_listener: logging.handlers.QueueListener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops records from loggers that exceed their budget and reports how many were dropped.
+
+    Warnings and errors always pass.
+    """
+    def __init__(self, limits: dict[str, tuple[float, int]]):
+        super().__init__()
+        self.limits = limits
+        self._buckets: dict[str, list[float]] = {}  # logger -> [tokens, updated_at, dropped]
+        self._resolved: dict[str, tuple] = {}  # logger -> the (name, limit) it falls under
+
+    def _limit_for(self, name: str):
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            resolved = self._resolved[name] = self._lookup(name)
+        return resolved
+
+    def _lookup(self, name: str):
+        while name:
+            if name in self.limits:
+                return name, self.limits[name]
+            name = name.rpartition(".")[0]
+        return None, None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        name, limit = self._limit_for(record.name)
+        if limit is None:
+            return True
+
+        rate, burst = limit
+        now = time.monotonic()
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = [float(burst), now, 0]
+        bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1
+        if bucket[2]:
+            record.msg = f"{record.msg} ({int(bucket[2])} similar messages suppressed)"
+            bucket[2] = 0
+        return True
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread without copying them.
+
+    The queue never leaves this process, so only the message is merged with
+    its arguments here (they could change once the call returns); the rest,
+    exception info included, is formatted on the writer thread.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotates when the file exceeds ``maxBytes`` or is older than ``max_age`` seconds."""
+    def __init__(self, filename, max_age: float = 86400, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_age = max_age
+        self._opened_at = time.time()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.max_age and time.time() - self._opened_at >= self.max_age:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self._opened_at = time.time()
+
+
+def setup_logging(path: str = "bot.log", level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Routes all logging through a queue to a background writer thread.
+
+    The event loop only pays for building the record and putting it on the
+    queue; formatting to JSON, console output and disk writes happen on the
+    listener thread. Returns the started listener, which must be stopped on
+    shutdown to flush what is left. Calling it again returns the same listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    file_handler = RotatingFileHandler(
+        path,
+        maxBytes=int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024)),
+        backupCount=int(os.getenv("LOG_BACKUPS", 5)),
+        max_age=float(os.getenv("LOG_MAX_AGE", 86400)),
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(JsonFormatter())
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+
+    # Neither formatter prints the caller, thread or process, so don't look them up on every call.
+    logging._srcfile = None
+    logging.logThreads = logging.logProcesses = logging.logMultiprocessing = False
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(RATE_LIMITS))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    _listener = listener
+    return listener
+
+
+def interaction_context(interaction, **extra) -> dict:
+    """Builds the ``extra=`` fields for a log call made while handling an interaction."""
+    context = {
+        "guild": interaction.guild_id,
+        "channel": interaction.channel_id,
+        "user": interaction.user.id if interaction.user else None,
+        "command": interaction.command.qualified_name if interaction.command else None,
+    }
+    context.update(extra)
+    return context
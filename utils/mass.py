@@ -0,0 +1,171 @@
+# utils/mass.py
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+MAX_TARGETS = 1000  # Per command; narrow the filters for more.
+BULK_BAN_LIMIT = 200  # Discord's cap for one bulk ban request
+ACTION_CONCURRENCY = 5  # Kicks and timeouts in flight at once; discord.py queues the rest on the route's bucket.
+
+ID_PATTERN = re.compile(r"<@!?(\d{15,20})>|(?<!\d)(\d{15,20})(?!\d)")
+
+
+def parse_ids(text: str) -> list[int]:
+    """Returns the user IDs in pasted text (mentions or raw IDs), in order and without duplicates."""
+    ids = {}
+    for match in ID_PATTERN.finditer(text or ""):
+        ids[int(match.group(1) or match.group(2))] = None
+    return list(ids)
+
+
+def select_members(guild: discord.Guild, joined_within: timedelta = None, account_age: timedelta = None,
+                   now: datetime = None) -> list[discord.Member]:
+    """Returns the cached non-bot members who joined within ``joined_within`` and whose accounts are younger than ``account_age``."""
+    now = now or discord.utils.utcnow()
+    joined_after = now - joined_within if joined_within else None
+    created_after = now - account_age if account_age else None
+    return [
+        member for member in guild.members
+        if not member.bot
+        and (joined_after is None or (member.joined_at is not None and member.joined_at >= joined_after))
+        and (created_after is None or member.created_at >= created_after)
+    ]
+
+
+def skip_reason(moderator: discord.Member, target: discord.Member | discord.Object) -> str | None:
+    """Returns why ``moderator`` may not act on ``target``, or None. Non-members (plain IDs) can only be banned."""
+    guild = moderator.guild
+    if target.id == moderator.id:
+        return "that's you"
+    if target.id == guild.me.id:
+        return "that's me"
+    if target.id == guild.owner_id:
+        return "server owner"
+    if isinstance(target, discord.Member):
+        if moderator.id != guild.owner_id and target.top_role >= moderator.top_role:
+            return "role not below yours"
+        if target.top_role >= guild.me.top_role:
+            return "role not below mine"
+    return None
+
+
+class MassResult:
+    """Outcome of one mass action: who it worked on, and why the rest was skipped or failed."""
+    def __init__(self):
+        self.done: list[int] = []
+        self.skipped: Counter[str] = Counter()
+        self.failed: Counter[str] = Counter()
+        self.requests = 0
+        self.elapsed = 0.0
+
+    def fail(self, reason: str, count: int = 1):
+        self.failed[reason] += count
+
+
+class MassAction:
+    """Applies one moderation action (ban, kick or timeout) to many targets.
+
+    Bans go out through Discord's bulk ban endpoint, 200 users per request,
+    when the bot may manage the guild. Kicks, timeouts and fallback bans are
+    one request each, ACTION_CONCURRENCY at a time, so a raid-sized list
+    never piles hundreds of requests onto the route's rate limit at once.
+    """
+    KINDS = ("ban", "kick", "timeout")
+
+    def __init__(self, guild: discord.Guild, kind: str, reason: str, *, until: datetime = None,
+                 delete_message_seconds: int = 0):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown mass action {kind!r}")
+        self.guild = guild
+        self.kind = kind
+        self.reason = reason
+        self.until = until
+        self.delete_message_seconds = delete_message_seconds
+        self.result = MassResult()
+        self._slots = asyncio.Semaphore(ACTION_CONCURRENCY)
+
+    async def resolve(self, moderator: discord.Member, user_ids: list[int]) -> list[discord.Member | discord.Object]:
+        """Turns IDs into eligible targets, fetching members missing from the cache.
+
+        IDs that aren't members can still be banned; kicks and timeouts skip them.
+        """
+        targets = []
+
+        async def fetch(user_id: int):
+            async with self._slots:
+                try:
+                    return await self.guild.fetch_member(user_id)
+                except discord.NotFound:
+                    return None
+
+        missing = [user_id for user_id in user_ids if self.guild.get_member(user_id) is None]
+        fetched = dict(zip(missing, await asyncio.gather(*(fetch(user_id) for user_id in missing)))) if missing else {}
+        self.result.requests += len(missing)
+
+        for user_id in user_ids:
+            target = self.guild.get_member(user_id) or fetched.get(user_id)
+            if target is None:
+                if self.kind != "ban":
+                    self.result.skipped["not in the server"] += 1
+                    continue
+                target = discord.Object(id=user_id)
+            reason = skip_reason(moderator, target)
+            if reason is not None:
+                self.result.skipped[reason] += 1
+                continue
+            targets.append(target)
+        return targets
+
+    async def run(self, targets: list[discord.Member | discord.Object]) -> MassResult:
+        started = time.perf_counter()
+        if self.kind == "ban" and self.guild.me.guild_permissions.manage_guild:
+            for i in range(0, len(targets), BULK_BAN_LIMIT):
+                await self._bulk_ban(targets[i:i + BULK_BAN_LIMIT])
+        else:
+            await asyncio.gather(*(self._act(target) for target in targets))
+        self.result.elapsed = time.perf_counter() - started
+        return self.result
+
+    async def _bulk_ban(self, batch: list):
+        self.result.requests += 1
+        try:
+            outcome = await self.guild.bulk_ban(batch, reason=self.reason, delete_message_seconds=self.delete_message_seconds)
+        except discord.Forbidden as e:
+            self.result.fail(f"forbidden: {e.text or e}", len(batch))
+            return
+        except discord.HTTPException as e:
+            logger.error(f"[MassAction] Bulk ban of {len(batch)} users in guild {self.guild.id} failed: {e}")
+            self.result.fail(e.text or str(e), len(batch))
+            return
+        self.result.done.extend(user.id for user in outcome.banned)
+        if outcome.failed:
+            self.result.fail("rejected by Discord", len(outcome.failed))
+
+    async def _act(self, target):
+        async with self._slots:
+            self.result.requests += 1
+            try:
+                if self.kind == "ban":
+                    await self.guild.ban(target, reason=self.reason, delete_message_seconds=self.delete_message_seconds)
+                elif self.kind == "kick":
+                    await self.guild.kick(target, reason=self.reason)
+                else:
+                    await target.edit(timed_out_until=self.until, reason=self.reason)
+            except discord.NotFound:
+                self.result.fail("no longer in the server")
+                return
+            except discord.Forbidden:
+                self.result.fail("missing permissions")
+                return
+            except discord.HTTPException as e:
+                logger.error(f"[MassAction] Could not {self.kind} {target.id} in guild {self.guild.id}: {e}")
+                self.result.fail(e.text or str(e))
+                return
+        self.result.done.append(target.id)
@@ -0,0 +1,148 @@
+# utils/messages.py
+import os
+import sys
+from collections import OrderedDict, deque
+from datetime import datetime
+
+import discord
+
+DEFAULT_CAPACITY = int(os.getenv("MESSAGE_LOG_CAPACITY", 100))  # Messages remembered per channel
+MEMORY_BUDGET = int(float(os.getenv("MESSAGE_LOG_BUDGET_MB", 64)) * 1024 * 1024)
+MAX_CONTENT = 500  # Characters kept per message
+MAX_ATTACHMENTS = 4
+
+
+class MessageRecord:
+    """The part of a message worth logging once it is edited or deleted.
+
+    The timestamp isn't stored; it is part of the snowflake ``id``.
+    """
+    __slots__ = ("id", "channel_id", "guild_id", "author_id", "content", "attachments", "size")
+
+    # The record, its id and its entries in the index and the channel ring. Channel, guild and
+    # author ids are shared with discord.py's own objects.
+    OVERHEAD = 72 + 32 + 104 + 8
+
+    def __init__(self, message_id: int, channel_id: int, guild_id: int, author_id: int, content: str, attachments: tuple[str, ...] = ()):
+        self.id = message_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.content = content[:MAX_CONTENT]
+        self.attachments = attachments[:MAX_ATTACHMENTS]
+        self.size = self._measure()
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> "MessageRecord":
+        return cls(message.id, message.channel.id, message.guild.id if message.guild else 0, message.author.id,
+                   message.content, tuple(attachment.url for attachment in message.attachments))
+
+    @property
+    def created_at(self) -> datetime:
+        return discord.utils.snowflake_time(self.id)
+
+    def _measure(self) -> int:
+        size = self.OVERHEAD + sys.getsizeof(self.content)
+        if self.attachments:
+            size += sys.getsizeof(self.attachments) + sum(sys.getsizeof(url) for url in self.attachments)
+        return size
+
+
+class RecentMessages:
+    """Compact per-channel ring buffers of recent messages, with one memory budget for all of them.
+
+    Each channel keeps its newest ``capacity`` messages (configurable per
+    guild; 0 turns recording off). When the total estimated size exceeds
+    ``budget`` the oldest record anywhere is evicted. Lookups, edits and
+    deletes by message id are O(1) through a single index; a deleted record
+    leaves a dead slot in its ring until it rotates out.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, budget: int = MEMORY_BUDGET):
+        self.capacity = capacity
+        self.budget = budget
+        self.size = 0
+        self._capacities: dict[int, int] = {}
+        self._records: OrderedDict[int, MessageRecord] = OrderedDict()  # Oldest first
+        self._channels: dict[int, deque[MessageRecord]] = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, message_id: int):
+        return message_id in self._records
+
+    def capacity_for(self, guild_id: int) -> int:
+        return self._capacities.get(guild_id, self.capacity)
+
+    def set_capacity(self, guild_id: int, capacity: int | None):
+        """Overrides one guild's per-channel capacity; None restores the default."""
+        if capacity is None:
+            self._capacities.pop(guild_id, None)
+        else:
+            self._capacities[guild_id] = capacity
+        if capacity == 0:
+            self.forget_guild(guild_id)
+
+    def add(self, message: discord.Message) -> MessageRecord | None:
+        guild_id = message.guild.id if message.guild else 0
+        capacity = self.capacity_for(guild_id)
+        if capacity <= 0:
+            return None
+        record = MessageRecord.from_message(message)
+        ring = self._channels.get(record.channel_id)
+        if ring is None:
+            ring = self._channels[record.channel_id] = deque()
+        while len(ring) >= capacity:
+            self._discard(ring.popleft())
+        ring.append(record)
+        self._records[record.id] = record
+        self.size += record.size
+
+        while self.size > self.budget and self._records:
+            self._evict_oldest()
+        return record
+
+    def get(self, message_id: int) -> MessageRecord | None:
+        return self._records.get(message_id)
+
+    def pop(self, message_id: int) -> MessageRecord | None:
+        """Removes and returns a deleted message's record."""
+        record = self._records.pop(message_id, None)
+        if record is not None:
+            self.size -= record.size
+        return record
+
+    def edit(self, message_id: int, content: str) -> str | None:
+        """Stores a message's new content; returns the previous content, or None if it's unknown or unchanged."""
+        record = self._records.get(message_id)
+        if record is None or record.content == content[:MAX_CONTENT]:
+            return None
+        before = record.content
+        self.size -= record.size
+        record.content = content[:MAX_CONTENT]
+        record.size = record._measure()
+        self.size += record.size
+        return before
+
+    def forget_channel(self, channel_id: int):
+        for record in self._channels.pop(channel_id, ()):
+            self._discard(record)
+
+    def forget_guild(self, guild_id: int):
+        for channel_id in [channel_id for channel_id, ring in self._channels.items() if ring and ring[-1].guild_id == guild_id]:
+            self.forget_channel(channel_id)
+
+    def _discard(self, record: MessageRecord):
+        if self._records.get(record.id) is record:
+            del self._records[record.id]
+            self.size -= record.size
+
+    def _evict_oldest(self):
+        _, record = self._records.popitem(last=False)
+        self.size -= record.size
+        # The oldest live record is also the oldest live one in its ring; anything before it is dead.
+        ring = self._channels[record.channel_id]
+        while ring and ring.popleft() is not record:
+            pass
+        if not ring:
+            del self._channels[record.channel_id]
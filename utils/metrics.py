@@ -0,0 +1,175 @@
+# utils/metrics.py
+import asyncio
+import bisect
+import math
+import re
+import time
+from collections import Counter, deque
+
+import aiohttp
+import discord
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SAMPLE_INTERVAL = 1.0
+RECENT_SAMPLES = 1024
+
+_SNOWFLAKE = re.compile(r"/\d{15,25}")
+_TOKEN = re.compile(r"/[A-Za-z0-9_\-.]{50,}")
+DEFERRED = (discord.InteractionResponseType.deferred_channel_message, discord.InteractionResponseType.deferred_message_update)
+
+
+def route_of(path: str) -> str:
+    """Collapses ids and interaction/webhook tokens so routes stay low-cardinality."""
+    return _TOKEN.sub("/:token", _SNOWFLAKE.sub("/:id", path))
+
+
+def percentile(samples, q: float):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)]
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + inner + "}" if inner else ""
+
+
+class Metrics:
+    """In-process counters and histograms for commands, REST calls, the gateway and the event loop."""
+    def __init__(self):
+        self.command_latency: dict[str, Histogram] = {}
+        self.command_errors: Counter[tuple[str, str]] = Counter()
+        self.command_deferred: Counter[str] = Counter()
+        self.rest_requests: Counter[tuple[str, str, int]] = Counter()
+        self.rest_rate_limited: Counter[str] = Counter()
+        self.gateway_latency: dict[int, float] = {}
+        self.loop_lag = Histogram(LAG_BUCKETS)
+        self.recent_latency: deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self.recent_heartbeat: deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self._task: asyncio.Task = None
+
+    # Commands
+
+    @staticmethod
+    def command_started(interaction: discord.Interaction):
+        interaction.extras["started"] = time.perf_counter()
+
+    def _observe(self, interaction: discord.Interaction, name: str) -> float | None:
+        started = interaction.extras.get("started")
+        if started is None:
+            return None
+        elapsed = time.perf_counter() - started
+        histogram = self.command_latency.get(name)
+        if histogram is None:
+            histogram = self.command_latency[name] = Histogram()
+        histogram.observe(elapsed)
+        self.recent_latency.append(elapsed)
+        if interaction.response.type in DEFERRED:
+            self.command_deferred[name] += 1
+        return elapsed
+
+    def command_completed(self, interaction: discord.Interaction, command) -> float | None:
+        """Records a successful command and returns its handler latency in seconds."""
+        return self._observe(interaction, command.qualified_name)
+
+    def command_failed(self, interaction: discord.Interaction, error: Exception):
+        name = interaction.command.qualified_name if interaction.command else "unknown"
+        original = getattr(error, "original", error)
+        self.command_errors[(name, type(original).__name__)] += 1
+        self._observe(interaction, name)
+
+    # REST
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Returns a trace config that counts discord.py's REST requests and 429s."""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_end(session, context, params: aiohttp.TraceRequestEndParams):
+            route = route_of(params.url.path)
+            self.rest_requests[(params.method, route, params.response.status)] += 1
+            if params.response.status == 429:
+                self.rest_rate_limited[route] += 1
+
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    # Gateway and event loop
+
+    def start(self, bot):
+        self._task = asyncio.create_task(self._sample(bot), name="metrics-sampler")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self, bot):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            self.loop_lag.observe(max(0.0, time.perf_counter() - started - SAMPLE_INTERVAL))
+            for shard_id, latency in bot.latencies:
+                if math.isfinite(latency):
+                    self.gateway_latency[shard_id] = latency
+                    self.recent_heartbeat.append(latency)
+
+    # Exposition
+
+    def render(self) -> str:
+        """Renders everything in the Prometheus text format."""
+        lines = []
+
+        def histogram(name: str, help_text: str, series: dict):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series.items():
+                label_dict = dict(labels)
+                cumulative = 0
+                for bound, count in zip(hist.bounds + (math.inf,), hist.counts):
+                    cumulative += count
+                    le = "+Inf" if math.isinf(bound) else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(**label_dict, le=le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(**label_dict)} {hist.sum}")
+                lines.append(f"{name}_count{_labels(**label_dict)} {hist.count}")
+
+        def simple(name: str, kind: str, help_text: str, series: dict):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series.items():
+                lines.append(f"{name}{_labels(**dict(labels))} {value}")
+
+        histogram("onwhisper_command_latency_seconds", "App command handler latency.",
+                  {(("command", name),): hist for name, hist in self.command_latency.items()})
+        simple("onwhisper_command_errors_total", "counter", "App command errors by type.",
+               {(("command", c), ("error", e)): n for (c, e), n in self.command_errors.items()})
+        simple("onwhisper_command_deferred_total", "counter", "App commands answered with a deferral.",
+               {(("command", c),): n for c, n in self.command_deferred.items()})
+        simple("onwhisper_rest_requests_total", "counter", "Discord REST requests by route and status.",
+               {(("method", m), ("route", r), ("status", s)): n for (m, r, s), n in self.rest_requests.items()})
+        simple("onwhisper_rest_rate_limited_total", "counter", "Discord REST responses with status 429.",
+               {(("route", r),): n for r, n in self.rest_rate_limited.items()})
+        simple("onwhisper_gateway_latency_seconds", "gauge", "Last heartbeat latency per shard.",
+               {(("shard", s),): v for s, v in self.gateway_latency.items()})
+        histogram("onwhisper_event_loop_lag_seconds", "Event loop scheduling delay.", {(): self.loop_lag})
+        return "\n".join(lines) + "\n"
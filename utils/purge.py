@@ -0,0 +1,160 @@
+# utils/purge.py
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Callable
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+BULK_DELETE_LIMIT = 100
+BULK_DELETE_MAX_AGE = timedelta(days=14, minutes=-1)  # Small margin for clock skew.
+OLD_DELETE_DELAY = 1.0  # Pacing for single deletes of messages too old for bulk delete.
+SCAN_LIMIT = 5000  # History messages examined per channel at most.
+PROGRESS_INTERVAL = 2.0
+
+# Shared by every multi-channel purge so they can't flood the API together.
+channel_slots = asyncio.Semaphore(3)
+
+
+class PurgeJob:
+    """Streams one channel's history through a filter and deletes the matches.
+
+    Messages younger than 14 days are removed with bulk deletes of up to 100;
+    older ones fall back to paced single deletes. ``cancel()`` stops the job
+    after the request in flight.
+    """
+    def __init__(self, channel: discord.abc.Messageable, limit: int,
+                 check: Callable[[discord.Message], bool] = None, after: discord.abc.Snowflake = None,
+                 on_progress: Callable[[], None] = None):
+        self.channel = channel
+        self.limit = limit
+        self.check = check
+        self.after = after
+        self.on_progress = on_progress
+        self.scanned = 0
+        self.deleted = 0
+        self.cancelled = False
+        self.error: Exception = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _progress(self):
+        if self.on_progress is not None:
+            self.on_progress()
+
+    async def _bulk_delete(self, batch: list[discord.Message]):
+        try:
+            await self.channel.delete_messages(batch)
+        except discord.NotFound:
+            # One of them is already gone; fall back so the rest still goes.
+            for message in batch:
+                try:
+                    await message.delete()
+                except discord.NotFound:
+                    continue
+                self.deleted += 1
+            self._progress()
+            return
+        self.deleted += len(batch)
+        self._progress()
+
+    async def run(self) -> int:
+        """Runs the purge and returns the number of deleted messages."""
+        cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        batch, old = [], []
+        matched = 0
+        try:
+            async for message in self.channel.history(limit=SCAN_LIMIT, after=self.after, oldest_first=False):
+                if self.cancelled:
+                    break
+                self.scanned += 1
+                if self.check is not None and not self.check(message):
+                    continue
+                if matched >= self.limit:
+                    break  # Also covers a limit below 1, which deletes nothing.
+
+                matched += 1
+                if message.created_at > cutoff:
+                    batch.append(message)
+                    if len(batch) == BULK_DELETE_LIMIT:
+                        await self._bulk_delete(batch)
+                        batch = []
+                else:
+                    old.append(message)
+                if matched >= self.limit:
+                    break
+
+            if batch and not self.cancelled:
+                await self._bulk_delete(batch)
+
+            for message in old:
+                if self.cancelled:
+                    break
+                try:
+                    await message.delete()
+                    self.deleted += 1
+                    self._progress()
+                except discord.NotFound:
+                    pass
+                await asyncio.sleep(OLD_DELETE_DELAY)
+        except discord.HTTPException as e:
+            self.error = e
+            logger.error(f"[PurgeJob] Purge in #{getattr(self.channel, 'name', self.channel.id)} stopped: {e}")
+        return self.deleted
+
+
+class PurgeRun:
+    """Runs one or more purge jobs with throttled progress reports."""
+    def __init__(self, report: Callable[["PurgeRun", bool], "asyncio.Future"] = None):
+        self.report = report
+        self.jobs: list[PurgeJob] = []
+        self._last_report = 0.0
+        self._report_task: asyncio.Task = None
+
+    @property
+    def deleted(self) -> int:
+        return sum(job.deleted for job in self.jobs)
+
+    @property
+    def scanned(self) -> int:
+        return sum(job.scanned for job in self.jobs)
+
+    @property
+    def cancelled(self) -> bool:
+        return any(job.cancelled for job in self.jobs)
+
+    def add(self, channel, limit: int, check=None, after=None) -> PurgeJob:
+        job = PurgeJob(channel, limit, check=check, after=after, on_progress=self._progress)
+        self.jobs.append(job)
+        return job
+
+    def cancel(self):
+        for job in self.jobs:
+            job.cancel()
+
+    def _progress(self):
+        now = time.monotonic()
+        if self.report is None or now - self._last_report < PROGRESS_INTERVAL:
+            return
+        if self._report_task is not None and not self._report_task.done():
+            return
+        self._last_report = now
+        self._report_task = asyncio.create_task(self.report(self, False))
+
+    async def _run_limited(self, job: PurgeJob):
+        async with channel_slots:
+            await job.run()
+
+    async def run(self):
+        if len(self.jobs) == 1:
+            await self.jobs[0].run()
+        else:
+            await asyncio.gather(*(self._run_limited(job) for job in self.jobs))
+        if self._report_task is not None:
+            await self._report_task  # Don't let a late progress edit overwrite the result.
+        if self.report is not None:
+            await self.report(self, True)
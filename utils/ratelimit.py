@@ -0,0 +1,88 @@
+# utils/ratelimit.py
+import time
+from collections import OrderedDict
+
+import discord
+from discord import app_commands
+
+SCOPES = ("user", "channel", "guild")
+SWEEP_PER_CHECK = 2  # Idle buckets dropped per check; enough to outpace the rate new keys arrive.
+
+
+class RateLimited(app_commands.CheckFailure):
+    """Raised by ``rate_limit`` checks; the tree error handler turns it into an ephemeral reply."""
+    def __init__(self, scope: str, retry_after: float):
+        self.scope = scope
+        self.retry_after = retry_after
+        super().__init__(f"Rate limited per {scope}, retry in {retry_after:.1f}s")
+
+
+class RateLimiter:
+    """Token bucket kept in GCRA form: one float (the theoretical arrival time) per key.
+
+    Allows ``rate`` calls per ``per`` seconds with bursts of up to ``rate``.
+    Keys are kept in least-recently-used order, so idle buckets sit at the
+    front and every check pops a couple of them once they have fully
+    refilled. Checks are O(1) and memory tracks the keys active within the
+    last ``per`` seconds without any background task.
+    """
+    def __init__(self, rate: int, per: float, clock=time.monotonic):
+        self.interval = per / rate
+        self.tolerance = per - self.interval
+        self.clock = clock
+        self._tat: OrderedDict[int, float] = OrderedDict()
+
+    def hit(self, key: int) -> float:
+        """Spends one token for ``key``; returns 0 if allowed, otherwise seconds until it would be."""
+        now = self.clock()
+        tat = self._tat.get(key)
+        if tat is None or tat < now:
+            tat = now
+        retry_after = tat - self.tolerance - now
+        if retry_after > 1e-9:  # Slack for float error, so a full burst of ``rate`` always fits.
+            return retry_after
+        self._tat[key] = tat + self.interval
+        self._tat.move_to_end(key)
+        self.sweep(now, SWEEP_PER_CHECK)
+        return 0.0
+
+    def sweep(self, now: float = None, limit: int = None) -> int:
+        """Drops buckets that have fully refilled, oldest first; returns how many went."""
+        now = self.clock() if now is None else now
+        removed = 0
+        while self._tat and (limit is None or removed < limit):
+            key, tat = next(iter(self._tat.items()))
+            if tat > now:
+                break
+            del self._tat[key]
+            removed += 1
+        return removed
+
+    def __len__(self):
+        return len(self._tat)
+
+
+def scope_key(interaction: discord.Interaction, scope: str) -> int:
+    if scope == "channel":
+        return interaction.channel_id
+    if scope == "guild":
+        return interaction.guild_id or interaction.user.id  # DMs count against the user.
+    return interaction.user.id
+
+
+def rate_limit(rate: int, per: float, scope: str = "user"):
+    """App command check allowing ``rate`` uses per ``per`` seconds per user, channel or guild.
+
+    Stack it to limit a command on several scopes at once.
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {SCOPES}, not {scope!r}")
+    limiter = RateLimiter(rate, per)
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        retry_after = limiter.hit(scope_key(interaction, scope))
+        if retry_after:
+            raise RateLimited(scope, retry_after)
+        return True
+
+    return app_commands.check(predicate)
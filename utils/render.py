@@ -0,0 +1,65 @@
+# utils/render.py
+import discord
+from discord import app_commands
+
+# Cog name -> (title, emoji). Cogs missing here get a generic entry, hidden ones are left out.
+CATEGORIES = {
+    "Whisper": ("Whisper Commands", "🤖"),
+    "Info": ("Info Commands", "ℹ️"),
+    "Fun": ("Fun Commands", "🎉"),
+    "Moderation": ("Moderation Commands", "🛡️"),
+    "Logs": ("Audit Log", "📜"),
+    "Settings": ("Server Settings", "⚙️"),
+    "Help": ("Help", "❓"),
+}
+HIDDEN_CATEGORIES = {"Owner"}
+COMMANDS_PER_PAGE = 12
+HELP_COLOR = discord.Color.gold()
+
+
+def command_categories(tree: app_commands.CommandTree) -> dict[str, list[app_commands.Command]]:
+    """Groups every slash command in the tree by the cog that defines it, in display order."""
+    grouped: dict[str, list[app_commands.Command]] = {}
+    for command in tree.walk_commands():
+        if not isinstance(command, app_commands.Command):
+            continue
+        cog = getattr(command.binding, "qualified_name", None) or "Other"
+        if cog in HIDDEN_CATEGORIES:
+            continue
+        grouped.setdefault(cog, []).append(command)
+
+    order = list(CATEGORIES)
+    ordered = sorted(grouped, key=lambda cog: (order.index(cog) if cog in order else len(order), cog))
+    return {cog: sorted(grouped[cog], key=lambda c: c.qualified_name) for cog in ordered}
+
+
+def help_pages(tree: app_commands.CommandTree) -> list[tuple[str, discord.Embed]]:
+    """Renders the help menu as (category label, embed) pages.
+
+    The first page is an overview; each category follows, split over several
+    pages if it has more than ``COMMANDS_PER_PAGE`` commands.
+    """
+    categories = command_categories(tree)
+    overview = discord.Embed(
+        title="🗯 onWhisper Command Guide 🗯",
+        description="Pick a category below to see its commands.",
+        color=HELP_COLOR,
+    )
+    pages = [("Overview", overview)]
+
+    for cog, commands in categories.items():
+        title, emoji = CATEGORIES.get(cog, (f"{cog} Commands", "📁"))
+        overview.add_field(name=f"{emoji} {title}", value=f"{len(commands)} commands", inline=True)
+        chunks = [commands[i:i + COMMANDS_PER_PAGE] for i in range(0, len(commands), COMMANDS_PER_PAGE)]
+        for number, chunk in enumerate(chunks, start=1):
+            suffix = f" ({number}/{len(chunks)})" if len(chunks) > 1 else ""
+            embed = discord.Embed(
+                title=f"{emoji} {title}{suffix}",
+                description="\n".join(f"• **/{c.qualified_name}** - {c.description}" for c in chunk),
+                color=HELP_COLOR,
+            )
+            pages.append((f"{title}{suffix}", embed))
+
+    for index, (_, embed) in enumerate(pages, start=1):
+        embed.set_footer(text=f"Page {index}/{len(pages)} · Use these commands to enhance your onWhisper experience!")
+    return pages
@@ -0,0 +1,64 @@
+# utils/roles.py
+import discord
+
+
+class RoleIndex:
+    """Per-guild role lookup by name, kept current from the role events.
+
+    Lookups by id go straight to ``guild.get_role``; lookups by name use an
+    index built once per guild instead of scanning ``guild.roles`` each time.
+    Names are matched case-insensitively and, like ``discord.utils.get``,
+    the lowest role wins when several share a name.
+    """
+    def __init__(self):
+        self._names: dict[int, dict[str, list[int]]] = {}
+
+    def build(self, guild: discord.Guild):
+        names: dict[str, list[int]] = {}
+        for role in guild.roles:  # Sorted bottom to top.
+            names.setdefault(role.name.lower(), []).append(role.id)
+        self._names[guild.id] = names
+
+    def forget(self, guild_id: int):
+        self._names.pop(guild_id, None)
+
+    def get(self, guild: discord.Guild, name: str = None, role_id: int = None) -> discord.Role | None:
+        """Returns the configured role if it still exists, otherwise the role called ``name``."""
+        if role_id:
+            role = guild.get_role(role_id)
+            if role is not None:
+                return role
+        if name is None:
+            return None
+        if guild.id not in self._names:
+            self.build(guild)
+        ids = self._names[guild.id].get(name.lower())
+        return guild.get_role(ids[0]) if ids else None
+
+    def add(self, role: discord.Role):
+        names = self._names.get(role.guild.id)
+        if names is None:
+            return  # Built lazily on first lookup.
+        ids = names.setdefault(role.name.lower(), [])
+        ids.append(role.id)
+        ids.sort(key=lambda rid: self._position(role.guild, rid))
+
+    def remove(self, role: discord.Role):
+        names = self._names.get(role.guild.id)
+        if names is None:
+            return
+        ids = names.get(role.name.lower())
+        if ids and role.id in ids:
+            ids.remove(role.id)
+            if not ids:
+                del names[role.name.lower()]
+
+    def update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            self.remove(before)
+            self.add(after)
+
+    @staticmethod
+    def _position(guild: discord.Guild, role_id: int):
+        role = guild.get_role(role_id)
+        return (role.position, role.id) if role else (0, role_id)
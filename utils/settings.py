@@ -0,0 +1,175 @@
+# utils/settings.py
+import asyncio
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id INTEGER PRIMARY KEY,
+    prefix TEXT,
+    whisper_min_seconds INTEGER,
+    whisper_max_seconds INTEGER,
+    whisper_max_length INTEGER,
+    mute_role_id INTEGER,
+    whisper_reveal INTEGER
+);
+"""
+# Columns added after the table first shipped: (name, type).
+MIGRATIONS = [("whisper_reveal", "INTEGER")]
+
+# Hard limits the per-guild values must stay within.
+MAX_PREFIX_LENGTH = 5
+WHISPER_SECONDS_LIMIT = 86_400
+MESSAGE_LIMIT = 2000  # Discord's cap for a message's content
+WHISPER_PREFIX = "💬 **Secret Message:** "  # Put in front of a whisper shown in a channel or revealed
+# Counted in UTF-16 units, like Discord does, so the emoji takes two.
+WHISPER_LENGTH_LIMIT = MESSAGE_LIMIT - len(WHISPER_PREFIX.encode("utf-16-le")) // 2
+
+
+class GuildSettings:
+    """One guild's settings. A column left NULL in the database means the default below."""
+    __slots__ = ("prefix", "whisper_min_seconds", "whisper_max_seconds", "whisper_max_length", "mute_role_id", "whisper_reveal")
+
+    FIELDS = __slots__
+    DEFAULTS = {
+        "prefix": "!",
+        "whisper_min_seconds": 1,
+        "whisper_max_seconds": 3600,
+        "whisper_max_length": 200,
+        "mute_role_id": None,
+        "whisper_reveal": False,  # Opt-in: post a placeholder and show the text only to the people it mentions.
+    }
+
+    def __init__(self, **values):
+        for field in self.FIELDS:
+            value = values.get(field)
+            setattr(self, field, self.DEFAULTS[field] if value is None else value)
+
+    @classmethod
+    def from_row(cls, row) -> "GuildSettings":
+        settings = cls(**dict(zip(cls.FIELDS, row)))
+        settings.whisper_reveal = bool(settings.whisper_reveal)
+        return settings
+
+    def changed(self) -> dict:
+        """Returns the values that differ from the defaults."""
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) != self.DEFAULTS[field]}
+
+
+DEFAULT_SETTINGS = GuildSettings()  # Shared by every guild that never changed anything; treat as read-only.
+
+
+def validate(settings: GuildSettings):
+    """Raises ValueError with a message fit to show the user if the settings can't work together."""
+    if not settings.prefix or len(settings.prefix) > MAX_PREFIX_LENGTH or any(c.isspace() for c in settings.prefix):
+        raise ValueError(f"The prefix must be 1-{MAX_PREFIX_LENGTH} characters without spaces.")
+    if not 1 <= settings.whisper_min_seconds <= settings.whisper_max_seconds <= WHISPER_SECONDS_LIMIT:
+        raise ValueError(f"Whisper durations need 1 ≤ minimum ≤ maximum ≤ {WHISPER_SECONDS_LIMIT}.")
+    if not 1 <= settings.whisper_max_length <= WHISPER_LENGTH_LIMIT:
+        raise ValueError(f"The whisper length must be between 1 and {WHISPER_LENGTH_LIMIT}.")
+
+
+class SettingsStore:
+    """Per-guild settings read through an LRU cache in front of SQLite.
+
+    Hot paths call ``get`` (or ``peek`` where they can't await) and only
+    touch the database on a miss; concurrent misses for one guild share a
+    single query. Guilds without a row cache the shared defaults, so never
+    configured guilds cost one dict entry. Writes go to the database first
+    and then replace the cached entry.
+    """
+    CACHE_SIZE = 20_000
+
+    def __init__(self, db, cache_size: int = CACHE_SIZE):
+        self.db = db
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, GuildSettings] = OrderedDict()
+        self._loading: dict[int, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def start(self):
+        await self.db.executescript(SETTINGS_SCHEMA)
+        columns = {row[1] for row in await self.db.fetchall("PRAGMA table_info(guild_settings)")}
+        for name, kind in MIGRATIONS:
+            if name not in columns:
+                await self.db.execute(f"ALTER TABLE guild_settings ADD COLUMN {name} {kind}")
+
+    def __len__(self):
+        return len(self._cache)
+
+    def peek(self, guild_id: int) -> GuildSettings | None:
+        """Returns the cached settings without loading them."""
+        settings = self._cache.get(guild_id)
+        if settings is not None:
+            self._cache.move_to_end(guild_id)
+        return settings
+
+    async def get(self, guild_id: int | None) -> GuildSettings:
+        if guild_id is None:
+            return DEFAULT_SETTINGS
+        settings = self.peek(guild_id)
+        if settings is not None:
+            self.hits += 1
+            return settings
+        self.misses += 1
+        task = self._loading.get(guild_id)
+        if task is None:
+            task = self._loading[guild_id] = asyncio.create_task(self._load(guild_id))
+        return await asyncio.shield(task)
+
+    async def _load(self, guild_id: int) -> GuildSettings:
+        try:
+            row = await self.db.fetchone(f"SELECT {', '.join(GuildSettings.FIELDS)} FROM guild_settings WHERE guild_id = ?", (guild_id,))
+        finally:
+            current = self._loading.get(guild_id) is asyncio.current_task()
+            if current:
+                del self._loading[guild_id]
+        settings = GuildSettings.from_row(row) if row else DEFAULT_SETTINGS
+        if current:  # Not invalidated by a write while loading.
+            self._remember(guild_id, settings)
+        return settings
+
+    def _remember(self, guild_id: int, settings: GuildSettings):
+        self._cache[guild_id] = settings
+        self._cache.move_to_end(guild_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, guild_id: int):
+        self._cache.pop(guild_id, None)
+        self._loading.pop(guild_id, None)
+
+    async def update(self, guild_id: int, **changes) -> GuildSettings:
+        """Applies ``changes`` (None restores a default) and returns the new settings; raises ValueError if invalid."""
+        unknown = set(changes) - set(GuildSettings.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown setting(s): {', '.join(sorted(unknown))}")
+        current = await self.get(guild_id)
+        values = {field: getattr(current, field) for field in GuildSettings.FIELDS}
+        values.update(changes)
+        settings = GuildSettings(**values)
+        validate(settings)
+
+        stored = {field: (value if value != GuildSettings.DEFAULTS[field] else None) for field, value in values.items()}
+        if not any(value is not None for value in stored.values()):
+            return await self.reset(guild_id)
+        columns = ", ".join(GuildSettings.FIELDS)
+        await self.db.execute(f"INSERT OR REPLACE INTO guild_settings (guild_id, {columns}) VALUES (?, {', '.join('?' * len(GuildSettings.FIELDS))})",
+                              (guild_id, *(stored[field] for field in GuildSettings.FIELDS)))
+        self.invalidate(guild_id)
+        self._remember(guild_id, settings)
+        logger.info(f"[SettingsStore] Guild {guild_id} settings changed: {', '.join(sorted(changes))}")
+        return settings
+
+    async def reset(self, guild_id: int) -> GuildSettings:
+        await self.db.execute("DELETE FROM guild_settings WHERE guild_id = ?", (guild_id,))
+        self.invalidate(guild_id)
+        self._remember(guild_id, DEFAULT_SETTINGS)
+        return DEFAULT_SETTINGS
+
+    def forget(self, guild_id: int):
+        """Drops a guild from the cache (e.g. the bot left it); its row stays for if it comes back."""
+        self.invalidate(guild_id)
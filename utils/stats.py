@@ -0,0 +1,189 @@
+# utils/stats.py
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from datetime import timedelta
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 3600  # Join/leave history resolution
+HISTORY_BUCKETS = 7 * 24  # One week of hourly buckets
+
+
+def _hour(when: float) -> int:
+    return int(when // BUCKET_SECONDS)
+
+
+class GuildStats:
+    """Member and channel counters for one guild, kept current from gateway events.
+
+    Joins and leaves are counted in hourly buckets covering the last week;
+    joins are seeded from ``joined_at`` when the counters are first built,
+    leaves only exist from then on.
+    """
+    __slots__ = ("humans", "bots", "online", "roles", "channels", "history", "since")
+
+    def __init__(self):
+        self.humans = 0
+        self.bots = 0
+        self.online = 0
+        self.roles: Counter[int] = Counter()
+        self.channels: Counter[str] = Counter()
+        self.history: deque[list[int]] = deque(maxlen=HISTORY_BUCKETS)  # [hour, joins, leaves], oldest first
+        self.since = time.time()
+
+    @property
+    def members(self) -> int:
+        return self.humans + self.bots
+
+    def count(self, member: discord.Member, sign: int):
+        if member.bot:
+            self.bots += sign
+        else:
+            self.humans += sign
+        if member.status is not discord.Status.offline:
+            self.online += sign
+        for role_id in member._roles:
+            self.roles[role_id] += sign
+
+    def _bucket(self, now: float) -> list[int]:
+        hour = _hour(now)
+        if self.history and self.history[-1][0] >= hour:
+            return self.history[-1]
+        bucket = [hour, 0, 0]
+        self.history.append(bucket)
+        return bucket
+
+    def joined(self, now: float):
+        self._bucket(now)[1] += 1
+
+    def left(self, now: float):
+        self._bucket(now)[2] += 1
+
+    def window(self, seconds: float, now: float = None) -> tuple[int, int]:
+        """Returns (joins, leaves) in the last ``seconds``, at hourly resolution."""
+        oldest = _hour((now or time.time()) - seconds)
+        joins = leaves = 0
+        for hour, j, l in reversed(self.history):
+            if hour <= oldest:
+                break
+            joins += j
+            leaves += l
+        return joins, leaves
+
+
+class StatsTracker:
+    """Per-guild statistics maintained incrementally, so reading them never scans the member list.
+
+    A guild's counters are built with one full scan the first time they are
+    asked for (once its members are chunked) and are then updated from
+    member, presence, role and channel events. ``reconcile`` rescans built
+    guilds periodically to correct drift from missed events.
+    """
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        self.guilds: dict[int, GuildStats] = {}
+
+    @property
+    def tracks_members(self) -> bool:
+        return self.bot.intents.members
+
+    @property
+    def tracks_presence(self) -> bool:
+        return self.bot.intents.presences and self.bot.intents.members
+
+    def get(self, guild: discord.Guild) -> GuildStats | None:
+        """Returns the guild's counters, building them on first use; None until its members are loaded."""
+        stats = self.guilds.get(guild.id)
+        if stats is None:
+            if not self.tracks_members or not guild.chunked:
+                return None
+            stats = self.guilds[guild.id] = self._build(guild)
+            self._seed_joins(guild, stats)
+        return stats
+
+    def forget(self, guild_id: int):
+        self.guilds.pop(guild_id, None)
+
+    @staticmethod
+    def _build(guild: discord.Guild, stats: GuildStats = None) -> GuildStats:
+        fresh = GuildStats()
+        for member in guild.members:
+            fresh.count(member, 1)
+        fresh.channels.update(str(channel.type) for channel in guild.channels)
+        if stats is not None:
+            fresh.history, fresh.since = stats.history, stats.since
+        return fresh
+
+    @staticmethod
+    def _seed_joins(guild: discord.Guild, stats: GuildStats):
+        cutoff = discord.utils.utcnow() - timedelta(seconds=HISTORY_BUCKETS * BUCKET_SECONDS)
+        for joined_at in sorted(m.joined_at for m in guild.members if m.joined_at is not None and m.joined_at > cutoff):
+            stats.joined(joined_at.timestamp())
+
+    async def reconcile(self):
+        """Rebuilds every tracked guild's counters from the cache, one guild per event loop turn."""
+        drifted = 0
+        for guild_id in list(self.guilds):
+            guild = self.bot.get_guild(guild_id)
+            stats = self.guilds.get(guild_id)
+            if guild is None or stats is None:
+                self.guilds.pop(guild_id, None)
+                continue
+            fresh = self._build(guild, stats)
+            if (fresh.humans, fresh.bots, fresh.online) != (stats.humans, stats.bots, stats.online) \
+                    or +fresh.roles != +stats.roles or +fresh.channels != +stats.channels:
+                drifted += 1
+            self.guilds[guild_id] = fresh
+            await asyncio.sleep(0)
+        if drifted:
+            logger.info(f"[StatsTracker] Corrected drift in {drifted} of {len(self.guilds)} guilds")
+
+    # Event hooks; each is O(1) or O(roles of one member).
+
+    def member_join(self, member: discord.Member):
+        stats = self.guilds.get(member.guild.id)
+        if stats is not None:
+            stats.count(member, 1)
+            stats.joined(time.time())
+
+    def member_remove(self, member: discord.Member):
+        stats = self.guilds.get(member.guild.id)
+        if stats is not None:
+            stats.count(member, -1)
+            stats.left(time.time())
+
+    def member_update(self, before: discord.Member, after: discord.Member):
+        stats = self.guilds.get(after.guild.id)
+        if stats is None:
+            return
+        old, new = set(before._roles), set(after._roles)
+        for role_id in old - new:
+            stats.roles[role_id] -= 1
+        for role_id in new - old:
+            stats.roles[role_id] += 1
+
+    def presence_update(self, before: discord.Member, after: discord.Member):
+        stats = self.guilds.get(after.guild.id)
+        if stats is None:
+            return
+        was, now = before.status is not discord.Status.offline, after.status is not discord.Status.offline
+        if was != now:
+            stats.online += 1 if now else -1
+
+    def role_delete(self, role: discord.Role):
+        stats = self.guilds.get(role.guild.id)
+        if stats is not None:
+            stats.roles.pop(role.id, None)
+
+    def channel_change(self, guild: discord.Guild, before: str | None, after: str | None):
+        stats = self.guilds.get(guild.id)
+        if stats is None:
+            return
+        if before is not None:
+            stats.channels[before] -= 1
+        if after is not None:
+            stats.channels[after] += 1
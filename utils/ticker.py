@@ -0,0 +1,198 @@
+# utils/ticker.py
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Discord allows roughly 5 message edits per 5 seconds in a channel.
+EDIT_BUDGET = 5
+EDIT_REFILL_PER_SECOND = 1.0
+# ...and 50 requests per second for the whole bot; countdowns get most of that, the rest is left for commands.
+# The burst is kept small so that no one-second window sees more than the refill plus the burst.
+GLOBAL_EDIT_BUDGET = 10
+GLOBAL_EDIT_REFILL_PER_SECOND = 40.0
+
+
+def next_milestone(remaining: int) -> int:
+    """Returns the next remaining-seconds value that gets an edit (every 10 s, then each of the last 5)."""
+    return max(((remaining - 1) // 10) * 10, min(remaining - 1, 5), 0)
+
+
+class Countdown:
+    __slots__ = ("channel_id", "message_id", "mention", "ends_at", "due_at")
+
+    def __init__(self, channel_id: int, message_id: int, mention: str, ends_at: float, due_at: float):
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.mention = mention
+        self.ends_at = ends_at
+        self.due_at = due_at
+
+
+class Edit:
+    __slots__ = ("channel_id", "message_id", "content", "final")
+
+    def __init__(self, channel_id: int, message_id: int, content: str, final: bool):
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.content = content
+        self.final = final
+
+
+class CountdownTicker:
+    """Drives every running countdown from one clock.
+
+    Each tick only looks at countdowns whose next edit is due (heap ordered),
+    spends each channel's edit budget on final edits first, and holds back
+    intermediate edits while the budget is needed for countdowns about to end.
+    A deferred intermediate edit is coalesced into the next one that fits.
+    The same applies bot-wide: intermediate edits never take the global
+    budget below half, so final edits still go out when thousands of
+    countdowns share the bot's request limit.
+    """
+    def __init__(self, bot=None, clock=time.monotonic, global_budget: float = GLOBAL_EDIT_BUDGET,
+                 global_rate: float = GLOBAL_EDIT_REFILL_PER_SECOND):
+        self.bot = bot
+        self.clock = clock
+        self.global_budget = global_budget
+        self.global_rate = global_rate
+        self.countdowns: dict[int, Countdown] = {}
+        self._by_channel: dict[int, set[int]] = defaultdict(set)
+        self._heap: list[tuple[float, int]] = []  # (due_at, message_id)
+        self._buckets: dict[int, list[float]] = {}  # channel_id -> [tokens, updated_at]
+        self._global = [float(global_budget), clock()]
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._sending: set[asyncio.Task] = set()
+
+    def __len__(self):
+        return len(self.countdowns)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name="countdown-ticker")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def add(self, channel_id: int, message_id: int, mention: str, seconds: int):
+        """Registers a countdown whose starting message has already been sent."""
+        now = self.clock()
+        ends_at = now + seconds
+        countdown = Countdown(channel_id, message_id, mention, ends_at, ends_at - next_milestone(seconds))
+        self.countdowns[message_id] = countdown
+        self._by_channel[channel_id].add(message_id)
+        heapq.heappush(self._heap, (countdown.due_at, message_id))
+        self._wakeup.set()
+
+    def _global_tokens(self, now: float) -> float:
+        bucket = self._global
+        bucket[0] = min(self.global_budget, bucket[0] + (now - bucket[1]) * self.global_rate)
+        bucket[1] = now
+        return bucket[0]
+
+    def _take_token(self, channel_id: int, now: float, reserve: int) -> bool:
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._buckets[channel_id] = [float(EDIT_BUDGET), now]
+        bucket[0] = min(EDIT_BUDGET, bucket[0] + (now - bucket[1]) * EDIT_REFILL_PER_SECOND)
+        bucket[1] = now
+        if bucket[0] - reserve < 1:
+            return False
+        bucket[0] -= 1
+        self._global[0] -= 1
+        return True
+
+    def _pending_finals(self, channel_id: int, now: float) -> int:
+        """Counts the channel's countdowns that end (or are overdue) within one budget window."""
+        horizon = now + EDIT_BUDGET / EDIT_REFILL_PER_SECOND
+        return sum(1 for mid in self._by_channel.get(channel_id, ()) if self.countdowns[mid].ends_at <= horizon)
+
+    def tick(self, now: float = None) -> list[Edit]:
+        """Returns the edits to send at ``now`` and reschedules everything else."""
+        if now is None:
+            now = self.clock()
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, message_id = heapq.heappop(self._heap)
+            countdown = self.countdowns.get(message_id)
+            if countdown is None or countdown.due_at != due_at:
+                continue  # Stale heap entry.
+            due.append(countdown)
+
+        # Final edits first across every channel, then the countdowns closest to ending.
+        due.sort(key=lambda c: c.ends_at)
+        edits = []
+        reserves = {}
+        for countdown in due:
+            channel_id = countdown.channel_id
+            remaining = max(0, math.ceil(countdown.ends_at - now - 1e-9))
+            final = remaining == 0
+            if final:
+                allowed = self._global_tokens(now) >= 1 and self._take_token(channel_id, now, 0)
+            else:
+                reserve = reserves.get(channel_id)
+                if reserve is None:
+                    reserve = reserves[channel_id] = self._pending_finals(channel_id, now)
+                allowed = self._global_tokens(now) >= self.global_budget / 2 and self._take_token(channel_id, now, reserve)
+
+            if allowed:
+                if final:
+                    self._remove(countdown)
+                    edits.append(Edit(channel_id, countdown.message_id, f"🎉 {countdown.mention}, countdown has ended!", True))
+                    continue
+                edits.append(Edit(channel_id, countdown.message_id, f"⏳ {countdown.mention}, {remaining} seconds remaining...", False))
+                countdown.due_at = countdown.ends_at - next_milestone(remaining)
+            elif final:
+                retry = 1 / EDIT_REFILL_PER_SECOND if self._global[0] >= 1 else 1 / self.global_rate
+                countdown.due_at = now + retry
+            else:
+                # Skip this edit; the next milestone will show the current value.
+                countdown.due_at = max(countdown.ends_at - next_milestone(remaining), now + 1 / EDIT_REFILL_PER_SECOND)
+            heapq.heappush(self._heap, (countdown.due_at, countdown.message_id))
+
+        # Forget the budget of idle channels once it has fully refilled.
+        for channel_id, (tokens, updated_at) in list(self._buckets.items()):
+            if channel_id not in self._by_channel and tokens + (now - updated_at) * EDIT_REFILL_PER_SECOND >= EDIT_BUDGET:
+                del self._buckets[channel_id]
+        return edits
+
+    def _remove(self, countdown: Countdown):
+        del self.countdowns[countdown.message_id]
+        channel = self._by_channel[countdown.channel_id]
+        channel.discard(countdown.message_id)
+        if not channel:
+            del self._by_channel[countdown.channel_id]
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - self.clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for edit in self.tick():
+                task = asyncio.create_task(self._send(edit))
+                self._sending.add(task)
+                task.add_done_callback(self._sending.discard)
+
+    async def _send(self, edit: Edit):
+        message = self.bot.get_partial_messageable(edit.channel_id).get_partial_message(edit.message_id)
+        try:
+            await message.edit(content=edit.content)
+        except Exception as e:
+            logger.error(f"[CountdownTicker] Failed to edit countdown {edit.message_id}: {e}")
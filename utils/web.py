@@ -0,0 +1,140 @@
+# utils/web.py
+import asyncio
+import hmac
+import logging
+import math
+import os
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # The bot's checkout
+WEB_HOST = os.getenv("WEB_HOST", "127.0.0.1")  # Set 0.0.0.0 to expose it; /metrics has no auth.
+WEB_PORT = int(os.getenv("WEB_PORT", 8080))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def _matches(given: str | None, expected: str) -> bool:
+    return given is not None and hmac.compare_digest(given.encode(), expected.encode())
+
+
+class WebServer:
+    """Small aiohttp server running on the bot's own event loop.
+
+    Serves health and readiness probes, Prometheus metrics, the release
+    webhook (only when WEBHOOK_SECRET is set) and token-protected admin
+    actions. It shares the bot's loop, so handlers can touch bot state
+    directly without extra threads.
+    """
+    def __init__(self, bot, host: str = WEB_HOST, port: int = WEB_PORT):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.app = web.Application()
+        self.app.router.add_get("/healthz", self.health)
+        self.app.router.add_get("/readyz", self.ready)
+        self.app.router.add_get("/metrics", self.metrics)
+        if WEBHOOK_SECRET:
+            self.app.router.add_post("/replit-webhook", self.release_webhook)
+        else:
+            logger.warning("WEBHOOK_SECRET is not set; the release webhook is disabled.")
+        self.app.router.add_post("/admin/reload/{extension}", self.admin_reload)
+        self._runner: web.AppRunner = None
+        self._background: set[asyncio.Task] = set()
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Web server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def health(self, request: web.Request) -> web.Response:
+        """Liveness: the event loop is answering."""
+        return web.json_response({"status": "ok"})
+
+    async def ready(self, request: web.Request) -> web.Response:
+        """Readiness: logged in, cache ready and every shard connected."""
+        shards = dict(self.bot.latencies) if self.bot.is_ready() else {}
+        connected = {str(shard_id): latency for shard_id, latency in shards.items() if math.isfinite(latency)}
+        ready = self.bot.is_ready() and not self.bot.is_closed() and len(connected) == len(shards)
+        body = {"ready": ready, "guilds": len(self.bot.guilds), "shards": connected}
+        return web.json_response(body, status=200 if ready else 503)
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.bot.metrics.render().encode(),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def release_webhook(self, request: web.Request) -> web.Response:
+        """Called by the release workflow: pulls the release and reloads edited extensions in place instead of restarting."""
+        if not _matches(request.headers.get("X-Webhook-Token") or request.query.get("token"), WEBHOOK_SECRET):
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        task = asyncio.create_task(self._release())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        logger.info("Release webhook received, pulling and reloading changed extensions.")
+        return web.json_response({"status": "reloading"}, status=202)
+
+    async def _release(self):
+        """Pulls the release and hot-swaps whatever it touched.
+
+        Falls back to a restart when a core module changed, or when the
+        release changed nothing a reload can pick up (new modules, data files).
+        """
+        changed = await self._pull()
+        if changed is None:
+            return
+        if not changed:
+            logger.info("Release webhook: already up to date.")
+            return
+        results, core = await self.bot.hot_reload()
+        if core:
+            logger.info(f"Core modules changed ({', '.join(core)}), restarting.")
+            await self.bot.restart()
+        elif not results:
+            logger.info("No loaded module changed in this release, restarting.")
+            await self.bot.restart()
+
+    async def _pull(self) -> bool | None:
+        """Fast-forwards a git checkout to the release; returns whether anything changed, or None if the pull failed.
+
+        Without a checkout the files are assumed to be updated already.
+        """
+        if not os.path.isdir(os.path.join(ROOT, ".git")):
+            return True
+        before = await self._git("rev-parse", "HEAD")
+        pulled = await self._git("pull", "--ff-only")
+        if before is None or pulled is None:
+            return None
+        return await self._git("rev-parse", "HEAD") != before
+
+    async def _git(self, *args: str) -> str | None:
+        process = await asyncio.create_subprocess_exec("git", *args, cwd=ROOT, stdout=asyncio.subprocess.PIPE,
+                                                       stderr=asyncio.subprocess.STDOUT, env=dict(os.environ, GIT_TERMINAL_PROMPT="0"))
+        output, _ = await process.communicate()
+        if process.returncode != 0:
+            logger.error(f"Release webhook: git {' '.join(args)} failed: {output.decode(errors='replace').strip()}")
+            return None
+        return output.decode().strip()
+
+    async def admin_reload(self, request: web.Request) -> web.Response:
+        if not ADMIN_TOKEN:
+            return web.json_response({"error": "admin actions are disabled"}, status=403)
+        auth = request.headers.get("Authorization", "")
+        if not _matches(auth.removeprefix("Bearer ").strip() or None, ADMIN_TOKEN):
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        extension = request.match_info["extension"]
+        name = extension if extension.startswith("cogs.") else f"cogs.{extension}"
+        if name not in self.bot.extensions:
+            return web.json_response({"error": f"{name} is not loaded"}, status=404)
+        results = await self.bot.reload_extensions([name])
+        error = results[name]
+        return web.json_response({"extension": name, "reloaded": error is None, "error": error}, status=200 if error is None else 500)